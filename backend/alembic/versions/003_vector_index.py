@@ -0,0 +1,39 @@
+"""Add ANN vector index on document_chunks.embedding
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# HNSW build parameters (defaults of settings.HNSW_M / settings.HNSW_EF_CONSTRUCTION).
+# Use POST /api/admin/vector-index/rebuild to apply different settings later.
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+
+def upgrade() -> None:
+    # Cosine distance index matching the <=> operator used by RAGService
+    op.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS ix_document_chunks_embedding
+        ON document_chunks
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_embedding")
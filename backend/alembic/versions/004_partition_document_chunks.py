@@ -0,0 +1,121 @@
+"""Partition document_chunks by model_id
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.vector_index_service import (
+    build_index_ddl,
+    partition_index_name,
+    partition_name,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Embedding dimension (must match settings.EMBEDDING_DIMENSION)
+EMBEDDING_DIMENSION = 384
+
+CHUNK_COLUMNS = (
+    "id, document_id, model_id, content, embedding, metadata, chunk_index, created_at"
+)
+
+
+def _create_chunks_table(partitioned: bool) -> None:
+    """Create document_chunks, reusing the existing id sequence"""
+    primary_key = "PRIMARY KEY (id, model_id)" if partitioned else "PRIMARY KEY (id)"
+    partition_by = "PARTITION BY LIST (model_id)" if partitioned else ""
+    op.execute(
+        f"""
+        CREATE TABLE document_chunks (
+            id INTEGER NOT NULL DEFAULT nextval('document_chunks_id_seq'),
+            document_id INTEGER NOT NULL
+                REFERENCES documents (id) ON DELETE CASCADE,
+            model_id INTEGER NOT NULL
+                REFERENCES models (id) ON DELETE CASCADE,
+            content TEXT NOT NULL,
+            embedding vector({EMBEDDING_DIMENSION}),
+            metadata TEXT,
+            chunk_index INTEGER NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            {primary_key}
+        ) {partition_by}
+        """
+    )
+    op.execute("ALTER SEQUENCE document_chunks_id_seq OWNED BY document_chunks.id")
+    op.execute("CREATE INDEX ix_document_chunks_id ON document_chunks (id)")
+    op.execute(
+        "CREATE INDEX ix_document_chunks_document_id ON document_chunks (document_id)"
+    )
+
+
+def _detach_old_table() -> None:
+    """Rename document_chunks out of the way, keeping its id sequence alive"""
+    op.execute("ALTER SEQUENCE document_chunks_id_seq OWNED BY NONE")
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_embedding")
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_id")
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_model_id")
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_document_id")
+    op.execute("ALTER TABLE document_chunks RENAME TO document_chunks_old")
+    op.execute(
+        "ALTER TABLE document_chunks_old "
+        "RENAME CONSTRAINT document_chunks_pkey TO document_chunks_old_pkey"
+    )
+
+
+def upgrade() -> None:
+    _detach_old_table()
+    _create_chunks_table(partitioned=True)
+
+    # One partition (with its own vector index, built with the configured
+    # VECTOR_INDEX_TYPE and parameters) per existing model
+    model_ids = [
+        row[0] for row in op.get_bind().execute(sa.text("SELECT id FROM models"))
+    ]
+    for model_id in model_ids:
+        partition = partition_name(model_id)
+        op.execute(
+            f"CREATE TABLE {partition} PARTITION OF document_chunks "
+            f"FOR VALUES IN ({model_id})"
+        )
+        op.execute(
+            f"INSERT INTO {partition} ({CHUNK_COLUMNS}) "
+            f"SELECT {CHUNK_COLUMNS} FROM document_chunks_old "
+            f"WHERE model_id = {model_id}"
+        )
+        ddl = build_index_ddl(partition_index_name(model_id), partition)
+        if ddl:
+            op.execute(ddl)
+
+    op.execute("DROP TABLE document_chunks_old")
+
+
+def downgrade() -> None:
+    _detach_old_table()
+    _create_chunks_table(partitioned=False)
+    op.execute(
+        "CREATE INDEX ix_document_chunks_model_id ON document_chunks (model_id)"
+    )
+
+    op.execute(
+        f"INSERT INTO document_chunks ({CHUNK_COLUMNS}) "
+        f"SELECT {CHUNK_COLUMNS} FROM document_chunks_old"
+    )
+    # Drops the partitions together with the partitioned parent
+    op.execute("DROP TABLE document_chunks_old")
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_document_id")
+
+    ddl = build_index_ddl("ix_document_chunks_embedding", "document_chunks")
+    if ddl:
+        op.execute(ddl)
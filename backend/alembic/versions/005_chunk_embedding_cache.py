@@ -0,0 +1,43 @@
+"""Add chunk_embedding_cache table
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Embedding dimension (must match settings.EMBEDDING_DIMENSION)
+EMBEDDING_DIMENSION = 384
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chunk_embedding_cache",
+        sa.Column("content_hash", sa.CHAR(64), nullable=False),
+        sa.Column("embedding_model", sa.String(), nullable=False),
+        sa.Column("embedding", Vector(EMBEDDING_DIMENSION), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("content_hash", "embedding_model"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chunk_embedding_cache")
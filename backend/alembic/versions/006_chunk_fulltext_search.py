@@ -0,0 +1,42 @@
+"""Add full-text search vector to document_chunks
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Text search configuration (must match app.models.document.FULLTEXT_CONFIG)
+FULLTEXT_CONFIG = "english"
+
+
+def upgrade() -> None:
+    # Added to the partitioned parent, so every partition gets the column
+    op.execute(
+        f"""
+        ALTER TABLE document_chunks
+        ADD COLUMN content_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('{FULLTEXT_CONFIG}', content)) STORED
+        """
+    )
+    # Partitioned index: created on existing partitions and inherited by new ones
+    op.execute(
+        "CREATE INDEX ix_document_chunks_content_tsv "
+        "ON document_chunks USING gin (content_tsv)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_content_tsv")
+    op.execute("ALTER TABLE document_chunks DROP COLUMN content_tsv")
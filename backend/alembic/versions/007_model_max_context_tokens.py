@@ -0,0 +1,28 @@
+"""Add max_context_tokens to models
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Prompt token budget per model; NULL falls back to PROMPT_MAX_TOKENS
+    op.add_column("models", sa.Column("max_context_tokens", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("models", "max_context_tokens")
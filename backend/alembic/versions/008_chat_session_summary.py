@@ -0,0 +1,36 @@
+"""Add rolling summary to chat_sessions
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("chat_sessions", sa.Column("summary", sa.Text(), nullable=True))
+    op.add_column(
+        "chat_sessions", sa.Column("summary_message_id", sa.Integer(), nullable=True)
+    )
+    # Recent messages of a session, read on every chat turn
+    op.create_index(
+        "ix_chat_messages_session_id_id", "chat_messages", ["session_id", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_messages_session_id_id", table_name="chat_messages")
+    op.drop_column("chat_sessions", "summary_message_id")
+    op.drop_column("chat_sessions", "summary")
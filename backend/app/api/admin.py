@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.database import get_db
+from app.core.dependencies import require_admin, require_superadmin
+from app.models.user import User
+from app.schemas.admin import (
+    VectorIndexStatus,
+    VectorIndexRebuildResponse,
+    EmbeddingCacheStats,
+    AnswerCacheStats,
+    ModelCacheStats,
+)
+from app.services import vector_index_service
+from app.services.embedding_cache import query_embedding_cache
+from app.services.answer_cache import answer_cache
+from app.services.model_cache import model_cache
+from app.workers.tasks import rebuild_vector_index_task
+
+router = APIRouter()
+
+
+@router.get("/vector-index", response_model=List[VectorIndexStatus])
+async def get_vector_index_status(
+    model_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    """Get vector index status per model partition (Admin only)"""
+    return vector_index_service.get_index_status(db, model_id)
+
+
+@router.post(
+    "/vector-index/rebuild",
+    response_model=VectorIndexRebuildResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def rebuild_vector_index(
+    model_id: Optional[int] = None,
+    concurrently: bool = True,
+    current_user: User = Depends(require_superadmin),
+):
+    """
+    Rebuild vector indexes with the current settings (Superadmin only)
+    Rebuilds one model's partition, or all partitions if model_id is omitted.
+    The rebuild runs in the background; searches keep working meanwhile
+    """
+    task = rebuild_vector_index_task.delay(model_id, concurrently)
+
+    return {
+        "task_id": task.id,
+        "status": "queued",
+        "message": "Vector index rebuild queued",
+    }
+
+
+@router.get("/embedding-cache", response_model=EmbeddingCacheStats)
+async def get_embedding_cache_stats(current_user: User = Depends(require_admin)):
+    """Get query embedding cache hit/miss counters (Admin only)"""
+    return query_embedding_cache.stats()
+
+
+@router.delete("/embedding-cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_embedding_cache(current_user: User = Depends(require_admin)):
+    """Clear the in-process query embedding cache (Admin only)"""
+    query_embedding_cache.clear()
+    return None
+
+
+@router.get("/answer-cache", response_model=AnswerCacheStats)
+async def get_answer_cache_stats(current_user: User = Depends(require_admin)):
+    """Get semantic answer cache hit rate and counters (Admin only)"""
+    return answer_cache.stats()
+
+
+@router.delete("/answer-cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_answer_cache(
+    model_id: Optional[int] = None,
+    current_user: User = Depends(require_admin),
+):
+    """Clear cached answers of one model, or all of them (Admin only)"""
+    if model_id is None:
+        answer_cache.clear()
+    else:
+        answer_cache.invalidate_model(model_id)
+    return None
+
+
+@router.get("/model-cache", response_model=ModelCacheStats)
+async def get_model_cache_stats(current_user: User = Depends(require_admin)):
+    """Get model config cache hit/miss counters (Admin only)"""
+    return model_cache.stats()
+
+
+@router.delete("/model-cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_model_cache(
+    model_id: Optional[int] = None,
+    current_user: User = Depends(require_admin),
+):
+    """Drop one cached model on all replicas, or clear this process (Admin only)"""
+    if model_id is None:
+        model_cache.clear()
+    else:
+        model_cache.invalidate(model_id)
+    return None
@@ -30,8 +30,6 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     # Create new user
     hashed_password = get_password_hash(user_data.password)
 
-    print(f"hashed password: {hashed_password}")  # Debugging line
-
     new_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -60,11 +58,6 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    print(f"user password: {user_data.password}")  # Debugging line
-    print(
-        f"stored hashed password: {user.__getattribute__('hashed_password')}"
-    )  # Debugging line
-
     provided_password = user_data.password
     hashed_password = user.__getattribute__("hashed_password") if user else None
     valid = (
@@ -72,8 +65,6 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
         if hashed_password
         else False
     )
-    print(f"hashed_password variable: {hashed_password}")  # Debugging line
-    print(f"Password valid: {valid}")  # Debugging line
     # Verify credentials
     if not valid:
         raise HTTPException(
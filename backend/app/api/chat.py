@@ -8,11 +8,18 @@ from fastapi import (
     UploadFile,
     File,
 )
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.core.security import decode_token
+from app.core.database import AsyncSessionLocal, get_db, get_async_db
+from app.core.dependencies import (
+    get_current_user,
+    get_current_user_async,
+    load_user_async,
+)
+from app.core.auth_cache import auth_cache
 from app.models.user import User
 from app.models.chat import MESSAGE_ROLE_USER, MESSAGE_ROLE_ASSISTANT
 from app.schemas.chat import (
@@ -21,47 +28,88 @@ from app.schemas.chat import (
     ChatMessageResponse,
     ChatSessionResponse,
 )
-from app.services.rag_service import RAGService
-from app.services.llm_service import LLMService
+from app.services.rag_service import AsyncRAGService
+from app.services.embedding_service import generate_embedding_async
+from app.services.answer_cache import answer_cache
 from app.services import model_service
+from app.services.model_cache import model_cache
+from app.services.prompt_packer import get_token_counter
+from app.services.ws_streamer import WebSocketStreamer, SlowConsumerError
+from app.core.metrics import (
+    PIPELINE_CHAT,
+    PIPELINE_SSE,
+    PIPELINE_WS,
+    STAGE_EMBED,
+    STAGE_HISTORY,
+    STAGE_LLM,
+    STAGE_PROMPT,
+    STAGE_SEARCH,
+    STAGE_TOTAL,
+    STAGE_TTFT,
+    observe_llm_output,
+    observe_stage,
+    stage_timer,
+)
 from app.services.document_service import DocumentProcessor
-from app.workers.tasks import process_document_task
+from app.workers.tasks import process_document_task, summarize_session_task
+import asyncio
 import json
 import logging
+import time
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def schedule_session_summary(session_id: int) -> None:
+    """Queue a rolling summary update; chat keeps working if the broker is down"""
+    try:
+        summarize_session_task.delay(session_id)
+    except Exception as e:
+        logger.warning(f"Could not schedule summary of chat session {session_id}: {e}")
+
+
+async def record_llm_output(pipeline: str, model, text: str, seconds: float) -> None:
+    """Record output tokens and tokens/sec of an LLM response"""
+    # Tokenizing a long answer (or loading the encoding) would block the event loop
+    tokens = await asyncio.get_running_loop().run_in_executor(
+        None,
+        lambda: get_token_counter(model.llm_provider, model.llm_model_name).count(text),
+    )
+    observe_llm_output(pipeline, model.llm_provider, tokens, seconds)
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Chat with RAG (non-streaming)"""
+    started = time.perf_counter()
 
     user_id = current_user.__getattribute__("id")
 
-    # Verify model access
-    model = model_service.get_model(db, request.model_id)
-    if not model:
+    # Verify model access (configuration and access list are cached)
+    cached_model = await model_cache.get_async(db, request.model_id)
+    if not cached_model:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Model not found"
         )
 
-    if not model_service.check_user_access(db, request.model_id, current_user):
+    if not cached_model.has_access(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this model",
         )
+    model = cached_model.model
 
     # Initialize services
-    rag_service = RAGService(db)
-    llm_service = LLMService(model)
+    rag_service = AsyncRAGService(db)
+    llm_service = cached_model.llm_service()
 
     # Get or create session
-    session = rag_service.get_or_create_session(
+    session = await rag_service.get_or_create_session(
         user_id=current_user.__getattribute__("id"),
         model_id=request.model_id,
         session_id=request.session_id,
@@ -70,7 +118,7 @@ async def chat(
     session_id = session.__getattribute__("id")
 
     # Save user message
-    user_message = rag_service.save_message(
+    user_message = await rag_service.save_message(
         session_id=session_id,
         user_id=user_id,
         role=MESSAGE_ROLE_USER,
@@ -78,41 +126,75 @@ async def chat(
     )
 
     # Search for relevant chunks
-    relevant_chunks = rag_service.search_similar_chunks(
-        query=request.message, model_id=request.model_id, top_k=request.top_k
-    )
+    with stage_timer(PIPELINE_CHAT, STAGE_EMBED):
+        query_embedding = await generate_embedding_async(request.message)
+    with stage_timer(PIPELINE_CHAT, STAGE_SEARCH):
+        relevant_chunks = await rag_service.search_similar_chunks(
+            query=request.message,
+            model_id=request.model_id,
+            top_k=request.top_k,
+            ef_search=request.ef_search,
+            probes=request.probes,
+            query_embedding=query_embedding,
+            retrieval_mode=request.retrieval_mode,
+            vector_weight=request.vector_weight,
+            lexical_weight=request.lexical_weight,
+            rerank_results=request.rerank,
+        )
 
-    # Build context and prompt
-    context = rag_service.build_context(relevant_chunks)
+    # Get the conversation summary and recent messages for context
+    with stage_timer(PIPELINE_CHAT, STAGE_HISTORY):
+        history = await rag_service.get_prompt_history(session_id)
+
+    # Fit context and history into the model's token budget
+    with stage_timer(PIPELINE_CHAT, STAGE_PROMPT):
+        packed = await rag_service.pack_prompt_async(
+            query=request.message,
+            chunks=relevant_chunks,
+            chat_history=history.messages,
+            model=model,
+            summary=history.summary,
+        )
 
-    # Get chat history for context
-    history = rag_service.get_chat_history(session_id, limit=10)
-    history_list = [
-        {"role": msg.role, "content": msg.content}
-        for msg in reversed(history[1:])  # Exclude current message
-    ]
+    # End the read transaction so no connection is held while the LLM responds
+    await db.commit()
 
-    prompt = rag_service.build_prompt(
-        query=request.message, context=context, chat_history=history_list
-    )
+    # Cached answers ignore conversation history, so only first turns use them
+    first_turn = not history.messages and not history.summary
+    chunk_ids = [chunk["chunk_id"] for chunk in relevant_chunks]
+    cached = None
+    if first_turn:
+        cached = answer_cache.lookup(request.model_id, query_embedding, chunk_ids)
 
-    # Generate response
-    try:
-        response_text = await llm_service.generate_response(prompt)
-    except Exception as e:
-        logger.error(f"LLM generation error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate response: {str(e)}",
-        )
+    if cached:
+        response_text = cached.answer
+    else:
+        # Generate response
+        try:
+            llm_started = time.perf_counter()
+            response_text = await llm_service.generate_response(packed.prompt)
+            llm_seconds = time.perf_counter() - llm_started
+            observe_stage(PIPELINE_CHAT, STAGE_LLM, llm_seconds)
+            await record_llm_output(PIPELINE_CHAT, model, response_text, llm_seconds)
+        except Exception as e:
+            logger.error(f"LLM generation error: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to generate response: {str(e)}",
+            )
+
+        if first_turn and response_text:
+            answer_cache.store(
+                request.model_id, query_embedding, chunk_ids, response_text
+            )
 
     # Format sources
     sources = None
-    if request.include_sources and relevant_chunks:
-        sources = rag_service.format_sources_for_response(relevant_chunks)
+    if request.include_sources and packed.chunks:
+        sources = rag_service.format_sources_for_response(packed.chunks)
 
     # Save assistant message
-    assistant_message = rag_service.save_message(
+    assistant_message = await rag_service.save_message(
         session_id=session_id,
         user_id=user_id,
         role=MESSAGE_ROLE_ASSISTANT,
@@ -120,34 +202,230 @@ async def chat(
         sources=sources,
     )
 
+    if history.needs_summary:
+        schedule_session_summary(session_id)
+
+    observe_stage(PIPELINE_CHAT, STAGE_TOTAL, time.perf_counter() - started)
     return {
         "session_id": session_id,
         "message": assistant_message,
         "sources": sources,
+        "cached": cached is not None,
+        "prompt_tokens": None if cached else packed.prompt_tokens,
     }
 
 
-@router.websocket("/ws")
-async def chat_websocket(
-    websocket: WebSocket, token: str, db: Session = Depends(get_db)
+def format_validation_error(error: ValidationError) -> str:
+    """One-line summary of a request validation error"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'request'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+def sse_event(message: dict) -> str:
+    """Format a message as a Server-Sent Event named after its type"""
+    return f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user_async),
 ):
-    """WebSocket endpoint for streaming chat"""
+    """
+    Chat with RAG, streamed as Server-Sent Events
+
+    Events carry the same messages as the WebSocket endpoint: user_message,
+    sources, stream_start, stream_chunk, stream_end, message_saved and
+    error. Database sessions are opened only around the short queries, so
+    no connection is held while the answer streams.
+    """
+    started = time.perf_counter()
+    user_id = current_user.__getattribute__("id")
+
+    async with AsyncSessionLocal() as adb:
+        # Verify model access
+        cached_model = await model_cache.get_async(adb, request.model_id)
+        if not cached_model:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Model not found"
+            )
+
+        if not cached_model.has_access(current_user):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have access to this model",
+            )
+        model = cached_model.model
+
+        rag_service = AsyncRAGService(adb)
+        session = await rag_service.get_or_create_session(
+            user_id=user_id,
+            model_id=request.model_id,
+            session_id=request.session_id,
+        )
+        session_id = session.__getattribute__("id")
+
+        user_message = await rag_service.save_message(
+            session_id=session_id,
+            user_id=user_id,
+            role=MESSAGE_ROLE_USER,
+            content=request.message,
+        )
+        user_message_id = user_message.__getattribute__("id")
+
+    async def events():
+        yield sse_event(
+            {
+                "type": "user_message",
+                "session_id": session_id,
+                "message_id": user_message_id,
+            }
+        )
+
+        try:
+            with stage_timer(PIPELINE_SSE, STAGE_EMBED):
+                query_embedding = await generate_embedding_async(request.message)
+
+            async with AsyncSessionLocal() as adb:
+                rag_service = AsyncRAGService(adb)
+                with stage_timer(PIPELINE_SSE, STAGE_SEARCH):
+                    relevant_chunks = await rag_service.search_similar_chunks(
+                        query=request.message,
+                        model_id=request.model_id,
+                        top_k=request.top_k,
+                        ef_search=request.ef_search,
+                        probes=request.probes,
+                        query_embedding=query_embedding,
+                        retrieval_mode=request.retrieval_mode,
+                        vector_weight=request.vector_weight,
+                        lexical_weight=request.lexical_weight,
+                        rerank_results=request.rerank,
+                    )
+                with stage_timer(PIPELINE_SSE, STAGE_HISTORY):
+                    history = await rag_service.get_prompt_history(session_id)
+
+            with stage_timer(PIPELINE_SSE, STAGE_PROMPT):
+                packed = await rag_service.pack_prompt_async(
+                    query=request.message,
+                    chunks=relevant_chunks,
+                    chat_history=history.messages,
+                    model=model,
+                    summary=history.summary,
+                )
+
+            sources = None
+            if request.include_sources and packed.chunks:
+                sources = rag_service.format_sources_for_response(packed.chunks)
+                yield sse_event({"type": "sources", "sources": sources})
+
+            # Cached answers ignore conversation history, so only first turns use them
+            first_turn = not history.messages and not history.summary
+            chunk_ids = [chunk["chunk_id"] for chunk in relevant_chunks]
+            cached = None
+            if first_turn:
+                cached = answer_cache.lookup(request.model_id, query_embedding, chunk_ids)
+
+            yield sse_event({"type": "stream_start", "cached": cached is not None})
+
+            response_parts: List[str] = []
+            if cached:
+                response_parts.append(cached.answer)
+                yield sse_event({"type": "stream_chunk", "content": cached.answer})
+            else:
+                llm_service = cached_model.llm_service()
+                llm_started = time.perf_counter()
+                first_token = None
+                async for chunk in llm_service.generate_stream(packed.prompt):
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                        observe_stage(PIPELINE_SSE, STAGE_TTFT, first_token - llm_started)
+                    response_parts.append(chunk)
+                    yield sse_event({"type": "stream_chunk", "content": chunk})
+
+            response_text = "".join(response_parts)
+            if not cached:
+                observe_stage(PIPELINE_SSE, STAGE_LLM, time.perf_counter() - llm_started)
+                await record_llm_output(
+                    PIPELINE_SSE,
+                    model,
+                    response_text,
+                    time.perf_counter() - (first_token or llm_started),
+                )
+                if first_turn and response_text:
+                    answer_cache.store(
+                        request.model_id, query_embedding, chunk_ids, response_text
+                    )
+
+            yield sse_event(
+                {
+                    "type": "stream_end",
+                    "prompt_tokens": None if cached else packed.prompt_tokens,
+                }
+            )
+
+            async with AsyncSessionLocal() as adb:
+                assistant_message = await AsyncRAGService(adb).save_message(
+                    session_id=session_id,
+                    user_id=user_id,
+                    role=MESSAGE_ROLE_ASSISTANT,
+                    content=response_text,
+                    sources=sources,
+                )
+                assistant_message_id = assistant_message.__getattribute__("id")
+
+            yield sse_event({"type": "message_saved", "message_id": assistant_message_id})
+
+            if history.needs_summary:
+                schedule_session_summary(session_id)
+
+            observe_stage(PIPELINE_SSE, STAGE_TOTAL, time.perf_counter() - started)
+
+        except Exception as e:
+            logger.error(f"Streaming error: {e}")
+            yield sse_event(
+                {"type": "error", "error": f"Failed to generate response: {str(e)}"}
+            )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies (nginx) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def chat_websocket(websocket: WebSocket, token: str):
+    """
+    WebSocket endpoint for streaming chat
+
+    Each message gets its own short database sessions, opened around the
+    queries only, so idle and streaming sockets hold no pooled connection.
+    """
     await websocket.accept()
 
     user_id = None
+    streamer = WebSocketStreamer(websocket)
 
     try:
         # Authenticate user from token
-        payload = decode_token(token)
+        payload = auth_cache.decode(token)
         if not payload:
             await websocket.close(code=4001, reason="Invalid token")
             return
 
         user_id = payload.get("sub")
-        user = db.query(User).filter(User.id == user_id).first()
+        if not user_id:
+            await websocket.close(code=4001, reason="Invalid token")
+            return
+
+        user = await load_user_async(int(user_id))
         if not user or not user.__getattribute__("is_active"):
             await websocket.close(code=4001, reason="User not found or inactive")
             return
+        user_id = user.__getattribute__("id")
 
         logger.info(f"WebSocket connection established for user {user_id}")
 
@@ -155,131 +433,217 @@ async def chat_websocket(
         while True:
             # Receive message
             data = await websocket.receive_json()
+            started = time.perf_counter()
 
-            message = data.get("message")
-            model_id = data.get("model_id")
-            session_id = data.get("session_id")
-            top_k = data.get("top_k", 5)
-
-            if not message or not model_id:
-                await websocket.send_json(
-                    {"type": "error", "error": "Missing message or model_id"}
+            # Same fields and bounds as POST /chat
+            try:
+                request = ChatRequest.model_validate(data)
+            except ValidationError as e:
+                await streamer.send_json(
+                    {"type": "error", "error": format_validation_error(e)}
                 )
                 continue
 
-            # Verify model access
-            model = model_service.get_model(db, model_id)
-            if not model or not model_service.check_user_access(db, model_id, user):
-                await websocket.send_json(
-                    {"type": "error", "error": "Model not found or access denied"}
-                )
+            if not request.message:
+                await streamer.send_json({"type": "error", "error": "Missing message"})
                 continue
 
-            # Initialize services
-            rag_service = RAGService(db)
-            llm_service = LLMService(model)
+            message = request.message
+            model_id = request.model_id
+            session_id = request.session_id
+            top_k = request.top_k
+            ef_search = request.ef_search
+            probes = request.probes
+            retrieval_mode = request.retrieval_mode
+            vector_weight = request.vector_weight
+            lexical_weight = request.lexical_weight
+            rerank_results = request.rerank
+
+            async with AsyncSessionLocal() as db:
+                # Verify model access
+                cached_model = await model_cache.get_async(db, model_id)
+                if not cached_model or not cached_model.has_access(user):
+                    await streamer.send_json(
+                        {"type": "error", "error": "Model not found or access denied"}
+                    )
+                    continue
+                model = cached_model.model
 
-            # Get or create session
-            session = rag_service.get_or_create_session(
-                user_id=user.__getattribute__("id"),
-                model_id=model_id,
-                session_id=session_id,
-            )
+                rag_service = AsyncRAGService(db)
 
-            session_id = session.__getattribute__("id")
+                # Get or create session
+                session = await rag_service.get_or_create_session(
+                    user_id=user_id,
+                    model_id=model_id,
+                    session_id=session_id,
+                )
 
-            # Save user message
-            user_message = rag_service.save_message(
-                session_id=session_id,
-                user_id=user_id,
-                role=MESSAGE_ROLE_USER,
-                content=message,
-            )
+                session_id = session.__getattribute__("id")
+
+                # Save user message
+                user_message = await rag_service.save_message(
+                    session_id=session_id,
+                    user_id=user_id,
+                    role=MESSAGE_ROLE_USER,
+                    content=message,
+                )
 
             # Send acknowledgment
-            await websocket.send_json(
+            await streamer.send_json(
                 {
                     "type": "user_message",
-                    "session_id": session.id,
+                    "session_id": session_id,
                     "message_id": user_message.id,
                 }
             )
 
             # Search for relevant chunks
-            relevant_chunks = rag_service.search_similar_chunks(
-                query=message, model_id=model_id, top_k=top_k
-            )
+            with stage_timer(PIPELINE_WS, STAGE_EMBED):
+                query_embedding = await generate_embedding_async(message)
+
+            async with AsyncSessionLocal() as db:
+                rag_service = AsyncRAGService(db)
+                with stage_timer(PIPELINE_WS, STAGE_SEARCH):
+                    relevant_chunks = await rag_service.search_similar_chunks(
+                        query=message,
+                        model_id=model_id,
+                        top_k=top_k,
+                        ef_search=ef_search,
+                        probes=probes,
+                        query_embedding=query_embedding,
+                        retrieval_mode=retrieval_mode,
+                        vector_weight=vector_weight,
+                        lexical_weight=lexical_weight,
+                        rerank_results=rerank_results,
+                    )
 
-            # Send sources
-            if relevant_chunks:
-                sources = rag_service.format_sources_for_response(relevant_chunks)
-                await websocket.send_json({"type": "sources", "sources": sources})
-
-            # Build context and prompt
-            context = rag_service.build_context(relevant_chunks)
-            history = rag_service.get_chat_history(session_id, limit=10)
-            history_list = [
-                {"role": msg.role, "content": msg.content}
-                for msg in reversed(history[1:])
-            ]
-
-            prompt = rag_service.build_prompt(
-                query=message, context=context, chat_history=history_list
-            )
+                with stage_timer(PIPELINE_WS, STAGE_HISTORY):
+                    history = await rag_service.get_prompt_history(session_id)
+
+            # Fit context and history into the model's token budget
+            with stage_timer(PIPELINE_WS, STAGE_PROMPT):
+                packed = await rag_service.pack_prompt_async(
+                    query=message,
+                    chunks=relevant_chunks,
+                    chat_history=history.messages,
+                    model=model,
+                    summary=history.summary,
+                )
+
+            # Send sources (the chunks that made it into the prompt)
+            sources = None
+            if packed.chunks:
+                sources = rag_service.format_sources_for_response(packed.chunks)
+                await streamer.send_json({"type": "sources", "sources": sources})
+
+            # Cached answers ignore conversation history, so only first turns use them
+            first_turn = not history.messages and not history.summary
+            chunk_ids = [chunk["chunk_id"] for chunk in relevant_chunks]
+            cached = None
+            if first_turn:
+                cached = answer_cache.lookup(model_id, query_embedding, chunk_ids)
 
             # Stream response
-            response_text = ""
+            response_parts: List[str] = []
             try:
-                await websocket.send_json({"type": "stream_start"})
+                await streamer.send_json(
+                    {"type": "stream_start", "cached": cached is not None}
+                )
 
-                async for chunk in llm_service.generate_stream(prompt):
-                    response_text += chunk
-                    await websocket.send_json(
-                        {"type": "stream_chunk", "content": chunk}
+                if cached:
+                    response_parts.append(cached.answer)
+                    await streamer.send_delta(cached.answer)
+                else:
+                    llm_service = cached_model.llm_service()
+                    llm_started = time.perf_counter()
+                    first_token = None
+                    async for chunk in llm_service.generate_stream(packed.prompt):
+                        if first_token is None:
+                            first_token = time.perf_counter()
+                            observe_stage(
+                                PIPELINE_WS, STAGE_TTFT, first_token - llm_started
+                            )
+                        response_parts.append(chunk)
+                        await streamer.send_delta(chunk)
+
+                response_text = "".join(response_parts)
+                if not cached:
+                    llm_seconds = time.perf_counter() - llm_started
+                    observe_stage(PIPELINE_WS, STAGE_LLM, llm_seconds)
+                    await record_llm_output(
+                        PIPELINE_WS,
+                        model,
+                        response_text,
+                        time.perf_counter() - (first_token or llm_started),
                     )
 
-                await websocket.send_json({"type": "stream_end"})
+                await streamer.send_json(
+                    {
+                        "type": "stream_end",
+                        "prompt_tokens": None if cached else packed.prompt_tokens,
+                    }
+                )
 
+            except SlowConsumerError:
+                raise
             except Exception as e:
                 logger.error(f"Streaming error: {e}")
-                await websocket.send_json(
+                await streamer.send_json(
                     {"type": "error", "error": f"Failed to generate response: {str(e)}"}
                 )
                 continue
 
+            if not cached and first_turn and response_text:
+                answer_cache.store(model_id, query_embedding, chunk_ids, response_text)
+
             # Save assistant message
-            assistant_message = rag_service.save_message(
-                session_id=session_id,
-                user_id=user_id,
-                role=MESSAGE_ROLE_ASSISTANT,
-                content=response_text,
-                sources=sources if relevant_chunks else None,
-            )
+            async with AsyncSessionLocal() as db:
+                assistant_message = await AsyncRAGService(db).save_message(
+                    session_id=session_id,
+                    user_id=user_id,
+                    role=MESSAGE_ROLE_ASSISTANT,
+                    content=response_text,
+                    sources=sources,
+                )
 
-            await websocket.send_json(
+            await streamer.send_json(
                 {"type": "message_saved", "message_id": assistant_message.id}
             )
 
+            if history.needs_summary:
+                schedule_session_summary(session_id)
+
+            observe_stage(PIPELINE_WS, STAGE_TOTAL, time.perf_counter() - started)
+
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for user {user_id}")
+    except SlowConsumerError as e:
+        logger.warning(f"Closing WebSocket for user {user_id}: {e}")
+        await streamer.close()
+        try:
+            await websocket.close(code=1013, reason="Client too slow")
+        except:
+            pass
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         try:
             await websocket.close(code=1011, reason=str(e))
         except:
             pass
+    finally:
+        await streamer.close()
 
 
 @router.get("/sessions", response_model=List[ChatSessionResponse])
 async def get_sessions(
     model_id: int | None = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get user's chat sessions"""
-    rag_service = RAGService(db)
+    rag_service = AsyncRAGService(db)
     user_id = current_user.__getattribute__("id")
-    sessions = rag_service.get_user_sessions(user_id=user_id, model_id=model_id)
+    sessions = await rag_service.get_user_sessions(user_id=user_id, model_id=model_id)
     return sessions
 
 
@@ -287,13 +651,13 @@ async def get_sessions(
 async def get_session_messages(
     session_id: int,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get messages for a chat session"""
     # Verify session belongs to user
-    rag_service = RAGService(db)
-    messages = rag_service.get_chat_history(session_id, limit)
+    rag_service = AsyncRAGService(db)
+    messages = await rag_service.get_chat_history(session_id, limit)
 
     # Check ownership
     user_id = current_user.__getattribute__("id")
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.auth_cache import auth_cache
 from app.core.database import get_db
 from app.core.dependencies import require_admin, get_current_user
 from app.models.user import User, USER_ROLE_ADMIN, USER_ROLE_SUPERADMIN
@@ -84,6 +85,7 @@ async def update_user(
         user.is_active = user_update.is_active
 
     db.commit()
+    auth_cache.invalidate_user(user_id)
     db.refresh(user)
     return user
 
@@ -118,4 +120,5 @@ async def delete_user(
 
     db.delete(user)
     db.commit()
+    auth_cache.invalidate_user(user_id)
     return None
@@ -0,0 +1,122 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import hashlib
+import threading
+import time
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.config import settings
+from app.core.security import decode_token
+from app.models.user import User
+
+# Columns copied into a user snapshot
+USER_COLUMNS = [column.key for column in User.__table__.columns]
+
+
+class AuthCache:
+    """
+    Per-process cache of decoded JWTs and user snapshots
+
+    Decoded claims are kept until the token's own exp, keyed by a digest of
+    the token. User snapshots (column values) are kept for user_ttl_seconds
+    and handed out as detached User copies, so requests never share an
+    instance. Changes made through api/users.py invalidate the user
+    explicitly; changes made by other worker processes show up once the
+    snapshot expires. Both parts are LRU-bounded; a size of 0 turns that
+    part off.
+    """
+
+    def __init__(
+        self, token_cache_size: int, user_cache_size: int, user_ttl_seconds: float
+    ):
+        self.token_cache_size = token_cache_size
+        self.user_cache_size = user_cache_size
+        self.user_ttl_seconds = user_ttl_seconds
+        self._claims: "OrderedDict[bytes, dict]" = OrderedDict()
+        self._users: "OrderedDict[int, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.claim_hits = 0
+        self.claim_misses = 0
+        self.user_hits = 0
+        self.user_misses = 0
+
+    def decode(self, token: str) -> Optional[dict]:
+        """decode_token with caching of valid tokens"""
+        if self.token_cache_size <= 0:
+            return decode_token(token)
+
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            payload = self._claims.get(key)
+            if payload is not None:
+                if payload["exp"] > time.time():
+                    self._claims.move_to_end(key)
+                    self.claim_hits += 1
+                    return payload
+                del self._claims[key]
+            self.claim_misses += 1
+
+        payload = decode_token(token)
+        # Invalid tokens are not cached, so garbage can't fill the cache
+        if payload is None or not isinstance(payload.get("exp"), (int, float)):
+            return payload
+
+        with self._lock:
+            self._claims[key] = payload
+            while len(self._claims) > self.token_cache_size:
+                self._claims.popitem(last=False)
+        return payload
+
+    @property
+    def users_enabled(self) -> bool:
+        return self.user_cache_size > 0 and self.user_ttl_seconds > 0
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        """Detached copy of a cached user, or None"""
+        if not self.users_enabled:
+            return None
+
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None or time.monotonic() - entry[0] > self.user_ttl_seconds:
+                if entry is not None:
+                    del self._users[user_id]
+                self.user_misses += 1
+                return None
+            self._users.move_to_end(user_id)
+            self.user_hits += 1
+            values = entry[1]
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def store_user(self, user: User) -> None:
+        """Snapshot a user loaded from the database"""
+        if not self.users_enabled:
+            return
+
+        values = {key: user.__getattribute__(key) for key in USER_COLUMNS}
+        with self._lock:
+            self._users[values["id"]] = (time.monotonic(), values)
+            self._users.move_to_end(values["id"])
+            while len(self._users) > self.user_cache_size:
+                self._users.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop a user's snapshot (after update, deactivation or deletion)"""
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._claims.clear()
+            self._users.clear()
+
+
+auth_cache = AuthCache(
+    token_cache_size=settings.AUTH_TOKEN_CACHE_SIZE,
+    user_cache_size=settings.AUTH_USER_CACHE_SIZE,
+    user_ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
@@ -9,6 +9,9 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
 
+    # Monitoring
+    METRICS_ENABLED: bool = True  # Per-stage latency histograms at /metrics
+
     # Database
     DATABASE_URL: str | None = None
 
@@ -21,6 +24,11 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Auth Cache (per process)
+    AUTH_TOKEN_CACHE_SIZE: int = 10000  # Decoded JWTs kept until they expire (0 = off)
+    AUTH_USER_CACHE_SIZE: int = 10000  # User snapshots (0 = off)
+    AUTH_USER_CACHE_TTL_SECONDS: float = 30.0  # Bounds staleness of changes made in other processes
+
     # Superadmin Initial Setup
     SUPERADMIN_EMAIL: str = "admin@example.com"
     SUPERADMIN_PASSWORD: str = "changeme123"
@@ -35,14 +43,53 @@ class Settings(BaseSettings):
     OLLAMA_BASE_URL: str = "http://ollama:11434"
     DEFAULT_OLLAMA_MODEL: str = "llama2"
 
+    # LLM Provider HTTP Clients (shared per base URL)
+    LLM_HTTP_TIMEOUT_SECONDS: float = 120.0
+    LLM_HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    LLM_HTTP_MAX_CONNECTIONS: int = 100  # Per provider base URL
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    LLM_HTTP2: bool = True  # Negotiated over TLS where the provider supports it
+
     # Embedding Model
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     EMBEDDING_DEVICE: str = "cpu"
     EMBEDDING_DIMENSION: int = 384  # all-MiniLM-L6-v2 dimension
+    EMBEDDING_BACKEND: str = "torch"  # torch, onnx, or onnx-int8
+    EMBEDDING_ONNX_DIR: str = "/app/models/onnx"  # Output of export_embedding_model.py
+    EMBEDDING_ONNX_THREADS: int = 0  # ONNX Runtime intra-op threads (0 = default)
+
+    # Model Config Cache (configuration, decrypted API key and access list per model)
+    MODEL_CACHE_SIZE: int = 1024  # Models kept per process (0 disables)
+    MODEL_CACHE_TTL_SECONDS: float = 300.0  # Bounds staleness of changes not seen as invalidations
+    MODEL_CACHE_REDIS: bool = False  # Broadcast invalidations to other API replicas via REDIS_URL
+
+    # Query Embedding Cache
+    EMBEDDING_CACHE_SIZE: int = 2048  # In-process LRU entries (0 disables)
+    EMBEDDING_CACHE_REDIS: bool = False  # Share cached embeddings via REDIS_URL
+    EMBEDDING_CACHE_TTL_SECONDS: int = 86400  # Redis entry lifetime
+
+    # Chunk Embedding Cache (content-hash cache used during ingestion)
+    # One row per distinct chunk text and embedding model; rows outlive the
+    # documents they came from until the periodic prune task removes them
+    CHUNK_EMBEDDING_CACHE_ENABLED: bool = True
+    CHUNK_EMBEDDING_CACHE_RETENTION_DAYS: int = 30  # Keep unreferenced entries this long
+    CHUNK_EMBEDDING_CACHE_PRUNE_HOURS: float = 24.0  # Celery beat prune interval (0 disables)
+
+    # Semantic Answer Cache (reuse answers to paraphrased questions per model)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_MAX_DISTANCE: float = 0.05  # Max cosine distance between queries
+    SEMANTIC_CACHE_TTL_SECONDS: int = 3600
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1000  # Per model (LRU)
+
+    # Query Embedding Micro-batching
+    EMBEDDING_BATCH_MAX_SIZE: int = 32  # Max queries encoded together
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0  # Max time to wait for a batch to fill
 
     # Celery
     CELERY_BROKER_URL: str | None = None
     CELERY_RESULT_BACKEND: str | None = None
+    CELERY_WORKER_CONCURRENCY: int = 2  # Prefork children per worker (0 = CPU count)
 
     # API Keys Encryption
     ENCRYPTION_KEY: Optional[str] = None
@@ -54,11 +101,70 @@ class Settings(BaseSettings):
     ]
 
     # WebSocket
-    WS_MESSAGE_QUEUE_SIZE: int = 100
+    WS_MESSAGE_QUEUE_SIZE: int = 100  # Outgoing messages buffered per connection
+    WS_STREAM_FLUSH_MS: float = 25.0  # Window for coalescing answer deltas into one frame
+    WS_STREAM_MAX_FRAME_CHARS: int = 2048  # Send a frame once this much text is pending
+    WS_SLOW_CONSUMER_TIMEOUT_SECONDS: float = 10.0  # Close with 1013 after blocking this long on a full queue
 
     # Chunking
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
+    CHUNK_INSERT_METHOD: str = "copy"  # copy (binary COPY) or insert (INSERT ... VALUES)
+    CHUNK_INSERT_BATCH_SIZE: int = 1000  # Rows per COPY / INSERT statement
+
+    # Ingestion Pipeline
+    INGEST_BATCH_SIZE: int = 256  # Chunks embedded, stored and committed together
+    INGEST_PREFETCH_BATCHES: int = 2  # Parsed batches buffered ahead of embedding
+    PDF_PARSE_WORKERS: int = 0  # Extraction processes per task (0 = CPUs / CELERY_WORKER_CONCURRENCY, 1 = serial)
+    PDF_PAGES_PER_SHARD: int = 50  # Pages extracted per process task
+    CSV_READ_CHUNK_ROWS: int = 10000  # CSV rows read into memory at a time
+    CSV_ROWS_PER_CHUNK: int = 1  # Consecutive CSV rows combined into one chunk
+
+    # Vector Index (pgvector ANN index on document_chunks.embedding)
+    VECTOR_INDEX_TYPE: str = "hnsw"  # hnsw, ivfflat, or none (exact scan)
+    HNSW_M: int = 16
+    HNSW_EF_CONSTRUCTION: int = 64
+    HNSW_EF_SEARCH: int = 40
+    IVFFLAT_LISTS: int = 100
+    IVFFLAT_PROBES: int = 10
+    VECTOR_INDEX_MAINTENANCE_WORK_MEM: str | None = None  # e.g. "1GB" for faster builds
+
+    # Retrieval (vector, lexical full-text, or hybrid reciprocal rank fusion)
+    # hybrid uses a second pooled connection per turn for the full-text query,
+    # and its full-text-only hits are not held to the similarity threshold
+    RETRIEVAL_MODE: str = "vector"  # vector, lexical, or hybrid
+    HYBRID_VECTOR_WEIGHT: float = 1.0  # RRF weight of the vector ranking
+    HYBRID_LEXICAL_WEIGHT: float = 1.0  # RRF weight of the full-text ranking
+    HYBRID_CANDIDATE_FACTOR: int = 3  # Candidates per retriever = top_k * factor
+    RRF_K: int = 60  # Reciprocal rank fusion constant
+
+    # Prompt Packing (token budget per prompt, per model override in models.max_context_tokens)
+    PROMPT_MAX_TOKENS: int = 4096  # Budget for models without max_context_tokens
+    PROMPT_HISTORY_MAX_MESSAGES: int = 10  # Most recent unsummarized messages considered
+    PROMPT_HISTORY_MAX_SHARE: float = 0.25  # Share of the budget history may use
+    PROMPT_MIN_TRUNCATED_TOKENS: int = 64  # Drop instead of truncating below this
+
+    # Chat Summaries (rolling summary of older messages, updated by a Celery task)
+    CHAT_SUMMARY_ENABLED: bool = True
+    CHAT_SUMMARY_TRIGGER_MESSAGES: int = 10  # Unsummarized messages that trigger an update
+    CHAT_SUMMARY_KEEP_MESSAGES: int = 4  # Most recent messages left out of the summary
+    CHAT_SUMMARY_MAX_WORDS: int = 200  # Requested summary length
+    CHAT_SUMMARY_MESSAGE_MAX_TOKENS: int = 512  # Per message in the summarization prompt
+
+    # Result Diversification (merge overlapping neighbour chunks, then MMR)
+    DIVERSIFY_RESULTS: bool = False  # Opt-in: fetches every candidate's embedding
+    MMR_LAMBDA: float = 0.7  # 1 = relevance only, 0 = diversity only
+    MMR_FETCH_FACTOR: int = 2  # Candidates = top_k * factor
+
+    # Reranking (cross-encoder over a wider candidate set)
+    RERANK_ENABLED: bool = False
+    RERANK_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_CANDIDATES: int = 20  # Chunks retrieved before reranking down to top_k
+    RERANK_BATCH_SIZE: int = 32  # Query/chunk pairs scored per forward pass
+    RERANK_MAX_LENGTH: int = 512  # Max tokens per query/chunk pair
+    RERANK_TIMEOUT_MS: float = 300.0  # Budget before falling back to retrieval order (0 = none)
+    RERANK_CACHE_SIZE: int = 10000  # Cached query/chunk scores (0 disables)
+    RERANK_MAX_PENDING: int = 2  # Jobs running or queued; more requests skip reranking
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,7 +1,15 @@
-from sqlalchemy import create_engine
+from pgvector.asyncpg import register_vector
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.metrics import POOL_ASYNC, POOL_SYNC, instrumented_pool
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Create SQLAlchemy engine
 engine = create_engine(
@@ -9,11 +17,43 @@ engine = create_engine(
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
+    poolclass=instrumented_pool(QueuePool, POOL_SYNC),
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_database_url(url: str):
+    """Same database, asyncpg driver"""
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+# Async engine for request handlers (chat); Celery workers use the sync engine
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20,
+    poolclass=instrumented_pool(AsyncAdaptedQueuePool, POOL_ASYNC),
+)
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _register_vector_codec(dbapi_connection, connection_record):
+    """Receive vector columns in pgvector's binary format instead of as text"""
+    try:
+        dbapi_connection.run_async(register_vector)
+    except ValueError as e:
+        # vector extension not created yet (before the first migration)
+        logger.warning(f"pgvector codec not registered: {e}")
+
+
+# Objects stay usable after commit, as handlers return them in responses
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -27,6 +67,12 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """Initialize database (create tables)"""
     from app.models import user, model, document, chat  # noqa
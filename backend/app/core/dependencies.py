@@ -1,23 +1,18 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import Optional
-from app.core.database import get_db
-from app.core.security import decode_token
+from app.core.auth_cache import auth_cache
+from app.core.database import AsyncSessionLocal, get_db
 from app.models.user import User, USER_ROLE_ADMIN, USER_ROLE_SUPERADMIN
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    """Get current authenticated user from JWT token"""
-    token = credentials.credentials
-    payload = decode_token(token)
-
-    print(f"Decoded payload: {payload}")  # Debugging line
+def _token_user_id(token: str) -> int:
+    """User id of a valid access token (401 otherwise)"""
+    payload = auth_cache.decode(token)
 
     if not payload:
         raise HTTPException(
@@ -33,15 +28,16 @@ def get_current_user(
             detail="Invalid token type",
         )
 
-    user_id: Optional[int] = payload.get("sub")
-    if user_id is None:
+    try:
+        return int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
         )
 
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+
+def _active_user(user: Optional[User]) -> User:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,6 +53,52 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> User:
+    """
+    Get current authenticated user from JWT token
+
+    Decoded tokens and user snapshots come from auth_cache, so repeat
+    requests don't touch the database.
+    """
+    user_id = _token_user_id(credentials.credentials)
+
+    # Get user from the snapshot cache, or the database
+    user = auth_cache.get_user(user_id)
+    if user is None:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user:
+            auth_cache.store_user(user)
+
+    return _active_user(user)
+
+
+async def load_user_async(user_id: int) -> Optional[User]:
+    """User snapshot from auth_cache, or from a short async session of its own"""
+    user = auth_cache.get_user(user_id)
+    if user is None:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(User).where(User.id == user_id))
+            user = result.scalars().first()
+        if user:
+            auth_cache.store_user(user)
+    return user
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> User:
+    """
+    get_current_user for streaming endpoints
+
+    No database session stays attached to the request while it streams.
+    """
+    user_id = _token_user_id(credentials.credentials)
+    return _active_user(await load_user_async(user_id))
+
+
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """Get current active user"""
     if not current_user.__getattribute__("is_active"):
@@ -0,0 +1,187 @@
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Tuple
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    REGISTRY,
+)
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.core.config import settings
+
+# Pipelines
+PIPELINE_CHAT = "chat"  # POST /api/chat/chat
+PIPELINE_SSE = "sse"  # POST /api/chat/stream
+PIPELINE_WS = "ws"  # /api/chat/ws
+PIPELINE_INGEST = "ingest"  # DocumentProcessor.process_document
+
+# Stages
+STAGE_EMBED = "embed"
+STAGE_SEARCH = "search"
+STAGE_HISTORY = "history"
+STAGE_PROMPT = "prompt"
+STAGE_TTFT = "ttft"  # Request sent to first streamed token
+STAGE_LLM = "llm"  # Whole LLM response
+STAGE_PARSE = "parse"  # Waiting for the next parsed batch
+STAGE_STORE = "store"
+STAGE_COMMIT = "commit"
+STAGE_TOTAL = "total"
+
+# Seconds; fine at the low end for embedding and index lookups
+STAGE_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+STAGE_SECONDS = Histogram(
+    "rag_stage_duration_seconds",
+    "Duration of chat and ingestion pipeline stages",
+    ["pipeline", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+LLM_TOKENS_PER_SECOND = Histogram(
+    "rag_llm_tokens_per_second",
+    "LLM output tokens per second of generation, per response",
+    ["pipeline", "provider"],
+    buckets=(1, 5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500),
+)
+
+LLM_OUTPUT_TOKENS = Counter(
+    "rag_llm_output_tokens",
+    "LLM output tokens generated",
+    ["pipeline", "provider"],
+)
+
+INGESTED_CHUNKS = Counter("rag_ingested_chunks", "Document chunks stored")
+
+INGESTED_DOCUMENTS = Counter(
+    "rag_ingested_documents", "Documents processed", ["status"]
+)
+
+# Database pools
+POOL_SYNC = "sync"  # engine (REST handlers, workers)
+POOL_ASYNC = "async"  # async_engine (chat)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "rag_db_pool_checked_out",
+    "Database connections checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_WAIT_SECONDS = Histogram(
+    "rag_db_pool_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["pool"],
+    buckets=STAGE_BUCKETS,
+)
+
+DB_POOL_TIMEOUTS = Counter(
+    "rag_db_pool_timeouts",
+    "Connection requests that timed out waiting for the pool",
+    ["pool"],
+)
+
+
+@lru_cache(maxsize=None)
+def _stage_child(pipeline: str, stage: str):
+    # Resolving labels takes a lock and a dict lookup; do it once per pair
+    return STAGE_SECONDS.labels(pipeline=pipeline, stage=stage)
+
+
+def observe_stage(pipeline: str, stage: str, seconds: float) -> None:
+    """Record the duration of one pipeline stage"""
+    if settings.METRICS_ENABLED:
+        _stage_child(pipeline, stage).observe(seconds)
+
+
+@contextmanager
+def stage_timer(pipeline: str, stage: str):
+    """Time the enclosed block as a pipeline stage (recorded on errors too)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(pipeline, stage, time.perf_counter() - start)
+
+
+def observe_llm_output(
+    pipeline: str, provider: str, tokens: int, seconds: float
+) -> None:
+    """Record tokens generated by one LLM response and its throughput"""
+    if not settings.METRICS_ENABLED or tokens <= 0:
+        return
+    LLM_OUTPUT_TOKENS.labels(pipeline=pipeline, provider=provider).inc(tokens)
+    if seconds > 0:
+        LLM_TOKENS_PER_SECOND.labels(pipeline=pipeline, provider=provider).observe(
+            tokens / seconds
+        )
+
+
+def instrumented_pool(pool_class, name: str):
+    """
+    Subclass of a SQLAlchemy queue pool that records checked-out
+    connections and how long each checkout waited for one
+
+    The checked-out gauge is set from the pool's own count rather than
+    counted up and down, so connections that are invalidated or detached
+    (which never come back through checkin) don't make it drift.
+    """
+    checked_out = DB_POOL_CHECKED_OUT.labels(pool=name)
+    wait_seconds = DB_POOL_WAIT_SECONDS.labels(pool=name)
+    timeouts = DB_POOL_TIMEOUTS.labels(pool=name)
+
+    class InstrumentedPool(pool_class):
+        def _record_checked_out(self):
+            if settings.METRICS_ENABLED:
+                checked_out.set(self.checkedout())
+
+        def _do_get(self):
+            if not settings.METRICS_ENABLED:
+                return super()._do_get()
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                timeouts.inc()
+                raise
+            finally:
+                wait_seconds.observe(time.perf_counter() - start)
+            self._record_checked_out()
+            return connection
+
+        def _do_return_conn(self, record):
+            super()._do_return_conn(record)
+            self._record_checked_out()
+
+        def _dec_overflow(self):
+            # Invalidated and detached connections leave the pool this way
+            result = super()._dec_overflow()
+            self._record_checked_out()
+            return result
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format
+
+    With PROMETHEUS_MULTIPROC_DIR set (several API workers, or Celery
+    workers sharing the directory), values from all processes are combined.
+    """
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
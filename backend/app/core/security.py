@@ -60,14 +60,11 @@ def create_refresh_token(data: dict) -> str:
 def decode_token(token: str) -> Optional[dict]:
     """Decode JWT token"""
     try:
-        print(f"Decoding token: {token}")  # Debugging line
-        print(f"secret key: {settings.SECRET_KEY}")  # Debugging line
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         return payload
-    except JWTError as e:
-        print(f"JWTError: {e}")  # Debugging line
+    except JWTError:
         return None
 
 
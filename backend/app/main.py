@@ -1,9 +1,10 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 from app.core.config import settings
 from app.core.database import engine, Base
-from app.api import auth, users, models, documents, chat
+from app.api import auth, users, models, documents, chat, admin
 import logging
 
 # Configure logging
@@ -11,6 +12,18 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _llm_models():
+    """(provider, model name) pairs of the configured chat models"""
+    from app.core.database import SessionLocal
+    from app.models.model import Model
+
+    db = SessionLocal()
+    try:
+        return db.query(Model.llm_provider, Model.llm_model_name).distinct().all()
+    finally:
+        db.close()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle manager for startup and shutdown events"""
@@ -24,6 +37,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
 
+    # Make sure every model has its document_chunks partition
+    from app.services.vector_index_service import ensure_model_partitions
+    try:
+        ensure_model_partitions()
+        logger.info("Chunk partitions checked")
+    except Exception as e:
+        logger.error(f"Error creating chunk partitions: {e}")
+
     # Initialize superadmin user
     from app.services.user_service import create_superadmin
     try:
@@ -32,11 +53,43 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error initializing superadmin: {e}")
 
+    # Load tokenizer encodings now; they may be downloaded on first use
+    from app.services.prompt_packer import preload_token_counters
+    try:
+        await asyncio.get_running_loop().run_in_executor(
+            None, preload_token_counters, _llm_models()
+        )
+        logger.info("Tokenizer encodings loaded")
+    except Exception as e:
+        logger.error(f"Error loading tokenizer encodings: {e}")
+
+    # Load the cross-encoder now rather than inside the first request's budget
+    from app.services.rerank_service import preload_reranker
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, preload_reranker)
+    except Exception as e:
+        logger.error(f"Error loading rerank model: {e}")
+
+    # Apply model cache invalidations from other replicas
+    from app.services.model_cache import model_cache
+    model_cache.start_listener()
+
     yield
 
     # Shutdown
     logger.info("Shutting down application...")
 
+    model_cache.stop_listener()
+
+    from app.services.embedding_service import embedding_batcher
+    await embedding_batcher.close()
+
+    from app.services.http_client import close_http_clients
+    await close_http_clients()
+
+    from app.core.database import async_engine
+    await async_engine.dispose()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -60,6 +113,7 @@ app.include_router(users.router, prefix="/api/users", tags=["Users"])
 app.include_router(models.router, prefix="/api/models", tags=["Models"])
 app.include_router(documents.router, prefix="/api/documents", tags=["Documents"])
 app.include_router(chat.router, prefix="/api/chat", tags=["Chat"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 
 
 @app.get("/")
@@ -76,3 +130,14 @@ async def root():
 async def health():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    from app.core.metrics import render_metrics
+
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
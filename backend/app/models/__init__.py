@@ -1,7 +1,7 @@
 # Database models
 from app.models.user import User
 from app.models.model import Model, ModelUserAccess
-from app.models.document import Document, DocumentChunk
+from app.models.document import Document, DocumentChunk, ChunkEmbeddingCache
 from app.models.chat import ChatSession, ChatMessage
 
 __all__ = [
@@ -10,6 +10,7 @@ __all__ = [
     "ModelUserAccess",
     "Document",
     "DocumentChunk",
+    "ChunkEmbeddingCache",
     "ChatSession",
     "ChatMessage",
 ]
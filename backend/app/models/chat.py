@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
@@ -26,6 +26,8 @@ class ChatSession(Base):
         Integer, ForeignKey("models.id", ondelete="CASCADE"), nullable=False
     )
     title = Column(String)  # Optional session title
+    summary = Column(Text)  # Rolling summary of messages up to summary_message_id
+    summary_message_id = Column(Integer)  # Last message folded into the summary
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -46,6 +48,10 @@ class ChatMessage(Base):
     """Chat message model"""
 
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # Recent messages of a session (prompt history)
+        Index("ix_chat_messages_session_id_id", "session_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(
@@ -6,9 +6,13 @@ from sqlalchemy import (
     ForeignKey,
     Text,
     BigInteger,
+    CHAR,
+    Computed,
+    Index,
 )
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from pgvector.sqlalchemy import Vector
 from app.core.database import Base
 from app.core.config import settings
@@ -22,6 +26,9 @@ DOCUMENT_STATUS_FAILED = "failed"
 
 DOCUMENT_STATUSES = [DOCUMENT_STATUS_UPLOADING, DOCUMENT_STATUS_PROCESSING, DOCUMENT_STATUS_COMPLETED, DOCUMENT_STATUS_FAILED]
 
+# Text search configuration of document_chunks.content_tsv (see migration 006)
+FULLTEXT_CONFIG = "english"
+
 
 class Document(Base):
     """Document model"""
@@ -48,7 +55,10 @@ class Document(Base):
     model = relationship("Model", back_populates="documents")
     uploader = relationship("User", back_populates="uploaded_documents")
     chunks = relationship(
-        "DocumentChunk", back_populates="document", cascade="all, delete-orphan"
+        "DocumentChunk",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        passive_deletes=True,  # ON DELETE CASCADE removes chunks in the database
     )
 
     def __repr__(self):
@@ -56,18 +66,43 @@ class Document(Base):
 
 
 class DocumentChunk(Base):
-    """Document chunk with embeddings for vector search"""
+    """
+    Document chunk with embeddings for vector search
+
+    The table is list-partitioned by model_id: every model owns a partition
+    (document_chunks_m<model_id>) with its own vector index, managed by
+    app.services.vector_index_service. content_tsv backs lexical search
+    with a GIN index that every partition inherits.
+    """
 
     __tablename__ = "document_chunks"
+    __table_args__ = (
+        Index(
+            "ix_document_chunks_content_tsv", "content_tsv", postgresql_using="gin"
+        ),
+        {"postgresql_partition_by": "LIST (model_id)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     document_id = Column(
-        Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     model_id = Column(
-        Integer, ForeignKey("models.id", ondelete="CASCADE"), nullable=False, index=True
+        Integer,
+        ForeignKey("models.id", ondelete="CASCADE"),
+        primary_key=True,  # Partition key must be part of the primary key
+        nullable=False,
     )
     content = Column(Text, nullable=False)
+    content_tsv = deferred(
+        Column(
+            TSVECTOR,
+            Computed(f"to_tsvector('{FULLTEXT_CONFIG}', content)", persisted=True),
+        )
+    )  # Generated full-text search vector
     embedding = Column(
         Vector(settings.EMBEDDING_DIMENSION)
     )  # Vector column for pgvector
@@ -85,3 +120,26 @@ class DocumentChunk(Base):
 
     def __repr__(self):
         return f"<DocumentChunk doc_id={self.document_id} index={self.chunk_index}>"
+
+
+class ChunkEmbeddingCache(Base):
+    """
+    Embeddings of previously seen chunk texts, keyed by content hash
+
+    Lets ingestion skip the encoder for text it has already embedded
+    (reprocessed documents, duplicate uploads, shared boilerplate).
+    Entries are not tied to chunks; tasks.prune_chunk_embedding_cache
+    deletes those no chunk uses anymore.
+    """
+
+    __tablename__ = "chunk_embedding_cache"
+
+    content_hash = Column(CHAR(64), primary_key=True)  # SHA-256 hex of chunk text
+    embedding_model = Column(String, primary_key=True)  # Model (and backend) key
+    embedding = Column(Vector(settings.EMBEDDING_DIMENSION), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self):
+        return f"<ChunkEmbeddingCache {self.content_hash[:12]} {self.embedding_model}>"
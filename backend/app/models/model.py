@@ -24,6 +24,7 @@ class Model(Base):
     llm_model_name = Column(String, nullable=False)  # e.g., "llama2", "gpt-4", "claude-3-opus"
     api_key_encrypted = Column(Text)  # Encrypted API key for external providers
     api_base_url = Column(String)  # Custom base URL for API providers
+    max_context_tokens = Column(Integer)  # Prompt token budget (None = settings.PROMPT_MAX_TOKENS)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -32,7 +33,7 @@ class Model(Base):
     creator = relationship("User", back_populates="created_models", foreign_keys=[created_by])
     user_access = relationship("ModelUserAccess", back_populates="model", cascade="all, delete-orphan")
     documents = relationship("Document", back_populates="model", cascade="all, delete-orphan")
-    document_chunks = relationship("DocumentChunk", back_populates="model", cascade="all, delete-orphan")
+    document_chunks = relationship("DocumentChunk", back_populates="model", cascade="all, delete-orphan", passive_deletes=True)
     chat_sessions = relationship("ChatSession", back_populates="model", cascade="all, delete-orphan")
 
     def __repr__(self):
@@ -0,0 +1,65 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class VectorIndexStatus(BaseModel):
+    """Schema for the vector index of one model partition"""
+
+    model_id: int
+    table_name: str
+    index_name: str
+    configured_type: str
+    exists: bool
+    is_valid: bool
+    definition: Optional[str] = None
+    size_bytes: int = 0
+
+
+class VectorIndexRebuildResponse(BaseModel):
+    """Schema for vector index rebuild response"""
+
+    task_id: str
+    status: str
+    message: str
+
+
+class EmbeddingCacheStats(BaseModel):
+    """Schema for query embedding cache statistics"""
+
+    size: int
+    max_size: int
+    redis_enabled: bool
+    hits: int
+    redis_hits: int
+    misses: int
+    redis_errors: int
+    hit_rate: float
+
+
+class ModelCacheStats(BaseModel):
+    """Schema for model config cache statistics"""
+
+    size: int
+    max_size: int
+    redis_enabled: bool
+    hits: int
+    misses: int
+    invalidations: int
+    redis_errors: int
+    hit_rate: float
+
+
+class AnswerCacheStats(BaseModel):
+    """Schema for semantic answer cache statistics"""
+
+    size: int
+    models: int
+    max_entries_per_model: int
+    max_distance: float
+    ttl_seconds: float
+    hits: int
+    misses: int
+    stores: int
+    evictions: int
+    invalidations: int
+    hit_rate: float
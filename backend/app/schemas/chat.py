@@ -1,10 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List, Literal
 from datetime import datetime
 
 # Type alias for message roles
 MessageRoleType = Literal["user", "assistant", "system"]
 
+# Type alias for retrieval modes
+RetrievalModeType = Literal["vector", "lexical", "hybrid"]
+
 
 class ChatMessageSource(BaseModel):
     """Source citation for a chat message"""
@@ -58,8 +61,14 @@ class ChatRequest(BaseModel):
     message: str
     session_id: Optional[int] = None
     model_id: int
-    top_k: int = 5  # Number of relevant chunks to retrieve
+    top_k: int = Field(5, ge=1, le=100)  # Number of relevant chunks to retrieve
     include_sources: bool = True
+    ef_search: Optional[int] = Field(None, ge=1, le=1000)  # HNSW search breadth
+    probes: Optional[int] = Field(None, ge=1, le=10000)  # IVFFlat lists to probe
+    retrieval_mode: Optional[RetrievalModeType] = None  # Defaults to settings
+    vector_weight: Optional[float] = Field(None, ge=0)  # Hybrid fusion weights
+    lexical_weight: Optional[float] = Field(None, ge=0)
+    rerank: Optional[bool] = None  # Cross-encoder rerank (defaults to settings)
 
 
 class ChatResponse(BaseModel):
@@ -67,3 +76,5 @@ class ChatResponse(BaseModel):
     session_id: int
     message: ChatMessageResponse
     sources: Optional[List[ChatMessageSource]] = None
+    cached: bool = False  # Answer served from the semantic answer cache
+    prompt_tokens: Optional[int] = None  # Tokens in the packed prompt
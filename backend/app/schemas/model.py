@@ -13,6 +13,7 @@ class ModelBase(BaseModel):
     llm_provider: LLMProviderType
     llm_model_name: str = Field(..., min_length=1)
     api_base_url: Optional[str] = None
+    max_context_tokens: Optional[int] = Field(None, ge=256)  # Prompt token budget
 
 
 class ModelCreate(ModelBase):
@@ -29,6 +30,7 @@ class ModelUpdate(BaseModel):
     llm_model_name: Optional[str] = None
     api_key: Optional[str] = None  # Plaintext, will be encrypted
     api_base_url: Optional[str] = None
+    max_context_tokens: Optional[int] = Field(None, ge=256)
 
 
 class ModelResponse(ModelBase):
@@ -0,0 +1,186 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Optional, Set
+import itertools
+import threading
+import time
+import numpy as np
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAnswer:
+    """A generated answer and the retrieval it was based on"""
+
+    answer: str
+    chunk_ids: FrozenSet[int]
+    embedding: np.ndarray  # L2-normalized query embedding
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class _ModelEntries:
+    """Entries of one model: LRU order plus an index by retrieved chunk ids"""
+
+    def __init__(self):
+        self.entries: "OrderedDict[int, CachedAnswer]" = OrderedDict()
+        self.by_chunks: Dict[FrozenSet[int], Set[int]] = {}
+
+    def remove(self, entry_id: int) -> None:
+        entry = self.entries.pop(entry_id)
+        ids = self.by_chunks.get(entry.chunk_ids)
+        if ids is not None:
+            ids.discard(entry_id)
+            if not ids:
+                del self.by_chunks[entry.chunk_ids]
+
+
+def _normalize(embedding) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class SemanticAnswerCache:
+    """
+    Per-model cache of LLM answers keyed by query meaning
+
+    A query hits when a cached query of the same model is within
+    max_distance cosine distance and retrieval returned the same chunk ids,
+    so the cached answer was generated from the same context (callers
+    rebuild sources from those chunks). Entries expire after ttl_seconds
+    and each model keeps at most max_entries (LRU).
+
+    Document changes made through the API invalidate the model's entries
+    explicitly; changes made by ingestion workers alter the retrieved chunk
+    ids (chunks are re-inserted with new ids), which stops old entries from
+    matching.
+    """
+
+    def __init__(self, max_entries: int, max_distance: float, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.ttl_seconds = ttl_seconds
+        self._models: Dict[int, _ModelEntries] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _is_expired(self, entry: CachedAnswer, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry.created_at > self.ttl_seconds
+
+    def lookup(
+        self, model_id: int, embedding, chunk_ids: Iterable[int]
+    ) -> Optional[CachedAnswer]:
+        """Find the closest cached answer for the same model and retrieval"""
+        if not self.enabled:
+            return None
+
+        query = _normalize(embedding)
+        key = frozenset(chunk_ids)
+        now = time.monotonic()
+
+        with self._lock:
+            model = self._models.get(model_id)
+            best_id, best_distance = None, None
+            for entry_id in list(model.by_chunks.get(key, ())) if model else []:
+                entry = model.entries[entry_id]
+                if self._is_expired(entry, now):
+                    model.remove(entry_id)
+                    self.evictions += 1
+                    continue
+                distance = 1.0 - float(np.dot(entry.embedding, query))
+                if distance <= self.max_distance and (
+                    best_distance is None or distance < best_distance
+                ):
+                    best_id, best_distance = entry_id, distance
+
+            if best_id is None:
+                self.misses += 1
+                return None
+
+            model.entries.move_to_end(best_id)
+            self.hits += 1
+            return model.entries[best_id]
+
+    def store(
+        self,
+        model_id: int,
+        embedding,
+        chunk_ids: Iterable[int],
+        answer: str,
+    ) -> None:
+        """Cache an answer generated for a query"""
+        if not self.enabled:
+            return
+
+        entry = CachedAnswer(
+            answer=answer,
+            chunk_ids=frozenset(chunk_ids),
+            embedding=_normalize(embedding),
+        )
+        with self._lock:
+            model = self._models.setdefault(model_id, _ModelEntries())
+            entry_id = next(self._ids)
+            model.entries[entry_id] = entry
+            model.by_chunks.setdefault(entry.chunk_ids, set()).add(entry_id)
+            self.stores += 1
+
+            while len(model.entries) > self.max_entries:
+                model.remove(next(iter(model.entries)))
+                self.evictions += 1
+
+    def invalidate_model(self, model_id: int) -> None:
+        """Drop all cached answers of a model (its documents or config changed)"""
+        with self._lock:
+            if self._models.pop(model_id, None) is not None:
+                self.invalidations += 1
+                logger.info(f"Semantic answer cache invalidated for model {model_id}")
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._models.clear()
+            self.hits = self.misses = self.stores = 0
+            self.evictions = self.invalidations = 0
+
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            size = sum(len(model.entries) for model in self._models.values())
+            models = len(self._models)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "models": models,
+            "max_entries_per_model": self.max_entries,
+            "max_distance": self.max_distance,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+answer_cache = SemanticAnswerCache(
+    max_entries=(
+        settings.SEMANTIC_CACHE_MAX_ENTRIES if settings.SEMANTIC_CACHE_ENABLED else 0
+    ),
+    max_distance=settings.SEMANTIC_CACHE_MAX_DISTANCE,
+    ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+)
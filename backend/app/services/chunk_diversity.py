@@ -0,0 +1,175 @@
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Shortest shared text treated as splitter overlap rather than coincidence
+MIN_OVERLAP_CHARS = 20
+
+
+def parse_embedding(value) -> Optional[np.ndarray]:
+    """Convert a pgvector value (text '[1,2,...]', Vector or sequence) to float32"""
+    if value is None:
+        return None
+    if hasattr(value, "to_numpy"):
+        # Decoded by the binary asyncpg codec
+        return value.to_numpy().astype(np.float32, copy=False)
+    if isinstance(value, str):
+        return np.array(value.strip("[]").split(","), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def find_overlap(left: str, right: str, max_overlap: int) -> int:
+    """
+    Length of the longest suffix of left that is also a prefix of right
+
+    Returns 0 when they share less than MIN_OVERLAP_CHARS.
+    """
+    longest = min(len(left), len(right), max_overlap)
+    for size in range(longest, MIN_OVERLAP_CHARS - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def merge_overlapping_chunks(chunks: List[Dict], max_overlap: int) -> List[Dict]:
+    """
+    Merge retrieved chunks that are overlapping neighbours in their document
+
+    Chunks of the same document with consecutive chunk_index values whose
+    texts overlap (as the text splitter produces) become one chunk with the
+    overlap written once. A merged chunk takes the rank, id, similarity and
+    embedding of its best-ranked part, and lists all parts in
+    "merged_chunk_ids".
+
+    Args:
+        chunks: Retrieved chunks, best first, with chunk_index set
+        max_overlap: Longest overlap to look for (about CHUNK_OVERLAP)
+
+    Returns:
+        Chunks in the original rank order, with neighbours merged
+    """
+    by_position = sorted(
+        (
+            (chunk["document_id"], chunk["chunk_index"], rank)
+            for rank, chunk in enumerate(chunks)
+            if chunk.get("chunk_index") is not None
+        ),
+    )
+
+    # Runs of overlapping neighbours, as lists of ranks in document order
+    runs: List[List[int]] = []
+    previous = None
+    for document_id, chunk_index, rank in by_position:
+        if (
+            previous is not None
+            and previous[0] == document_id
+            and previous[1] == chunk_index - 1
+            and find_overlap(
+                chunks[runs[-1][-1]]["content"], chunks[rank]["content"], max_overlap
+            )
+        ):
+            runs[-1].append(rank)
+        else:
+            runs.append([rank])
+        previous = (document_id, chunk_index)
+
+    merged_at: Dict[int, Dict] = {}
+    absorbed = set()
+    for run in runs:
+        if len(run) == 1:
+            continue
+        best = min(run)
+        content = chunks[run[0]]["content"]
+        for rank in run[1:]:
+            text = chunks[rank]["content"]
+            content += text[find_overlap(content, text, max_overlap) :]
+        merged_at[best] = {
+            **chunks[best],
+            "content": content,
+            "chunk_index": chunks[run[0]]["chunk_index"],
+            "metadata": chunks[run[0]].get("metadata", {}),
+            "merged_chunk_ids": [chunks[rank]["chunk_id"] for rank in run],
+        }
+        absorbed.update(rank for rank in run if rank != best)
+
+    return [
+        merged_at.get(rank, chunk)
+        for rank, chunk in enumerate(chunks)
+        if rank not in absorbed
+    ]
+
+
+def _relevance(chunks: List[Dict]) -> np.ndarray:
+    """
+    Relevance on a cosine-like scale from the strongest score the chunks carry
+
+    Cross-encoder logits go through a sigmoid, fused RRF scores are scaled by
+    the best one, and vector similarity is already a cosine.
+    """
+    if all("rerank_score" in chunk for chunk in chunks):
+        logits = np.array([c["rerank_score"] for c in chunks], dtype=np.float32)
+        return 1 / (1 + np.exp(-logits))
+    if all("score" in chunk for chunk in chunks):
+        scores = np.array([c["score"] for c in chunks], dtype=np.float32)
+        return scores / scores.max() if scores.max() > 0 else np.ones_like(scores)
+    if all("similarity" in chunk for chunk in chunks):
+        return np.array([c["similarity"] for c in chunks], dtype=np.float32)
+    # Rank order only
+    return np.linspace(1, 0.5, len(chunks), dtype=np.float32)
+
+
+def mmr_select(
+    chunks: List[Dict],
+    top_k: int,
+    lambda_mult: float,
+    embeddings: Optional[Sequence[np.ndarray]] = None,
+) -> List[Dict]:
+    """
+    Pick top_k chunks by maximal marginal relevance
+
+    Each step takes the chunk maximizing
+    lambda * relevance - (1 - lambda) * max cosine similarity to the chunks
+    already picked. Relevance comes from the chunks' own scores, so reranked
+    or fused order is respected.
+
+    Args:
+        chunks: Candidates, best first
+        top_k: Number of chunks to pick
+        lambda_mult: 1 = relevance only, 0 = diversity only
+        embeddings: Chunk embeddings (default: chunk["embedding"])
+
+    Returns:
+        Picked chunks in selection order
+    """
+    if len(chunks) <= 1 or top_k <= 0:
+        return chunks[:top_k]
+
+    if embeddings is None:
+        embeddings = [parse_embedding(chunk.get("embedding")) for chunk in chunks]
+    if any(embedding is None for embedding in embeddings):
+        logger.warning("MMR skipped: chunks without embeddings")
+        return chunks[:top_k]
+
+    vectors = np.vstack(embeddings).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms > 0, norms, 1)
+    similarity = vectors @ vectors.T
+
+    relevance = _relevance(chunks)
+    redundancy = np.full(len(chunks), -np.inf, dtype=np.float32)
+    available = np.ones(len(chunks), dtype=bool)
+    picked = []
+
+    for _ in range(min(top_k, len(chunks))):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * np.maximum(
+            redundancy, 0
+        )
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        picked.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[best])
+
+    return [chunks[i] for i in picked]
@@ -0,0 +1,131 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import text
+from typing import List, Dict
+import hashlib
+from app.models.document import ChunkEmbeddingCache
+from app.core.config import settings
+from app.services.embedding_service import encode_chunks, get_embedding_model_key
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Keep IN (...) lists and multi-row INSERTs at a reasonable size
+LOOKUP_BATCH_SIZE = 1000
+
+# Entries of other embedding models can never be hit again
+PRUNE_OTHER_MODELS_SQL = text(
+    "DELETE FROM chunk_embedding_cache WHERE embedding_model <> :model_key"
+)
+
+# Entries past the retention period whose text no stored chunk has anymore
+# (the chunk's hash is computed the same way as content_hash())
+PRUNE_UNREFERENCED_SQL = text(
+    """
+    DELETE FROM chunk_embedding_cache c
+    WHERE c.created_at < now() - make_interval(days => :retention_days)
+      AND NOT EXISTS (
+          SELECT 1 FROM document_chunks dc
+          WHERE encode(sha256(convert_to(dc.content, 'UTF8')), 'hex')
+              = c.content_hash
+      )
+"""
+)
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of a chunk's text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _lookup(db: Session, hashes: List[str], model_key: str) -> Dict[str, object]:
+    """Fetch cached embeddings for the given hashes"""
+    found = {}
+    for start in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+        batch = hashes[start : start + LOOKUP_BATCH_SIZE]
+        rows = db.query(
+            ChunkEmbeddingCache.content_hash, ChunkEmbeddingCache.embedding
+        ).filter(
+            ChunkEmbeddingCache.embedding_model == model_key,
+            ChunkEmbeddingCache.content_hash.in_(batch),
+        )
+        for row in rows:
+            found[row.content_hash] = row.embedding
+    return found
+
+
+def _store(db: Session, embeddings: Dict[str, object], model_key: str) -> None:
+    """Insert new embeddings, ignoring ones another worker stored meanwhile"""
+    items = list(embeddings.items())
+    for start in range(0, len(items), LOOKUP_BATCH_SIZE):
+        batch = items[start : start + LOOKUP_BATCH_SIZE]
+        stmt = insert(ChunkEmbeddingCache).values(
+            [
+                {
+                    "content_hash": digest,
+                    "embedding_model": model_key,
+                    "embedding": embedding,
+                }
+                for digest, embedding in batch
+            ]
+        )
+        db.execute(stmt.on_conflict_do_nothing())
+
+
+def embed_chunks_with_cache(db: Session, texts: List[str]) -> List:
+    """
+    Embed chunk texts, reusing embeddings of previously seen text
+
+    Texts are looked up in bulk by SHA-256 and embedding model; only unseen
+    texts go through the encoder (each distinct text once) and are added to
+    the cache. Returns one embedding (float32 array) per input text, in order.
+    """
+    if not settings.CHUNK_EMBEDDING_CACHE_ENABLED:
+        return list(encode_chunks(texts))
+
+    model_key = get_embedding_model_key()
+    hashes = [content_hash(text) for text in texts]
+
+    # First occurrence of each distinct text
+    unique = {}
+    for digest, text in zip(hashes, texts):
+        unique.setdefault(digest, text)
+
+    embeddings = _lookup(db, list(unique), model_key)
+
+    missing = [digest for digest in unique if digest not in embeddings]
+    if missing:
+        new_embeddings = encode_chunks([unique[d] for d in missing])
+        fresh = dict(zip(missing, new_embeddings))
+        _store(db, fresh, model_key)
+        embeddings.update(fresh)
+
+    logger.info(
+        f"Chunk embeddings: {len(texts)} chunks, {len(unique)} distinct, "
+        f"{len(unique) - len(missing)} cached, {len(missing)} encoded"
+    )
+    return [embeddings[digest] for digest in hashes]
+
+
+def prune_chunk_embedding_cache(db: Session, retention_days: int) -> Dict[str, int]:
+    """
+    Delete cache entries that can no longer save any work
+
+    Removes entries of embedding models other than the current one, and
+    entries older than retention_days whose text is not in any document
+    chunk (deleted documents and models). Younger unreferenced entries are
+    kept so that re-uploading recently deleted documents stays cheap.
+    """
+    model_key = get_embedding_model_key()
+    other_models = db.execute(PRUNE_OTHER_MODELS_SQL, {"model_key": model_key})
+    unreferenced = db.execute(
+        PRUNE_UNREFERENCED_SQL, {"retention_days": retention_days}
+    )
+    db.commit()
+
+    result = {
+        "other_models": other_models.rowcount,
+        "unreferenced": unreferenced.rowcount,
+    }
+    logger.info(f"Pruned chunk embedding cache: {result}")
+    return result
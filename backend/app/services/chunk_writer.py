@@ -0,0 +1,148 @@
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+import io
+import itertools
+import struct
+import time
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.document import DocumentChunk
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Chunk insert method constants
+CHUNK_INSERT_COPY = "copy"
+CHUNK_INSERT_VALUES = "insert"
+
+CHUNK_INSERT_METHODS = [CHUNK_INSERT_COPY, CHUNK_INSERT_VALUES]
+
+# Columns written for each chunk, in row tuple order
+CHUNK_COLUMNS = (
+    "document_id",
+    "model_id",
+    "content",
+    "embedding",
+    "metadata",
+    "chunk_index",
+)
+
+COPY_SQL = (
+    f"COPY document_chunks ({', '.join(CHUNK_COLUMNS)}) FROM STDIN WITH (FORMAT binary)"
+)
+
+# PostgreSQL binary COPY framing
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_COPY_TRAILER = struct.pack(">h", -1)
+_NULL_FIELD = struct.pack(">i", -1)
+
+# (document_id, model_id, content, embedding, metadata_json, chunk_index)
+ChunkRow = Tuple[int, int, str, Sequence[float], Optional[str], int]
+
+
+def _int4(value: int) -> bytes:
+    return struct.pack(">ii", 4, value)
+
+
+def _text(value: Optional[str]) -> bytes:
+    if value is None:
+        return _NULL_FIELD
+    data = value.encode("utf-8")
+    return struct.pack(">i", len(data)) + data
+
+
+def _vector(embedding: Sequence[float]) -> bytes:
+    """pgvector binary format: int16 dim, int16 unused, big-endian float4s"""
+    values = np.asarray(embedding, dtype=">f4").ravel()
+    return (
+        struct.pack(">ihh", 4 + 4 * values.size, values.size, 0) + values.tobytes()
+    )
+
+
+def encode_copy_rows(rows: Iterable[ChunkRow]) -> bytes:
+    """Encode chunk rows as a complete binary COPY stream"""
+    buffer = io.BytesIO()
+    buffer.write(_COPY_HEADER)
+    field_count = struct.pack(">h", len(CHUNK_COLUMNS))
+    for document_id, model_id, content, embedding, meta, chunk_index in rows:
+        buffer.write(field_count)
+        buffer.write(_int4(document_id))
+        buffer.write(_int4(model_id))
+        buffer.write(_text(content))
+        buffer.write(_vector(embedding))
+        buffer.write(_text(meta))
+        buffer.write(_int4(chunk_index))
+    buffer.write(_COPY_TRAILER)
+    return buffer.getvalue()
+
+
+def _copy_batch(db: Session, rows: List[ChunkRow]) -> None:
+    """COPY one batch over the session's connection (inside its transaction)"""
+    data = encode_copy_rows(rows)
+    raw = db.connection().connection.driver_connection
+    with raw.cursor() as cursor:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(COPY_SQL, io.BytesIO(data))
+        else:  # psycopg 3
+            with cursor.copy(COPY_SQL) as copy:
+                copy.write(data)
+
+
+def _insert_batch(db: Session, rows: List[ChunkRow]) -> None:
+    """Multi-row INSERT ... VALUES for one batch"""
+    db.execute(
+        insert(DocumentChunk.__table__).values(
+            [dict(zip(CHUNK_COLUMNS, row)) for row in rows]
+        )
+    )
+
+
+def _batches(rows: Iterable[ChunkRow], size: int) -> Iterator[List[ChunkRow]]:
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def write_chunks(
+    db: Session,
+    rows: Iterable[ChunkRow],
+    method: Optional[str] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """
+    Bulk insert chunk rows into document_chunks
+
+    Rows are written in batches inside the session's current transaction;
+    the caller commits. Returns the number of rows written.
+
+    Args:
+        db: Database session
+        rows: Row tuples in CHUNK_COLUMNS order (metadata already JSON encoded)
+        method: "copy" (binary COPY) or "insert" (multi-row INSERT ... VALUES);
+            defaults to settings.CHUNK_INSERT_METHOD
+        batch_size: Rows per COPY / INSERT; defaults to settings.CHUNK_INSERT_BATCH_SIZE
+    """
+    method = method or settings.CHUNK_INSERT_METHOD
+    if method == CHUNK_INSERT_COPY:
+        write_batch = _copy_batch
+    elif method == CHUNK_INSERT_VALUES:
+        write_batch = _insert_batch
+    else:
+        raise ValueError(
+            f"Unsupported CHUNK_INSERT_METHOD '{method}', "
+            f"expected one of {CHUNK_INSERT_METHODS}"
+        )
+
+    total = 0
+    start = time.perf_counter()
+    for batch in _batches(rows, max(1, batch_size or settings.CHUNK_INSERT_BATCH_SIZE)):
+        write_batch(db, batch)
+        total += len(batch)
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Inserted {total} chunks via {method} in {elapsed:.3f}s "
+        f"({total / elapsed if elapsed > 0 else 0:.0f} rows/sec)"
+    )
+    return total
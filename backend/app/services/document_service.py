@@ -3,11 +3,16 @@ from fileinput import filename
 import os
 import json
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
+from contextlib import closing
+import itertools
+import math
+import queue
+import threading
+import time
 from sqlalchemy.orm import Session
 from fastapi import UploadFile, HTTPException, status
 import aiofiles
-from pypdf import PdfReader
 import pandas as pd
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from app.models.document import (
@@ -19,11 +24,73 @@ from app.models.document import (
     DOCUMENT_STATUS_FAILED,
 )
 from app.core.config import settings
-from app.services.embedding_service import generate_embeddings_batch
+from app.core.metrics import (
+    INGESTED_CHUNKS,
+    INGESTED_DOCUMENTS,
+    PIPELINE_INGEST,
+    STAGE_COMMIT,
+    STAGE_EMBED,
+    STAGE_PARSE,
+    STAGE_STORE,
+    STAGE_TOTAL,
+    observe_stage,
+    stage_timer,
+)
+from app.services.chunk_embedding_cache import embed_chunks_with_cache
+from app.services.chunk_writer import write_chunks
+from app.services.answer_cache import answer_cache
+from app.services.pdf_extraction import iter_pdf_page_texts, resolve_workers
 import logging
 
 logger = logging.getLogger(__name__)
 
+_PREFETCH_DONE = object()
+
+
+def _prefetch(iterable: Iterable, max_buffered: int) -> Iterator:
+    """
+    Iterate over an iterable that is advanced in a background thread
+
+    Up to max_buffered items are produced ahead of the consumer. Exceptions
+    raised by the producer are re-raised in the consumer; stopping early
+    (break or error) signals the producer to stop.
+    """
+    buffer = queue.Queue(maxsize=max(1, max_buffered))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            put((_PREFETCH_DONE, e))
+            return
+        put((_PREFETCH_DONE, None))
+
+    thread = threading.Thread(target=produce, name="ingest-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _PREFETCH_DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
 
 class DocumentProcessor:
     """Handle document processing: upload, parse, chunk, embed"""
@@ -97,49 +164,76 @@ class DocumentProcessor:
 
         return document
 
-    def parse_pdf(self, file_path: str) -> List[dict]:
-        """Parse PDF and extract text with page numbers"""
-        chunks = []
+    def iter_pdf_pages(self, file_path: str) -> Iterator[dict]:
+        """Yield the text of each PDF page with its page number"""
         try:
-            reader = PdfReader(file_path)
-            for page_num, page in enumerate(reader.pages, 1):
-                text = page.extract_text()
+            pages = iter_pdf_page_texts(
+                file_path,
+                workers=resolve_workers(
+                    settings.PDF_PARSE_WORKERS,
+                    siblings=settings.CELERY_WORKER_CONCURRENCY or os.cpu_count() or 1,
+                ),
+                pages_per_shard=settings.PDF_PAGES_PER_SHARD,
+            )
+            for page_num, text in pages:
                 if text.strip():
-                    chunks.append(
-                        {
-                            "content": text,
-                            "metadata": {"page": page_num, "source": "pdf"},
-                        }
-                    )
+                    yield {
+                        "content": text,
+                        "metadata": {"page": page_num, "source": "pdf"},
+                    }
         except Exception as e:
             logger.error(f"Error parsing PDF: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to parse PDF: {str(e)}",
             )
-        return chunks
 
-    def parse_csv(self, file_path: str) -> List[dict]:
-        """Parse CSV and convert to text chunks"""
-        chunks = []
+    def parse_pdf(self, file_path: str) -> List[dict]:
+        """Parse PDF and extract text with page numbers"""
+        return list(self.iter_pdf_pages(file_path))
+
+    def iter_csv_rows(self, file_path: str) -> Iterator[dict]:
+        """
+        Yield CSV rows as "column: value | ..." text
+
+        The file is read CSV_READ_CHUNK_ROWS rows at a time and row strings
+        are built with vectorized column operations. With CSV_ROWS_PER_CHUNK
+        above 1, that many consecutive rows are joined into one item.
+        """
+        rows_per_chunk = max(1, settings.CSV_ROWS_PER_CHUNK)
+        # Whole groups per read so a group never spans two reads
+        groups_per_read = math.ceil(
+            max(1, settings.CSV_READ_CHUNK_ROWS) / rows_per_chunk
+        )
+        read_rows = groups_per_read * rows_per_chunk
+
         try:
-            df = pd.read_csv(file_path)
-
-            # Convert each row to text
-            idx = 0
-            for _, row in df.iterrows():
-                text_parts = []
-                for col, value in row.items():
-                    text_parts.append(f"{col}: {value}")
-                text = " | ".join(text_parts)
-
-                chunks.append(
-                    {
-                        "content": text,
-                        "metadata": {"row": int(idx) + 1, "source": "csv"},
-                    }
-                )
-                idx += 1
+            first_row = 1
+            reader = pd.read_csv(
+                file_path, chunksize=read_rows, dtype=str, keep_default_na=False
+            )
+            for frame in reader:
+                texts = None
+                for col in frame.columns:
+                    part = f"{col}: " + frame[col]
+                    texts = part if texts is None else texts + " | " + part
+                if texts is None:
+                    break
+                texts = texts.tolist()
+
+                for offset in range(0, len(texts), rows_per_chunk):
+                    group = texts[offset : offset + rows_per_chunk]
+                    row = first_row + offset
+                    if rows_per_chunk == 1:
+                        metadata = {"row": row, "source": "csv"}
+                    else:
+                        metadata = {
+                            "row": row,
+                            "row_end": row + len(group) - 1,
+                            "source": "csv",
+                        }
+                    yield {"content": "\n".join(group), "metadata": metadata}
+                first_row += len(texts)
 
         except Exception as e:
             logger.error(f"Error parsing CSV: {e}")
@@ -147,26 +241,60 @@ class DocumentProcessor:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to parse CSV: {str(e)}",
             )
-        return chunks
 
-    def chunk_text(self, text_chunks: List[dict]) -> List[dict]:
-        """Split text into smaller semantic chunks"""
-        all_chunks = []
+    def parse_csv(self, file_path: str) -> List[dict]:
+        """Parse CSV and convert to text chunks"""
+        return list(self.iter_csv_rows(file_path))
 
+    def iter_chunks(self, text_chunks: Iterable[dict]) -> Iterator[dict]:
+        """Split each parsed item into smaller semantic chunks"""
         for item in text_chunks:
             text = item["content"]
             meta = item["metadata"]
 
             # Split text
-            splits = self.text_splitter.split_text(text)
-
-            for split in splits:
-                all_chunks.append({"content": split, "meta": meta})
+            for split in self.text_splitter.split_text(text):
+                yield {"content": split, "meta": meta}
 
-        return all_chunks
+    def chunk_text(self, text_chunks: List[dict]) -> List[dict]:
+        """Split text into smaller semantic chunks"""
+        return list(self.iter_chunks(text_chunks))
+
+    def iter_parsed(self, file_type: str, file_path: str) -> Iterator[dict]:
+        """Yield parsed items (pages or rows) for a supported file type"""
+        if file_type == "pdf":
+            return self.iter_pdf_pages(file_path)
+        if file_type == "csv":
+            return self.iter_csv_rows(file_path)
+        raise ValueError(f"Unsupported file type: {file_type}")
+
+    def iter_chunk_batches(
+        self, file_type: str, file_path: str, batch_size: int
+    ) -> Iterator[List[dict]]:
+        """Parse and split the file, yielding lists of at most batch_size chunks"""
+        chunks = self.iter_chunks(self.iter_parsed(file_type, file_path))
+        while batch := list(itertools.islice(chunks, batch_size)):
+            yield batch
+
+    def _delete_chunks(self, document_id: int, model_id: int) -> None:
+        """Delete a document's chunks (in the current transaction)"""
+        self.db.query(DocumentChunk).filter(
+            DocumentChunk.model_id == model_id,  # partition pruning
+            DocumentChunk.document_id == document_id,
+        ).delete()
 
     async def process_document(self, document_id: int) -> None:
-        """Process document: parse, chunk, embed, and store"""
+        """
+        Process document: parse, chunk, embed, and store
+
+        Runs as a streaming pipeline: a background thread parses and splits
+        the file into batches of INGEST_BATCH_SIZE chunks (at most
+        INGEST_PREFETCH_BATCHES buffered) while this thread embeds and bulk
+        inserts each batch and commits it, so memory stays bounded by the
+        batch size rather than the document size. The previous chunks are
+        replaced when the first batch commits; if processing fails, the
+        document's chunks are deleted along with setting FAILED.
+        """
         document = self.db.query(Document).filter(Document.id == document_id).first()
 
         if not document:
@@ -174,48 +302,72 @@ class DocumentProcessor:
                 status_code=status.HTTP_404_NOT_FOUND, detail="Document not found"
             )
 
+        started = time.perf_counter()
         try:
             # Update status
             document.__setattr__("status", DOCUMENT_STATUS_PROCESSING)
             self.db.commit()
             file_type = document.__getattribute__("file_type")
             file_path = document.__getattribute__("file_path")
+            model_id = document.__getattribute__("model_id")
             if not file_path or not os.path.exists(file_path):
                 raise ValueError("Document file not found on server")
 
-            # Parse document
-            if file_type == "pdf":
-                parsed_chunks = self.parse_pdf(file_path)
-            elif file_type == "csv":
-                parsed_chunks = self.parse_csv(file_path)
-            else:
-                raise ValueError(f"Unsupported file type: {file_type}")
-            # Chunk text
-            chunks = self.chunk_text(parsed_chunks)
-
-            if not chunks:
-                raise ValueError("No content extracted from document")
+            batches = _prefetch(
+                self.iter_chunk_batches(
+                    file_type, file_path, max(1, settings.INGEST_BATCH_SIZE)
+                ),
+                settings.INGEST_PREFETCH_BATCHES,
+            )
+            total = 0
+            # Closing stops the parser thread when embedding or storing fails
+            with closing(batches):
+                while True:
+                    # Time spent waiting on the parser thread
+                    with stage_timer(PIPELINE_INGEST, STAGE_PARSE):
+                        batch = next(batches, None)
+                    if batch is None:
+                        break
+
+                    # Generate embeddings (reusing cached ones for known text)
+                    with stage_timer(PIPELINE_INGEST, STAGE_EMBED):
+                        embeddings = embed_chunks_with_cache(
+                            self.db, [chunk["content"] for chunk in batch]
+                        )
+
+                    # Old chunks (if re-embedding) go in the same transaction
+                    # as the first new ones, so the document stays searchable
+                    if not total:
+                        self._delete_chunks(document_id, model_id)
+
+                    # Bulk insert chunks with embeddings
+                    with stage_timer(PIPELINE_INGEST, STAGE_STORE):
+                        write_chunks(
+                            self.db,
+                            (
+                                (
+                                    document_id,
+                                    model_id,
+                                    chunk["content"],
+                                    embedding,
+                                    json.dumps(chunk["meta"]),
+                                    total + idx,
+                                )
+                                for idx, (chunk, embedding) in enumerate(
+                                    zip(batch, embeddings)
+                                )
+                            ),
+                        )
+                    with stage_timer(PIPELINE_INGEST, STAGE_COMMIT):
+                        self.db.commit()
+                    total += len(batch)
+                    INGESTED_CHUNKS.inc(len(batch))
+                    logger.info(
+                        f"Document {document_id}: stored {total} chunks so far"
+                    )
 
-            # Generate embeddings
-            texts = [chunk["content"] for chunk in chunks]
-            embeddings = generate_embeddings_batch(texts)
-
-            # Delete old chunks if re-embedding
-            self.db.query(DocumentChunk).filter(
-                DocumentChunk.document_id == document_id
-            ).delete()
-
-            # Store chunks with embeddings
-            for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-                doc_chunk = DocumentChunk(
-                    document_id=document_id,
-                    model_id=document.model_id,
-                    content=chunk["content"],
-                    embedding=embedding,
-                    metadata=json.dumps(chunk["metadata"]),
-                    chunk_index=idx,
-                )
-                self.db.add(doc_chunk)
+            if not total:
+                raise ValueError("No content extracted from document")
 
             # Update document status
             document.__setattr__("status", DOCUMENT_STATUS_COMPLETED)
@@ -225,14 +377,20 @@ class DocumentProcessor:
             self.db.commit()
 
             logger.info(
-                f"Document {document_id} processed successfully: {len(chunks)} chunks"
+                f"Document {document_id} processed successfully: {total} chunks"
             )
+            observe_stage(PIPELINE_INGEST, STAGE_TOTAL, time.perf_counter() - started)
+            INGESTED_DOCUMENTS.labels(status=DOCUMENT_STATUS_COMPLETED).inc()
 
         except Exception as e:
             logger.error(f"Error processing document {document_id}: {e}")
+            self.db.rollback()
+            # Batches committed before the failure must not stay searchable
+            self._delete_chunks(document_id, document.__getattribute__("model_id"))
             document.__setattr__("status", DOCUMENT_STATUS_FAILED)
             document.__setattr__("error_message", str(e))
             self.db.commit()
+            INGESTED_DOCUMENTS.labels(status=DOCUMENT_STATUS_FAILED).inc()
             raise
 
     def get_document(self, document_id: int) -> Optional[Document]:
@@ -260,6 +418,7 @@ class DocumentProcessor:
             )
 
         file_path = document.__getattribute__("file_path")
+        model_id = document.__getattribute__("model_id")
 
         # Delete file if it exists
         if file_path and os.path.exists(file_path):
@@ -267,3 +426,5 @@ class DocumentProcessor:
         # Delete document (chunks will be cascaded)
         self.db.delete(document)
         self.db.commit()
+
+        answer_cache.invalidate_model(model_id)
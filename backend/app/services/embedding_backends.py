@@ -0,0 +1,169 @@
+from pathlib import Path
+from typing import List
+import json
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Embedding backend constants
+EMBEDDING_BACKEND_TORCH = "torch"
+EMBEDDING_BACKEND_ONNX = "onnx"
+EMBEDDING_BACKEND_ONNX_INT8 = "onnx-int8"
+
+EMBEDDING_BACKENDS = [
+    EMBEDDING_BACKEND_TORCH,
+    EMBEDDING_BACKEND_ONNX,
+    EMBEDDING_BACKEND_ONNX_INT8,
+]
+
+# Files written by export_embedding_model.py
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model_int8.onnx"
+ONNX_CONFIG_FILE = "embedding_config.json"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class TorchEmbeddingBackend:
+    """SentenceTransformer running on PyTorch"""
+
+    def __init__(self, model_name: str, device: str = "cpu"):
+        # Imported lazily so ONNX deployments never pay the torch import cost
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device=device)
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+    ) -> np.ndarray:
+        """Encode texts into a (len(texts), dim) float32 array"""
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=show_progress_bar,
+        )
+
+
+class OnnxEmbeddingBackend:
+    """
+    Exported transformer running on ONNX Runtime
+
+    Reproduces the SentenceTransformer pipeline (tokenize, transformer,
+    pooling, optional L2 normalization) from the files written by
+    export_embedding_model.py.
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = False, num_threads: int = 0):
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise RuntimeError(
+                "The onnx embedding backends require 'onnxruntime' and 'tokenizers'"
+            ) from e
+
+        path = Path(model_dir)
+        model_file = path / (ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+        if not model_file.exists():
+            raise RuntimeError(
+                f"ONNX model not found at {model_file}; "
+                "run export_embedding_model.py first"
+            )
+
+        with open(path / ONNX_CONFIG_FILE) as f:
+            self.config = json.load(f)
+
+        self.pooling = self.config["pooling"]
+        self.normalize = self.config["normalize"]
+
+        self.tokenizer = Tokenizer.from_file(str(path / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.config["max_seq_length"])
+        self.tokenizer.enable_padding(
+            pad_id=self.config["pad_token_id"], pad_token=self.config["pad_token"]
+        )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            str(model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feed = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feed["token_type_ids"] = np.array(
+                [e.type_ids for e in encodings], dtype=np.int64
+            )
+
+        token_embeddings = self.session.run(None, feed)[0]
+
+        if self.pooling == "cls":
+            pooled = token_embeddings[:, 0]
+        elif self.pooling == "max":
+            masked = np.where(attention_mask[..., None] > 0, token_embeddings, -1e9)
+            pooled = masked.max(axis=1)
+        else:
+            mask = attention_mask[..., None].astype(token_embeddings.dtype)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(
+                mask.sum(axis=1), 1e-9, None
+            )
+
+        if self.normalize:
+            pooled = pooled / np.clip(
+                np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None
+            )
+        return pooled.astype(np.float32)
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+    ) -> np.ndarray:
+        """Encode texts into a (len(texts), dim) float32 array"""
+        if not texts:
+            return np.zeros((0, self.config["dimension"]), dtype=np.float32)
+
+        # Sort by length so each batch pads as little as possible
+        order = np.argsort([len(t) for t in texts])
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            batch = [texts[i] for i in order[start : start + batch_size]]
+            batches.append(self._encode_batch(batch))
+            if show_progress_bar:
+                logger.info(f"Encoded {min(start + batch_size, len(texts))}/{len(texts)}")
+
+        sorted_embeddings = np.concatenate(batches)
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+        return embeddings
+
+
+def load_embedding_backend(
+    backend: str,
+    model_name: str,
+    device: str = "cpu",
+    onnx_dir: str = "",
+    num_threads: int = 0,
+):
+    """Instantiate the given embedding backend"""
+    if backend == EMBEDDING_BACKEND_TORCH:
+        return TorchEmbeddingBackend(model_name, device=device)
+    if backend == EMBEDDING_BACKEND_ONNX:
+        return OnnxEmbeddingBackend(onnx_dir, quantized=False, num_threads=num_threads)
+    if backend == EMBEDDING_BACKEND_ONNX_INT8:
+        return OnnxEmbeddingBackend(onnx_dir, quantized=True, num_threads=num_threads)
+    raise ValueError(
+        f"Unsupported EMBEDDING_BACKEND '{backend}', expected one of {EMBEDDING_BACKENDS}"
+    )
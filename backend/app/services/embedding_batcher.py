@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+EncodeFn = Callable[[List[str]], List[List[float]]]
+
+
+class EmbeddingBatcher:
+    """
+    Dynamic micro-batcher for query embeddings
+
+    Concurrent callers enqueue single texts; a background task collects them
+    for up to max_wait_ms (or until max_batch_size items are waiting), runs
+    one batched encode in a worker thread and resolves each caller's future.
+    The event loop never blocks on the encoder.
+    """
+
+    def __init__(
+        self,
+        encode_fn: EncodeFn,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="embedding"
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Counters
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self) -> None:
+        """Start the batching task on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed one text as part of the next batch"""
+        self._ensure_started()
+        future = self._loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for the first item, then gather more until full or timed out"""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # Callers that gave up (e.g. disconnected) don't need an embedding
+        return [(text, future) for text, future in batch if not future.done()]
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = await self._loop.run_in_executor(
+                    self._executor, self.encode_fn, texts
+                )
+            except Exception as e:
+                logger.error(f"Batched embedding of {len(texts)} texts failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(texts)
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+    async def close(self) -> None:
+        """Stop the batching task and cancel callers still waiting"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
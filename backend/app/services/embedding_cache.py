@@ -0,0 +1,203 @@
+from collections import OrderedDict
+from typing import List, Optional, Dict
+import asyncio
+import hashlib
+import threading
+import numpy as np
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a query so trivially different spellings share a cache entry
+
+    Only whitespace is collapsed: cased embedding models embed "US" and
+    "us" differently.
+    """
+    return " ".join(text.split())
+
+
+def _as_float32(embedding) -> List[float]:
+    """Round to float32, the precision stored in Redis, so both tiers agree"""
+    return np.asarray(embedding, dtype=np.float32).tolist()
+
+
+class QueryEmbeddingCache:
+    """
+    Two-tier cache for query embeddings
+
+    Tier 1 is a bounded in-process LRU, tier 2 an optional Redis store shared
+    by all API workers. Keys are derived from the normalized text and the
+    embedding model name, so switching models never serves stale vectors.
+    Both tiers hold float32 values. Async handlers use get_async/set_async,
+    which keep Redis round-trips off the event loop.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 86400,
+    ):
+        self.max_size = max_size
+        self.redis_url = redis_url
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+
+        # Counters
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    @staticmethod
+    def make_key(text: str, model_name: str) -> str:
+        """Build the cache key for a query"""
+        digest = hashlib.sha256(
+            f"{model_name}\0{normalize_query(text)}".encode("utf-8")
+        ).hexdigest()
+        return f"query_embedding:{digest}"
+
+    def _get_redis(self):
+        """Get or initialize the Redis client (None if disabled)"""
+        if not self.redis_url:
+            return None
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.Redis.from_url(
+                self.redis_url,
+                socket_timeout=0.05,
+                socket_connect_timeout=0.05,
+            )
+        return self._redis
+
+    def _get_local(self, key: str) -> Optional[List[float]]:
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(embedding)
+
+    def _get_redis_value(self, key: str) -> Optional[List[float]]:
+        """Redis tier lookup (blocking); counts the miss of both tiers"""
+        client = self._get_redis()
+        raw = None
+        if client is not None:
+            try:
+                raw = client.get(key)
+            except Exception as e:
+                with self._lock:
+                    self.redis_errors += 1
+                logger.warning(f"Query embedding cache Redis lookup failed: {e}")
+
+        if raw is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        embedding = np.frombuffer(raw, dtype=np.float32).tolist()
+        self._set_local(key, embedding)
+        with self._lock:
+            self.redis_hits += 1
+        return embedding
+
+    def _set_redis_value(self, key: str, embedding: List[float]) -> None:
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            client.set(
+                key,
+                np.asarray(embedding, dtype=np.float32).tobytes(),
+                ex=self.ttl_seconds,
+            )
+        except Exception as e:
+            with self._lock:
+                self.redis_errors += 1
+            logger.warning(f"Query embedding cache Redis store failed: {e}")
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Look up an embedding, promoting Redis hits into the local tier"""
+        embedding = self._get_local(key)
+        if embedding is not None:
+            return embedding
+        return self._get_redis_value(key)
+
+    async def get_async(self, key: str) -> Optional[List[float]]:
+        """get, with the Redis lookup on the default executor"""
+        embedding = self._get_local(key)
+        if embedding is not None:
+            return embedding
+        if not self.redis_url:
+            with self._lock:
+                self.misses += 1
+            return None
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._get_redis_value, key
+        )
+
+    def set(self, key: str, embedding: List[float]) -> List[float]:
+        """Store an embedding in both tiers; returns it as stored (float32)"""
+        embedding = _as_float32(embedding)
+        self._set_local(key, embedding)
+        self._set_redis_value(key, embedding)
+        return embedding
+
+    def set_async(self, key: str, embedding: List[float]) -> List[float]:
+        """
+        set, with the Redis write started on the default executor and not
+        awaited (the caller needs only the local tier)
+        """
+        embedding = _as_float32(embedding)
+        self._set_local(key, embedding)
+        if self.redis_url:
+            asyncio.get_running_loop().run_in_executor(
+                None, self._set_redis_value, key, embedding
+            )
+        return embedding
+
+    def _set_local(self, key: str, embedding: List[float]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = list(embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Clear the in-process tier and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.redis_hits = self.misses = self.redis_errors = 0
+
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters"""
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "redis_enabled": bool(self.redis_url),
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "redis_errors": self.redis_errors,
+            "hit_rate": (self.hits + self.redis_hits) / lookups if lookups else 0.0,
+        }
+
+
+query_embedding_cache = QueryEmbeddingCache(
+    max_size=settings.EMBEDDING_CACHE_SIZE,
+    redis_url=settings.REDIS_URL if settings.EMBEDDING_CACHE_REDIS else None,
+    ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+)
@@ -1,7 +1,12 @@
-from sentence_transformers import SentenceTransformer
 from typing import List
 import numpy as np
 from app.core.config import settings
+from app.services.embedding_cache import query_embedding_cache
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_backends import (
+    EMBEDDING_BACKEND_TORCH,
+    load_embedding_backend,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,30 +15,89 @@ logger = logging.getLogger(__name__)
 _embedding_model = None
 
 
-def get_embedding_model() -> SentenceTransformer:
-    """Get or initialize the embedding model"""
+def get_embedding_model():
+    """Get or initialize the embedding backend selected by EMBEDDING_BACKEND"""
     global _embedding_model
     if _embedding_model is None:
-        logger.info(f"Loading embedding model: {settings.EMBEDDING_MODEL}")
-        _embedding_model = SentenceTransformer(
+        logger.info(
+            f"Loading embedding model: {settings.EMBEDDING_MODEL} "
+            f"(backend={settings.EMBEDDING_BACKEND})"
+        )
+        _embedding_model = load_embedding_backend(
+            settings.EMBEDDING_BACKEND,
             settings.EMBEDDING_MODEL,
-            device=settings.EMBEDDING_DEVICE
+            device=settings.EMBEDDING_DEVICE,
+            onnx_dir=settings.EMBEDDING_ONNX_DIR,
+            num_threads=settings.EMBEDDING_ONNX_THREADS,
         )
         logger.info("Embedding model loaded successfully")
     return _embedding_model
 
 
+def get_embedding_model_key() -> str:
+    """
+    Identify the model/backend that produces embeddings
+
+    Quantized backends return slightly different vectors, so caches keyed on
+    this value never mix them with full-precision ones.
+    """
+    if settings.EMBEDDING_BACKEND == EMBEDDING_BACKEND_TORCH:
+        return settings.EMBEDDING_MODEL
+    return f"{settings.EMBEDDING_MODEL}@{settings.EMBEDDING_BACKEND}"
+
+
 def generate_embedding(text: str) -> List[float]:
-    """Generate embedding for a single text"""
+    """Generate embedding for a single text (cached, for search queries)"""
+    key = query_embedding_cache.make_key(text, get_embedding_model_key())
+    cached = query_embedding_cache.get(key)
+    if cached is not None:
+        return cached
+
     model = get_embedding_model()
-    embedding = model.encode(text, convert_to_numpy=True)
-    return embedding.tolist()
+    embedding = model.encode([text])[0].tolist()
+    return query_embedding_cache.set(key, embedding)
+
+
+def encode_queries(texts: List[str]) -> List[List[float]]:
+    """Encode a batch of search queries (used by the micro-batcher)"""
+    model = get_embedding_model()
+    embeddings = model.encode(texts, batch_size=len(texts))
+    return embeddings.tolist()
+
+
+# Shared batcher for query embeddings requested from async handlers
+embedding_batcher = EmbeddingBatcher(
+    encode_fn=encode_queries,
+    max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+)
+
+
+async def generate_embedding_async(text: str) -> List[float]:
+    """
+    Generate embedding for a search query without blocking the event loop
+
+    Cache misses are encoded together with other concurrent queries by the
+    shared micro-batcher.
+    """
+    key = query_embedding_cache.make_key(text, get_embedding_model_key())
+    cached = await query_embedding_cache.get_async(key)
+    if cached is not None:
+        return cached
+
+    embedding = await embedding_batcher.embed(text)
+    return query_embedding_cache.set_async(key, embedding)
+
+
+def encode_chunks(texts: List[str]) -> np.ndarray:
+    """Embed document chunks into a (len(texts), dim) float32 array"""
+    return get_embedding_model().encode(texts)
 
 
 def generate_embeddings_batch(texts: List[str]) -> List[List[float]]:
     """Generate embeddings for multiple texts"""
     model = get_embedding_model()
-    embeddings = model.encode(texts, convert_to_numpy=True, show_progress_bar=True)
+    embeddings = model.encode(texts, show_progress_bar=True)
     return embeddings.tolist()
 
 
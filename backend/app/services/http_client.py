@@ -0,0 +1,68 @@
+from typing import Dict
+import asyncio
+import importlib.util
+import weakref
+import httpx
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Shared clients per event loop, keyed by provider base URL. Connections
+# belong to the loop that opened them, so each loop (e.g. one per Celery
+# task) has its own clients; close_http_clients() must run on a loop before
+# it closes.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]"
+_clients = weakref.WeakKeyDictionary()
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])"""
+    if not settings.LLM_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("LLM_HTTP2 is enabled but 'h2' is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _create_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=_http2_available(),
+        timeout=httpx.Timeout(
+            settings.LLM_HTTP_TIMEOUT_SECONDS,
+            connect=settings.LLM_HTTP_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def get_http_client(base_url: str) -> httpx.AsyncClient:
+    """
+    Get the shared client for a provider base URL
+
+    Clients keep connections alive between requests (and multiplex them over
+    HTTP/2 where the provider supports it), so only the first request to a
+    provider pays for DNS, TCP and TLS setup.
+    """
+    clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    key = base_url.rstrip("/")
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        client = _create_client()
+        clients[key] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the running loop's shared clients and their connections"""
+    clients = list(_clients.pop(asyncio.get_running_loop(), {}).values())
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing HTTP client: {e}")
@@ -7,7 +7,7 @@ from app.models.model import (
 )
 from app.core.security import api_key_encryption
 from app.core.config import settings
-import httpx
+from app.services.http_client import get_http_client
 import json
 import logging
 
@@ -17,14 +17,14 @@ logger = logging.getLogger(__name__)
 class LLMService:
     """Service for interacting with different LLM providers"""
 
-    def __init__(self, model: Model):
+    def __init__(self, model: Model, api_key: Optional[str] = None):
         self.model = model
         self.provider = model.llm_provider
         self.model_name = model.llm_model_name
 
-        # Decrypt API key if available
-        self.api_key = None
-        if model.api_key_encrypted:
+        # Decrypt API key if available (unless the caller has it already)
+        self.api_key = api_key
+        if self.api_key is None and model.api_key_encrypted:
             self.api_key = api_key_encryption.decrypt(model.api_key_encrypted)
 
         self.base_url = model.api_base_url
@@ -61,43 +61,43 @@ class LLMService:
         base_url = self.base_url or settings.OLLAMA_BASE_URL
         url = f"{base_url}/api/generate"
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                url,
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": False
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result.get("response", "")
+        client = get_http_client(base_url)
+        response = await client.post(
+            url,
+            json={
+                "model": self.model_name,
+                "prompt": prompt,
+                "stream": False
+            }
+        )
+        response.raise_for_status()
+        result = response.json()
+        return result.get("response", "")
 
     async def _stream_ollama(self, prompt: str) -> AsyncGenerator[str, None]:
         """Stream response from Ollama"""
         base_url = self.base_url or settings.OLLAMA_BASE_URL
         url = f"{base_url}/api/generate"
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            async with client.stream(
-                "POST",
-                url,
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": True
-                }
-            ) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            if "response" in data:
-                                yield data["response"]
-                        except json.JSONDecodeError:
-                            continue
+        client = get_http_client(base_url)
+        async with client.stream(
+            "POST",
+            url,
+            json={
+                "model": self.model_name,
+                "prompt": prompt,
+                "stream": True
+            }
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    try:
+                        data = json.loads(line)
+                        if "response" in data:
+                            yield data["response"]
+                    except json.JSONDecodeError:
+                        continue
 
     # OpenAI implementation
     async def _generate_openai(self, prompt: str) -> str:
@@ -108,22 +108,22 @@ class LLMService:
         base_url = self.base_url or "https://api.openai.com/v1"
         url = f"{base_url}/chat/completions"
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model_name,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "stream": False
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
+        client = get_http_client(base_url)
+        response = await client.post(
+            url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": self.model_name,
+                "messages": [{"role": "user", "content": prompt}],
+                "stream": False
+            }
+        )
+        response.raise_for_status()
+        result = response.json()
+        return result["choices"][0]["message"]["content"]
 
     async def _stream_openai(self, prompt: str) -> AsyncGenerator[str, None]:
         """Stream response from OpenAI"""
@@ -133,34 +133,34 @@ class LLMService:
         base_url = self.base_url or "https://api.openai.com/v1"
         url = f"{base_url}/chat/completions"
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            async with client.stream(
-                "POST",
-                url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model_name,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "stream": True
-                }
-            ) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        data_str = line[6:]
-                        if data_str == "[DONE]":
-                            break
-                        try:
-                            data = json.loads(data_str)
-                            if "choices" in data and len(data["choices"]) > 0:
-                                delta = data["choices"][0].get("delta", {})
-                                if "content" in delta:
-                                    yield delta["content"]
-                        except json.JSONDecodeError:
-                            continue
+        client = get_http_client(base_url)
+        async with client.stream(
+            "POST",
+            url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": self.model_name,
+                "messages": [{"role": "user", "content": prompt}],
+                "stream": True
+            }
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    data_str = line[6:]
+                    if data_str == "[DONE]":
+                        break
+                    try:
+                        data = json.loads(data_str)
+                        if "choices" in data and len(data["choices"]) > 0:
+                            delta = data["choices"][0].get("delta", {})
+                            if "content" in delta:
+                                yield delta["content"]
+                    except json.JSONDecodeError:
+                        continue
 
     # Anthropic implementation
     async def _generate_anthropic(self, prompt: str) -> str:
@@ -171,24 +171,24 @@ class LLMService:
         base_url = self.base_url or "https://api.anthropic.com"
         url = f"{base_url}/v1/messages"
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                url,
-                headers={
-                    "x-api-key": self.api_key,
-                    "anthropic-version": "2023-06-01",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model_name,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 4096,
-                    "stream": False
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result["content"][0]["text"]
+        client = get_http_client(base_url)
+        response = await client.post(
+            url,
+            headers={
+                "x-api-key": self.api_key,
+                "anthropic-version": "2023-06-01",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": self.model_name,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": 4096,
+                "stream": False
+            }
+        )
+        response.raise_for_status()
+        result = response.json()
+        return result["content"][0]["text"]
 
     async def _stream_anthropic(self, prompt: str) -> AsyncGenerator[str, None]:
         """Stream response from Anthropic Claude"""
@@ -198,33 +198,33 @@ class LLMService:
         base_url = self.base_url or "https://api.anthropic.com"
         url = f"{base_url}/v1/messages"
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            async with client.stream(
-                "POST",
-                url,
-                headers={
-                    "x-api-key": self.api_key,
-                    "anthropic-version": "2023-06-01",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model_name,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 4096,
-                    "stream": True
-                }
-            ) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        data_str = line[6:]
-                        try:
-                            data = json.loads(data_str)
-                            if data.get("type") == "content_block_delta":
-                                if "delta" in data and "text" in data["delta"]:
-                                    yield data["delta"]["text"]
-                        except json.JSONDecodeError:
-                            continue
+        client = get_http_client(base_url)
+        async with client.stream(
+            "POST",
+            url,
+            headers={
+                "x-api-key": self.api_key,
+                "anthropic-version": "2023-06-01",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": self.model_name,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": 4096,
+                "stream": True
+            }
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    data_str = line[6:]
+                    try:
+                        data = json.loads(data_str)
+                        if data.get("type") == "content_block_delta":
+                            if "delta" in data and "text" in data["delta"]:
+                                yield data["delta"]["text"]
+                    except json.JSONDecodeError:
+                        continue
 
     # Custom implementation (fallback to Ollama-style)
     async def _generate_custom(self, prompt: str) -> str:
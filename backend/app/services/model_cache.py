@@ -0,0 +1,250 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional, Tuple
+import threading
+import time
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.config import settings
+from app.core.security import api_key_encryption
+from app.models.model import Model, ModelUserAccess
+from app.models.user import User, USER_ROLE_ADMIN, USER_ROLE_SUPERADMIN
+from app.services.llm_service import LLMService
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Redis pub/sub channel carrying invalidated model ids
+MODEL_CACHE_CHANNEL = "model_cache:invalidate"
+
+# Columns copied into a cached model
+MODEL_COLUMNS = [column.key for column in Model.__table__.columns]
+
+
+@dataclass
+class CachedModel:
+    """Model configuration, decrypted API key and access list of one model"""
+
+    model: Model  # Detached and shared between requests: read only
+    api_key: Optional[str]
+    user_ids: FrozenSet[int]
+    version: Tuple[int, int]
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    def has_access(self, user: User) -> bool:
+        """Same rule as model_service.check_user_access"""
+        if user.role in [USER_ROLE_ADMIN, USER_ROLE_SUPERADMIN]:
+            return True
+        return user.id in self.user_ids
+
+    def llm_service(self) -> LLMService:
+        """LLMService for the model, without decrypting the key again"""
+        return LLMService(self.model, api_key=self.api_key)
+
+
+class ModelConfigCache:
+    """
+    Per-process cache of model configuration for the chat hot path
+
+    Each model id has a version that invalidate() bumps (clearing everything
+    bumps a global epoch). A load records the version before querying and
+    its result is only stored if the version is unchanged, so a load racing
+    an update can't put the old configuration back. Entries expire after
+    ttl_seconds as a bound on staleness.
+
+    model_service invalidates on update, delete and access changes. With a
+    Redis URL, invalidations are also published on MODEL_CACHE_CHANNEL and
+    a listener thread applies those of other API replicas.
+    """
+
+    def __init__(
+        self, max_size: int, ttl_seconds: float, redis_url: Optional[str] = None
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        self._entries: "OrderedDict[int, CachedModel]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._redis = None
+        self._listener: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.redis_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def _version(self, model_id: int) -> Tuple[int, int]:
+        return self._epoch, self._versions.get(model_id, 0)
+
+    def _lookup(self, model_id: int) -> Optional[CachedModel]:
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is not None:
+                if time.monotonic() - entry.loaded_at <= self.ttl_seconds:
+                    self._entries.move_to_end(model_id)
+                    self.hits += 1
+                    return entry
+                del self._entries[model_id]
+            self.misses += 1
+            return None
+
+    def _store(self, entry: CachedModel) -> None:
+        model_id = entry.model.id
+        with self._lock:
+            if self._version(model_id) != entry.version:
+                # Invalidated while loading
+                return
+            self._entries[model_id] = entry
+            self._entries.move_to_end(model_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def get_async(
+        self, db: AsyncSession, model_id: int
+    ) -> Optional[CachedModel]:
+        """Cached model configuration, loading it on a miss (None if no model)"""
+        if self.enabled:
+            entry = self._lookup(model_id)
+            if entry is not None:
+                return entry
+
+        with self._lock:
+            version = self._version(model_id)
+
+        result = await db.execute(select(Model).where(Model.id == model_id))
+        row = result.scalars().first()
+        if row is None:
+            return None
+        result = await db.execute(
+            select(ModelUserAccess.user_id).where(ModelUserAccess.model_id == model_id)
+        )
+        user_ids = frozenset(result.scalars().all())
+
+        model = Model(**{key: row.__getattribute__(key) for key in MODEL_COLUMNS})
+        make_transient_to_detached(model)
+        entry = CachedModel(
+            model=model,
+            api_key=(
+                api_key_encryption.decrypt(model.api_key_encrypted)
+                if model.api_key_encrypted
+                else None
+            ),
+            user_ids=user_ids,
+            version=version,
+        )
+        if self.enabled:
+            self._store(entry)
+        return entry
+
+    def invalidate_local(self, model_id: Optional[int] = None) -> None:
+        """Drop one model (or all) from this process"""
+        with self._lock:
+            if model_id is None:
+                self._epoch += 1
+                self._versions.clear()
+                self._entries.clear()
+            else:
+                self._versions[model_id] = self._versions.get(model_id, 0) + 1
+                self._entries.pop(model_id, None)
+            self.invalidations += 1
+
+    def invalidate(self, model_id: int) -> None:
+        """Drop a model here and, with Redis, on every other replica"""
+        self.invalidate_local(model_id)
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                client.publish(MODEL_CACHE_CHANNEL, str(model_id))
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Model cache invalidation publish failed: {e}")
+
+    def _get_redis(self):
+        """Get or initialize the Redis client (None if disabled)"""
+        if not self.redis_url:
+            return None
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.Redis.from_url(
+                self.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5
+            )
+        return self._redis
+
+    def start_listener(self) -> None:
+        """Apply invalidations published by other replicas (no-op without Redis)"""
+        if not self.redis_url or self._listener is not None:
+            return
+        self._stopped.clear()
+        self._listener = threading.Thread(
+            target=self._listen, name="model-cache-listener", daemon=True
+        )
+        self._listener.start()
+
+    def stop_listener(self) -> None:
+        self._stopped.set()
+        self._listener = None
+
+    def _listen(self) -> None:
+        import redis
+
+        delay = 1.0
+        while not self._stopped.is_set():
+            try:
+                client = redis.Redis.from_url(self.redis_url)
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(MODEL_CACHE_CHANNEL)
+                # Invalidations may have been missed while disconnected
+                self.invalidate_local()
+                delay = 1.0
+                while not self._stopped.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        continue
+                    try:
+                        self.invalidate_local(int(message["data"]))
+                    except (TypeError, ValueError):
+                        logger.warning(f"Ignoring model cache message {message!r}")
+                pubsub.close()
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Model cache listener error, reconnecting: {e}")
+                self._stopped.wait(delay)
+                delay = min(delay * 2, 30.0)
+
+    def clear(self) -> None:
+        """Clear the cache and reset counters"""
+        self.invalidate_local()
+        with self._lock:
+            self.hits = self.misses = self.invalidations = self.redis_errors = 0
+
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "redis_enabled": bool(self.redis_url),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "redis_errors": self.redis_errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+model_cache = ModelConfigCache(
+    max_size=settings.MODEL_CACHE_SIZE,
+    ttl_seconds=settings.MODEL_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL if settings.MODEL_CACHE_REDIS else None,
+)
@@ -4,6 +4,12 @@ from app.models.model import Model, ModelUserAccess
 from app.models.user import User, USER_ROLE_ADMIN, USER_ROLE_SUPERADMIN
 from app.schemas.model import ModelCreate, ModelUpdate
 from app.core.security import api_key_encryption
+from app.services.answer_cache import answer_cache
+from app.services.model_cache import model_cache
+from app.services.vector_index_service import (
+    create_model_partition,
+    drop_model_partition,
+)
 from fastapi import HTTPException, status
 
 
@@ -22,10 +28,16 @@ def create_model(db: Session, model_data: ModelCreate, creator_id: int) -> Model
         llm_model_name=model_data.llm_model_name,
         api_key_encrypted=api_key_encrypted,
         api_base_url=model_data.api_base_url,
+        max_context_tokens=model_data.max_context_tokens,
         created_by=creator_id
     )
 
     db.add(new_model)
+    db.flush()
+
+    # Each model stores its chunks in a dedicated partition
+    create_model_partition(db, new_model.id)
+
     db.commit()
     db.refresh(new_model)
 
@@ -83,12 +95,18 @@ def update_model(
         model.llm_model_name = model_data.llm_model_name
     if model_data.api_base_url is not None:
         model.api_base_url = model_data.api_base_url
+    if model_data.max_context_tokens is not None:
+        model.max_context_tokens = model_data.max_context_tokens
     if model_data.api_key is not None:
         # Encrypt new API key
         model.api_key_encrypted = api_key_encryption.encrypt(model_data.api_key)
 
     db.commit()
+    model_cache.invalidate(model_id)
     db.refresh(model)
+
+    # Answers from the previous LLM configuration are stale
+    answer_cache.invalidate_model(model_id)
     return model
 
 
@@ -101,9 +119,15 @@ def delete_model(db: Session, model_id: int) -> None:
             detail="Model not found"
         )
 
+    # Dropping the partition avoids a cascading DELETE over all chunks
+    drop_model_partition(db, model_id)
+
     db.delete(model)
     db.commit()
 
+    model_cache.invalidate(model_id)
+    answer_cache.invalidate_model(model_id)
+
 
 def assign_users_to_model(
     db: Session,
@@ -137,6 +161,7 @@ def assign_users_to_model(
         db.add(access)
 
     db.commit()
+    model_cache.invalidate(model_id)
 
 
 def check_user_access(db: Session, model_id: int, user: User) -> bool:
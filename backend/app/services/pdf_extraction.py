@@ -0,0 +1,109 @@
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+import os
+import logging
+import billiard
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+# No app imports here: spawned extraction processes import only this module
+
+# (page number starting at 1, extracted text)
+PageText = Tuple[int, str]
+
+
+def resolve_workers(workers: int, siblings: int = 1) -> int:
+    """
+    Number of extraction processes
+
+    0 shares the CPUs among siblings processes that may extract at the same
+    time (the Celery worker's prefork children), at least one each.
+    """
+    if workers > 0:
+        return workers
+    return max(1, (os.cpu_count() or 1) // max(1, siblings))
+
+
+def count_pages(file_path: str) -> int:
+    return len(PdfReader(file_path).pages)
+
+
+def extract_page_range(file_path: str, start: int, end: int) -> List[PageText]:
+    """Extract pages [start, end) (0-based) from the file"""
+    reader = PdfReader(file_path)
+    return [
+        (page_num + 1, reader.pages[page_num].extract_text())
+        for page_num in range(start, min(end, len(reader.pages)))
+    ]
+
+
+def _iter_serial(file_path: str, page_count: int) -> Iterator[PageText]:
+    reader = PdfReader(file_path)
+    for page_num in range(page_count):
+        yield page_num + 1, reader.pages[page_num].extract_text()
+
+
+def _iter_parallel(
+    file_path: str, page_count: int, workers: int, pages_per_shard: int
+) -> Iterator[PageText]:
+    """Extract page-range shards in a process pool, yielding pages in order"""
+    shards = [
+        (start, min(start + pages_per_shard, page_count))
+        for start in range(0, page_count, pages_per_shard)
+    ]
+    # billiard rather than multiprocessing: Celery's prefork children are
+    # daemonic, and multiprocessing refuses to start children from those.
+    # spawn: the caller may have threads (prefetching, torch) that fork would copy
+    pool = billiard.get_context("spawn").Pool(processes=min(workers, len(shards)))
+    # Keep a bounded window of shards in flight so results don't pile up
+    pending = deque()
+    next_shard = 0
+    try:
+        while pending or next_shard < len(shards):
+            while next_shard < len(shards) and len(pending) < workers * 2:
+                start, end = shards[next_shard]
+                pending.append(
+                    pool.apply_async(extract_page_range, (file_path, start, end))
+                )
+                next_shard += 1
+            yield from pending.popleft().get()
+    finally:
+        # On early exit, let the (bounded) shards in flight finish: billiard's
+        # terminate() can hang waiting for results of the workers it killed
+        for result in pending:
+            result.wait()
+        pool.close()
+        pool.join()
+
+
+def iter_pdf_page_texts(
+    file_path: str,
+    workers: int = 1,
+    pages_per_shard: int = 50,
+    max_pages: Optional[int] = None,
+) -> Iterator[PageText]:
+    """
+    Yield (page number, text) for every page of a PDF, in page order
+
+    With more than one worker and more than one shard of pages, each
+    process opens the file and extracts its own page range. Works from
+    Celery prefork children as well.
+
+    Args:
+        file_path: Path to the PDF
+        workers: Extraction processes (0 = one per CPU, 1 = serial)
+        pages_per_shard: Pages extracted per task
+        max_pages: Only extract the first max_pages pages
+    """
+    page_count = count_pages(file_path)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+
+    workers = resolve_workers(workers)
+    pages_per_shard = max(1, pages_per_shard)
+    if workers <= 1 or page_count <= pages_per_shard:
+        yield from _iter_serial(file_path, page_count)
+        return
+
+    yield from _iter_parallel(file_path, page_count, workers, pages_per_shard)
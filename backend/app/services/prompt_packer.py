@@ -0,0 +1,179 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+from app.models.model import LLM_PROVIDER_OPENAI
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fallback when no tokenizer is available: rough chars-per-token of English text
+CHARS_PER_TOKEN = 4
+
+# Encoding used to approximate providers without a public tokenizer
+DEFAULT_ENCODING = "cl100k_base"
+
+# Seconds before retrying an encoding that failed to load
+ENCODING_RETRY_SECONDS = 60.0
+
+
+class TokenCounter:
+    """
+    Count and truncate text in tokens
+
+    Uses a tiktoken encoding when one is available, otherwise a
+    characters-per-token estimate.
+    """
+
+    def __init__(self, encoding=None):
+        self.encoding = encoding
+
+    @property
+    def exact(self) -> bool:
+        return self.encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens tokens"""
+        if max_tokens <= 0:
+            return ""
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            return self.encoding.decode(tokens[:max_tokens])
+        return text[: max_tokens * CHARS_PER_TOKEN]
+
+
+def _load_encoding(provider: str, model_name: str):
+    """Get the tiktoken encoding for a model (None if unavailable)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        if provider == LLM_PROVIDER_OPENAI:
+            try:
+                return tiktoken.encoding_for_model(model_name)
+            except KeyError:
+                pass
+        # Other providers don't publish tokenizers; cl100k_base is close enough
+        # for budgeting
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        # Encodings are downloaded on first use and may be unreachable
+        logger.warning(f"Could not load tiktoken encoding for {model_name}: {e}")
+        return None
+
+
+_counters: Dict[Tuple[str, str], TokenCounter] = {}
+_failed_at: Dict[Tuple[str, str], float] = {}
+_counters_lock = threading.Lock()
+
+
+def get_token_counter(provider: str, model_name: str) -> TokenCounter:
+    """
+    Get a token counter matched to an LLM provider and model
+
+    Loaded encodings are kept. When loading fails (encodings are downloaded
+    on first use) the estimate is used and loading is retried after
+    ENCODING_RETRY_SECONDS. Loading may block on the network: call
+    preload_token_counters at startup and count off the event loop.
+    """
+    key = (provider, model_name)
+    counter = _counters.get(key)
+    if counter is not None:
+        return counter
+
+    failed_at = _failed_at.get(key)
+    if failed_at is not None and time.monotonic() - failed_at < ENCODING_RETRY_SECONDS:
+        return TokenCounter(None)
+
+    with _counters_lock:
+        counter = _counters.get(key)
+        if counter is not None:
+            return counter
+        encoding = _load_encoding(provider, model_name)
+        if encoding is None:
+            logger.info(
+                f"No tokenizer for {provider}/{model_name}, "
+                f"estimating {CHARS_PER_TOKEN} chars per token"
+            )
+            _failed_at[key] = time.monotonic()
+            return TokenCounter(None)
+        _failed_at.pop(key, None)
+        counter = _counters[key] = TokenCounter(encoding)
+        return counter
+
+
+def preload_token_counters(models: Iterable[Tuple[str, str]]) -> None:
+    """Load (and download if needed) encodings for (provider, model name) pairs"""
+    for provider, model_name in models:
+        get_token_counter(provider, model_name)
+
+
+@dataclass
+class PackedPrompt:
+    """A prompt fitted to a token budget and what went into it"""
+
+    prompt: str
+    prompt_tokens: int
+    budget: int
+    chunks: List[Dict] = field(default_factory=list)  # Chunks kept, in rank order
+    history: List[Dict] = field(default_factory=list)  # Messages kept, oldest first
+    dropped_chunks: int = 0
+    dropped_messages: int = 0
+
+
+def pack_items(
+    items: List[Dict],
+    budget: int,
+    counter: TokenCounter,
+    render: Callable[[Dict], str],
+    text_key: str,
+    min_truncated_tokens: int,
+) -> Tuple[List[Dict], int]:
+    """
+    Keep items in priority order while they fit in budget tokens
+
+    The first item that does not fit is truncated to the remaining budget if
+    at least min_truncated_tokens remain (marked "truncated"); it and every
+    lower-priority item are dropped otherwise.
+
+    Args:
+        items: Items in priority order (most important first)
+        budget: Tokens available to all items together
+        counter: Token counter of the target model
+        render: Formats an item as it appears in the prompt
+        text_key: Key of the item text that may be truncated
+        min_truncated_tokens: Smallest useful truncated item
+
+    Returns:
+        (kept items, tokens used)
+    """
+    kept, used = [], 0
+    for item in items:
+        cost = counter.count(render(item))
+        if used + cost <= budget:
+            kept.append(item)
+            used += cost
+            continue
+
+        remaining = budget - used
+        if remaining >= min_truncated_tokens:
+            overhead = cost - counter.count(item[text_key])
+            text = counter.truncate(item[text_key], remaining - overhead)
+            if text:
+                item = {**item, text_key: text, "truncated": True}
+                kept.append(item)
+                used += counter.count(render(item))
+        break
+
+    return kept, used
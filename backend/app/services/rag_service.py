@@ -1,113 +1,264 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from typing import List, Dict, Optional
-from app.models.document import DocumentChunk, Document
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple
+import asyncio
+from app.core.database import AsyncSessionLocal
+from app.models.document import DocumentChunk, Document, FULLTEXT_CONFIG
 from app.models.chat import ChatSession, ChatMessage, MESSAGE_ROLES
-from app.services.embedding_service import generate_embedding
+from app.models.model import Model
+from app.services.chunk_diversity import merge_overlapping_chunks, mmr_select
+from app.services.embedding_service import generate_embedding_async
+from app.services.prompt_packer import PackedPrompt, get_token_counter, pack_items
+from app.services.summary_service import needs_summary
+from app.services.rerank_service import rerank_async, rerank_candidates
+from app.services.vector_index_service import apply_search_params_async
 from app.core.config import settings
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Retrieval modes
+RETRIEVAL_MODE_VECTOR = "vector"
+RETRIEVAL_MODE_LEXICAL = "lexical"
+RETRIEVAL_MODE_HYBRID = "hybrid"
 
-class RAGService:
-    """Retrieval-Augmented Generation service"""
+RETRIEVAL_MODES = [RETRIEVAL_MODE_VECTOR, RETRIEVAL_MODE_LEXICAL, RETRIEVAL_MODE_HYBRID]
 
-    def __init__(self, db: Session):
-        self.db = db
+# Use pgvector's cosine distance operator (<=>)
+# Lower distance = more similar. The query embedding is bound as text, which
+# works whether or not the driver has a binary vector codec registered.
+_SEARCH_SQL = """
+    SELECT
+        dc.id,
+        dc.content,
+        dc.metadata,
+        dc.document_id,
+        d.filename,
+        dc.chunk_index,{embedding_column}
+        1 - (dc.embedding <=> CAST(CAST(:query_embedding AS text) AS vector)) as similarity
+    FROM document_chunks dc
+    JOIN documents d ON dc.document_id = d.id
+    WHERE dc.model_id = :model_id
+    ORDER BY dc.embedding <=> CAST(CAST(:query_embedding AS text) AS vector)
+    LIMIT :top_k
+"""
 
-    def search_similar_chunks(
-        self,
-        query: str,
-        model_id: int,
-        top_k: int = 5,
-        similarity_threshold: float = 0.3,
-    ) -> List[Dict]:
-        """
-        Search for similar document chunks using vector similarity
+# Full-text match on any query term (plainto_tsquery ANDs them), ranked by
+# cover density; similarity is still reported for source citations
+_LEXICAL_SQL = """
+    SELECT
+        dc.id,
+        dc.content,
+        dc.metadata,
+        dc.document_id,
+        d.filename,
+        dc.chunk_index,{embedding_column}
+        1 - (dc.embedding <=> CAST(CAST(:query_embedding AS text) AS vector)) as similarity,
+        ts_rank_cd(dc.content_tsv, q.query) as rank
+    FROM document_chunks dc
+    JOIN documents d ON dc.document_id = d.id,
+        (
+            SELECT replace(
+                plainto_tsquery('{fulltext_config}', :query)::text, '&', '|'
+            )::tsquery AS query
+        ) q
+    WHERE dc.model_id = :model_id
+      AND dc.content_tsv @@ q.query
+    ORDER BY rank DESC
+    LIMIT :top_k
+"""
 
-        Args:
-            query: User's search query
-            model_id: Model ID to search within
-            top_k: Number of results to return
-            similarity_threshold: Minimum similarity score
+# Chunk embeddings (several KB per row) are only fetched for MMR
+_EMBEDDING_COLUMN = "\n        dc.embedding,"
 
-        Returns:
-            List of relevant chunks with metadata and similarity scores
-        """
-        # Generate query embedding
-        query_embedding = generate_embedding(query)
-
-        # Use pgvector's cosine distance operator (<=>)
-        # Lower distance = more similar
-        sql = text(
-            """
-            SELECT
-                dc.id,
-                dc.content,
-                dc.metadata,
-                dc.document_id,
-                d.filename,
-                1 - (dc.embedding <=> :query_embedding) as similarity
-            FROM document_chunks dc
-            JOIN documents d ON dc.document_id = d.id
-            WHERE dc.model_id = :model_id
-            ORDER BY dc.embedding <=> :query_embedding
-            LIMIT :top_k
-        """
-        )
+SEARCH_SQL = text(_SEARCH_SQL.format(embedding_column=""))
+SEARCH_EMBEDDING_SQL = text(_SEARCH_SQL.format(embedding_column=_EMBEDDING_COLUMN))
+LEXICAL_SQL = text(
+    _LEXICAL_SQL.format(embedding_column="", fulltext_config=FULLTEXT_CONFIG)
+)
+LEXICAL_EMBEDDING_SQL = text(
+    _LEXICAL_SQL.format(
+        embedding_column=_EMBEDDING_COLUMN, fulltext_config=FULLTEXT_CONFIG
+    )
+)
 
-        result = self.db.execute(
-            sql,
-            {
-                "query_embedding": str(query_embedding),
-                "model_id": model_id,
-                "top_k": top_k,
-            },
+
+def _rows_to_chunks(rows, similarity_threshold: Optional[float] = None) -> List[Dict]:
+    """Convert search result rows to chunk dicts (above the threshold, if given)"""
+    chunks = []
+    for row in rows:
+        similarity = float(row.similarity)
+        if similarity_threshold is None or similarity >= similarity_threshold:
+            metadata = json.loads(row.metadata) if row.metadata else {}
+            chunks.append(
+                {
+                    "chunk_id": row.id,
+                    "content": row.content,
+                    "document_id": row.document_id,
+                    "document_name": row.filename,
+                    "similarity": similarity,
+                    "metadata": metadata,
+                    "chunk_index": row.chunk_index,
+                }
+            )
+            if "embedding" in row._fields:
+                # Only selected for MMR; dropped again by diversify_chunks
+                chunks[-1]["embedding"] = row.embedding
+    return chunks
+
+
+def reciprocal_rank_fusion(
+    rankings: List[Tuple[List[Dict], float]], top_k: int, k: int = 60
+) -> List[Dict]:
+    """
+    Fuse ranked chunk lists with weighted reciprocal rank fusion
+
+    Each chunk scores sum(weight / (k + rank)) over the lists it appears in;
+    the fused score is stored as chunk["score"].
+
+    Args:
+        rankings: (chunks in rank order, weight) per retriever
+        top_k: Number of fused chunks to return
+        k: RRF constant damping the influence of top ranks
+    """
+    fused: Dict[int, Dict] = {}
+    scores: Dict[int, float] = {}
+    for chunks, weight in rankings:
+        if weight <= 0:
+            continue
+        for rank, chunk in enumerate(chunks, 1):
+            chunk_id = chunk["chunk_id"]
+            fused.setdefault(chunk_id, chunk)
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + weight / (k + rank)
+
+    ranked = sorted(fused, key=lambda chunk_id: scores[chunk_id], reverse=True)
+    return [{**fused[chunk_id], "score": scores[chunk_id]} for chunk_id in ranked[:top_k]]
+
+
+@dataclass
+class PromptHistory:
+    """Conversation context for the next prompt"""
+
+    summary: Optional[str] = None  # Rolling summary of older messages
+    messages: List[Dict] = field(default_factory=list)  # Unsummarized, oldest first
+    needs_summary: bool = False  # Enough unsummarized messages to fold
+
+
+def _history_limit() -> int:
+    """Messages read per turn: prompt window or summary trigger, plus the current one"""
+    limit = settings.PROMPT_HISTORY_MAX_MESSAGES
+    if settings.CHAT_SUMMARY_ENABLED:
+        limit = max(limit, settings.CHAT_SUMMARY_TRIGGER_MESSAGES)
+    return limit + 1
+
+
+def _unsummarized_messages_query(session_id: int, summary_message_id: Optional[int]):
+    return (
+        select(ChatMessage.role, ChatMessage.content)
+        .where(
+            ChatMessage.session_id == session_id,
+            ChatMessage.id > (summary_message_id or 0),
         )
+        .order_by(ChatMessage.id.desc())
+        .limit(_history_limit())
+    )
 
-        chunks = []
-        for row in result:
-            similarity = float(row.similarity)
-            if similarity >= similarity_threshold:
-                metadata = json.loads(row.metadata) if row.metadata else {}
-                chunks.append(
-                    {
-                        "chunk_id": row.id,
-                        "content": row.content,
-                        "document_id": row.document_id,
-                        "document_name": row.filename,
-                        "similarity": similarity,
-                        "metadata": metadata,
-                    }
-                )
 
-        logger.info(
-            f"Found {len(chunks)} relevant chunks for query in model {model_id}"
+def _to_prompt_history(summary: Optional[str], rows) -> PromptHistory:
+    """Rows are newest first and include the current message, which is dropped"""
+    return PromptHistory(
+        summary=summary,
+        messages=[{"role": row.role, "content": row.content} for row in reversed(rows[1:])],
+        needs_summary=needs_summary(len(rows)),
+    )
+
+
+def _candidate_count(top_k: int, rerank_results: bool, diversify: bool) -> int:
+    """Chunks to retrieve before reranking / diversifying down to top_k"""
+    fetch_k = top_k
+    if rerank_results:
+        fetch_k = rerank_candidates(top_k)
+    if diversify:
+        fetch_k = max(fetch_k, top_k * max(1, settings.MMR_FETCH_FACTOR))
+    return fetch_k
+
+
+def _resolve_retrieval(
+    retrieval_mode: Optional[str],
+    vector_weight: Optional[float],
+    lexical_weight: Optional[float],
+) -> Tuple[str, float, float]:
+    """Fill in retrieval defaults from settings and validate the mode"""
+    mode = retrieval_mode or settings.RETRIEVAL_MODE
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(
+            f"Unsupported retrieval mode '{mode}', expected one of {RETRIEVAL_MODES}"
         )
-        return chunks
+    return (
+        mode,
+        settings.HYBRID_VECTOR_WEIGHT if vector_weight is None else vector_weight,
+        settings.HYBRID_LEXICAL_WEIGHT if lexical_weight is None else lexical_weight,
+    )
+
+
+class RAGService:
+    """
+    Retrieval-Augmented Generation helpers without database access
+
+    Diversification, prompt building and source formatting, shared by
+    AsyncRAGService.
+    """
+
+    def diversify_chunks(self, chunks: List[Dict], top_k: int) -> List[Dict]:
+        """
+        Remove redundancy from retrieved chunks, best first
+
+        Overlapping neighbouring chunks of a document are merged into one,
+        then top_k chunks are picked by maximal marginal relevance
+        (MMR_LAMBDA trades relevance against similarity to chunks already
+        picked).
+        """
+        merged = merge_overlapping_chunks(chunks, settings.CHUNK_OVERLAP)
+        selected = mmr_select(merged, top_k, settings.MMR_LAMBDA)
+        # Embeddings were only needed for MMR
+        return [
+            {key: value for key, value in chunk.items() if key != "embedding"}
+            for chunk in selected
+        ]
 
     def build_context(self, chunks: List[Dict]) -> str:
         """Build context string from retrieved chunks"""
         if not chunks:
             return "No relevant context found in the knowledge base."
 
-        context_parts = []
-        for i, chunk in enumerate(chunks, 1):
-            metadata = chunk.get("metadata", {})
-            source_info = f"[Source {i}: {chunk['document_name']}"
+        return "\n\n".join(
+            self._format_chunk(i, chunk) for i, chunk in enumerate(chunks, 1)
+        )
+
+    @staticmethod
+    def _format_chunk(index: int, chunk: Dict) -> str:
+        metadata = chunk.get("metadata", {})
+        source_info = f"[Source {index}: {chunk['document_name']}"
 
-            if "page" in metadata:
-                source_info += f", Page {metadata['page']}"
-            source_info += "]"
+        if "page" in metadata:
+            source_info += f", Page {metadata['page']}"
+        source_info += "]"
 
-            context_parts.append(f"{source_info}\n{chunk['content']}")
+        return f"{source_info}\n{chunk['content']}"
 
-        return "\n\n".join(context_parts)
+    @staticmethod
+    def _format_message(msg: Dict) -> str:
+        role = "User" if msg["role"] == "user" else "Assistant"
+        return f"{role}: {msg['content']}"
 
     def build_prompt(
-        self, query: str, context: str, chat_history: Optional[List[Dict]] = None
+        self,
+        query: str,
+        context: str,
+        chat_history: Optional[List[Dict]] = None,
+        summary: Optional[str] = None,
     ) -> str:
         """Build the full prompt for the LLM"""
         prompt_parts = [
@@ -118,12 +269,14 @@ class RAGService:
             "",
         ]
 
-        # Add chat history if available
+        # Add the summary of older messages, then recent ones (limited by pack_prompt)
+        if summary:
+            prompt_parts.extend(["Summary of the earlier conversation:", summary, ""])
+
         if chat_history:
             prompt_parts.append("Previous conversation:")
-            for msg in chat_history[-5:]:  # Last 5 messages for context
-                role = "User" if msg["role"] == "user" else "Assistant"
-                prompt_parts.append(f"{role}: {msg['content']}")
+            for msg in chat_history:
+                prompt_parts.append(self._format_message(msg))
             prompt_parts.append("")
 
         prompt_parts.extend(
@@ -142,7 +295,290 @@ class RAGService:
 
         return "\n".join(prompt_parts)
 
-    def get_or_create_session(
+    def pack_prompt(
+        self,
+        query: str,
+        chunks: List[Dict],
+        chat_history: Optional[List[Dict]],
+        model: Model,
+        summary: Optional[str] = None,
+    ) -> PackedPrompt:
+        """
+        Build the prompt within the model's token budget
+
+        The budget (model.max_context_tokens, else settings.PROMPT_MAX_TOKENS)
+        covers the whole prompt. After the fixed instructions, question and
+        conversation summary, history gets up to PROMPT_HISTORY_MAX_SHARE of
+        what is left (newest messages first) and chunks get the rest (in
+        retrieval rank order). Lower-ranked chunks and older messages are
+        truncated or dropped.
+
+        Args:
+            query: User's question
+            chunks: Retrieved chunks, most relevant first
+            chat_history: Previous messages, oldest first
+            model: Model whose provider tokenizer and budget apply
+            summary: Rolling summary of messages older than chat_history
+
+        Returns:
+            PackedPrompt with the prompt, its token count and what was kept
+        """
+        counter = get_token_counter(model.llm_provider, model.llm_model_name)
+        budget = model.max_context_tokens or settings.PROMPT_MAX_TOKENS
+        min_tokens = settings.PROMPT_MIN_TRUNCATED_TOKENS
+
+        # Fixed parts: instructions, question, summary and section headers
+        fixed = counter.count(
+            self.build_prompt(query, "", summary=summary)
+        ) + counter.count(
+            "Previous conversation:\n\n"
+        )
+        available = max(0, budget - fixed)
+
+        # Newest messages first, then restored to chronological order
+        history = list(chat_history or [])[-settings.PROMPT_HISTORY_MAX_MESSAGES :]
+        history_budget = int(available * settings.PROMPT_HISTORY_MAX_SHARE)
+        kept_history, history_tokens = pack_items(
+            list(reversed(history)),
+            history_budget,
+            counter,
+            lambda msg: self._format_message(msg) + "\n",
+            "content",
+            min_tokens,
+        )
+        kept_history.reverse()
+
+        kept_chunks, _ = pack_items(
+            chunks,
+            available - history_tokens,
+            counter,
+            lambda chunk: self._format_chunk(len(chunks), chunk) + "\n\n",
+            "content",
+            min_tokens,
+        )
+
+        prompt = self.build_prompt(
+            query=query,
+            context=self.build_context(kept_chunks),
+            chat_history=kept_history,
+            summary=summary,
+        )
+        packed = PackedPrompt(
+            prompt=prompt,
+            prompt_tokens=counter.count(prompt),
+            budget=budget,
+            chunks=kept_chunks,
+            history=kept_history,
+            dropped_chunks=len(chunks) - len(kept_chunks),
+            dropped_messages=len(chat_history or []) - len(kept_history),
+        )
+        if packed.dropped_chunks or packed.prompt_tokens > budget:
+            logger.info(
+                f"Packed prompt: {packed.prompt_tokens}/{budget} tokens, "
+                f"{len(kept_chunks)}/{len(chunks)} chunks, "
+                f"{len(kept_history)}/{len(chat_history or [])} messages"
+            )
+        return packed
+
+    def format_sources_for_response(self, chunks: List[Dict]) -> List[Dict]:
+        """Format retrieved chunks as source citations"""
+        sources = []
+        for chunk in chunks:
+            sources.append(
+                {
+                    "document_id": chunk["document_id"],
+                    "document_name": chunk["document_name"],
+                    "chunk_content": (
+                        chunk["content"][:200] + "..."
+                        if len(chunk["content"]) > 200
+                        else chunk["content"]
+                    ),
+                    "page": chunk["metadata"].get("page"),
+                    "similarity_score": round(chunk["similarity"], 3),
+                }
+            )
+        return sources
+
+
+class AsyncRAGService(RAGService):
+    """
+    Retrieval-Augmented Generation service on an AsyncSession (asyncpg)
+
+    Data access methods are coroutines so chat handlers never block the
+    event loop on the database; prompt building and formatting come from
+    RAGService.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search_similar_chunks(
+        self,
+        query: str,
+        model_id: int,
+        top_k: int = 5,
+        similarity_threshold: float = 0.3,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        query_embedding: Optional[List[float]] = None,
+        retrieval_mode: Optional[str] = None,
+        vector_weight: Optional[float] = None,
+        lexical_weight: Optional[float] = None,
+        rerank_results: Optional[bool] = None,
+        diversify: Optional[bool] = None,
+    ) -> List[Dict]:
+        """
+        Search for relevant document chunks
+
+        Vector mode ranks by embedding similarity, lexical mode by full-text
+        match, and hybrid mode fuses both rankings with reciprocal rank fusion.
+        In hybrid mode the lexical query runs on its own session, concurrently
+        with the vector query. Reranking runs off the event loop.
+
+        Args:
+            query: User's search query
+            model_id: Model ID to search within
+            top_k: Number of results to return
+            similarity_threshold: Minimum similarity score of vector results
+            ef_search: HNSW candidate list size (defaults to settings.HNSW_EF_SEARCH)
+            probes: IVFFlat lists to probe (defaults to settings.IVFFLAT_PROBES)
+            query_embedding: Precomputed query embedding (skips encoding)
+            retrieval_mode: vector, lexical or hybrid (defaults to settings.RETRIEVAL_MODE)
+            vector_weight: Hybrid fusion weight of the vector ranking
+            lexical_weight: Hybrid fusion weight of the lexical ranking
+            rerank_results: Rerank a wider candidate set with the cross-encoder
+                (defaults to settings.RERANK_ENABLED)
+            diversify: Merge overlapping neighbours and pick chunks by MMR
+                (defaults to settings.DIVERSIFY_RESULTS)
+
+        Returns:
+            List of relevant chunks with metadata and similarity scores
+        """
+        mode, vector_weight, lexical_weight = _resolve_retrieval(
+            retrieval_mode, vector_weight, lexical_weight
+        )
+        if rerank_results is None:
+            rerank_results = settings.RERANK_ENABLED
+        if diversify is None:
+            diversify = settings.DIVERSIFY_RESULTS
+
+        # Retrieve more candidates than needed and narrow them down afterwards
+        final_k = top_k
+        top_k = _candidate_count(top_k, rerank_results, diversify)
+
+        # Encoded on the embedding executor, off the event loop
+        if query_embedding is None:
+            query_embedding = await generate_embedding_async(query)
+
+        if mode == RETRIEVAL_MODE_VECTOR:
+            chunks = await self._vector_search(
+                query_embedding,
+                model_id,
+                top_k,
+                similarity_threshold,
+                ef_search,
+                probes,
+                diversify,
+            )
+        elif mode == RETRIEVAL_MODE_LEXICAL:
+            chunks = await self._lexical_search(
+                self.db, query, query_embedding, model_id, top_k, diversify
+            )
+        else:
+            candidates = top_k * max(1, settings.HYBRID_CANDIDATE_FACTOR)
+
+            async def lexical_on_own_session():
+                async with AsyncSessionLocal() as db:
+                    return await self._lexical_search(
+                        db, query, query_embedding, model_id, candidates, diversify
+                    )
+
+            dense, lexical = await asyncio.gather(
+                self._vector_search(
+                    query_embedding,
+                    model_id,
+                    candidates,
+                    similarity_threshold,
+                    ef_search,
+                    probes,
+                    diversify,
+                ),
+                lexical_on_own_session(),
+            )
+            chunks = reciprocal_rank_fusion(
+                [(dense, vector_weight), (lexical, lexical_weight)],
+                top_k,
+                settings.RRF_K,
+            )
+
+        if rerank_results:
+            chunks = await rerank_async(query, chunks, top_k if diversify else final_k)
+        if diversify:
+            chunks = self.diversify_chunks(chunks, final_k)
+
+        logger.info(
+            f"Found {len(chunks)} relevant chunks ({mode}) for query in model {model_id}"
+        )
+        return chunks
+
+    async def _vector_search(
+        self,
+        query_embedding: List[float],
+        model_id: int,
+        top_k: int,
+        similarity_threshold: float,
+        ef_search: Optional[int],
+        probes: Optional[int],
+        with_embedding: bool = False,
+    ) -> List[Dict]:
+        await apply_search_params_async(
+            self.db, top_k=top_k, ef_search=ef_search, probes=probes
+        )
+
+        result = await self.db.execute(
+            SEARCH_EMBEDDING_SQL if with_embedding else SEARCH_SQL,
+            {
+                "query_embedding": str(query_embedding),
+                "model_id": model_id,
+                "top_k": top_k,
+            },
+        )
+        return _rows_to_chunks(result, similarity_threshold)
+
+    @staticmethod
+    async def _lexical_search(
+        db: AsyncSession,
+        query: str,
+        query_embedding: List[float],
+        model_id: int,
+        top_k: int,
+        with_embedding: bool = False,
+    ) -> List[Dict]:
+        result = await db.execute(
+            LEXICAL_EMBEDDING_SQL if with_embedding else LEXICAL_SQL,
+            {
+                "query": query,
+                "query_embedding": str(query_embedding),
+                "model_id": model_id,
+                "top_k": top_k,
+            },
+        )
+        return _rows_to_chunks(result)
+
+    async def pack_prompt_async(
+        self,
+        query: str,
+        chunks: List[Dict],
+        chat_history: Optional[List[Dict]],
+        model: Model,
+        summary: Optional[str] = None,
+    ) -> PackedPrompt:
+        """pack_prompt on a worker thread; tokenizing would block the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.pack_prompt, query, chunks, chat_history, model, summary
+        )
+
+    async def get_or_create_session(
         self,
         user_id: int,
         model_id: int,
@@ -151,15 +587,14 @@ class RAGService:
     ) -> ChatSession:
         """Get existing session or create a new one"""
         if session_id:
-            session = (
-                self.db.query(ChatSession)
-                .filter(
+            result = await self.db.execute(
+                select(ChatSession).where(
                     ChatSession.id == session_id,
                     ChatSession.user_id == user_id,
                     ChatSession.model_id == model_id,
                 )
-                .first()
             )
+            session = result.scalars().first()
 
             if session:
                 return session
@@ -169,12 +604,12 @@ class RAGService:
             user_id=user_id, model_id=model_id, title=title or "New Chat"
         )
         self.db.add(session)
-        self.db.commit()
-        self.db.refresh(session)
+        await self.db.commit()
+        await self.db.refresh(session)
 
         return session
 
-    def save_message(
+    async def save_message(
         self,
         session_id: int,
         user_id: int,
@@ -191,47 +626,52 @@ class RAGService:
             sources=sources,
         )
         self.db.add(message)
-        self.db.commit()
-        self.db.refresh(message)
+        await self.db.commit()
+        await self.db.refresh(message)
 
         return message
 
-    def get_chat_history(self, session_id: int, limit: int = 10) -> List[ChatMessage]:
+    async def get_chat_history(
+        self, session_id: int, limit: int = 10
+    ) -> List[ChatMessage]:
         """Get chat history for a session"""
-        return (
-            self.db.query(ChatMessage)
-            .filter(ChatMessage.session_id == session_id)
+        result = await self.db.execute(
+            select(ChatMessage)
+            .where(ChatMessage.session_id == session_id)
             .order_by(ChatMessage.created_at.desc())
             .limit(limit)
-            .all()
         )
+        return list(result.scalars().all())
+
+    async def get_prompt_history(self, session_id: int) -> PromptHistory:
+        """
+        Get the conversation context for the next prompt
 
-    def get_user_sessions(
+        Returns the session's rolling summary and the messages after it,
+        excluding the current (latest) message.
+        """
+        result = await self.db.execute(
+            select(ChatSession.summary, ChatSession.summary_message_id).where(
+                ChatSession.id == session_id
+            )
+        )
+        session = result.first()
+        summary, summary_message_id = session if session else (None, None)
+        result = await self.db.execute(
+            _unsummarized_messages_query(session_id, summary_message_id)
+        )
+        return _to_prompt_history(summary, result.all())
+
+    async def get_user_sessions(
         self, user_id: int, model_id: Optional[int] = None, limit: int = 50
     ) -> List[ChatSession]:
         """Get user's chat sessions"""
-        query = self.db.query(ChatSession).filter(ChatSession.user_id == user_id)
+        query = select(ChatSession).where(ChatSession.user_id == user_id)
 
         if model_id:
-            query = query.filter(ChatSession.model_id == model_id)
+            query = query.where(ChatSession.model_id == model_id)
 
-        return query.order_by(ChatSession.updated_at.desc()).limit(limit).all()
-
-    def format_sources_for_response(self, chunks: List[Dict]) -> List[Dict]:
-        """Format retrieved chunks as source citations"""
-        sources = []
-        for chunk in chunks:
-            sources.append(
-                {
-                    "document_id": chunk["document_id"],
-                    "document_name": chunk["document_name"],
-                    "chunk_content": (
-                        chunk["content"][:200] + "..."
-                        if len(chunk["content"]) > 200
-                        else chunk["content"]
-                    ),
-                    "page": chunk["metadata"].get("page"),
-                    "similarity_score": round(chunk["similarity"], 3),
-                }
-            )
-        return sources
+        result = await self.db.execute(
+            query.order_by(ChatSession.updated_at.desc()).limit(limit)
+        )
+        return list(result.scalars().all())
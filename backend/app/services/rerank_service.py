@@ -0,0 +1,225 @@
+from collections import OrderedDict
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+)
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import threading
+import time
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Global cross-encoder (loaded once)
+_reranker = None
+_reranker_lock = threading.Lock()
+
+# Scoring runs on its own thread so a timed-out rerank never blocks the event
+# loop; scores it finishes late still land in the cache
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+
+# Jobs running or queued on the executor; requests beyond this skip reranking
+# instead of queueing behind work that would miss their budget anyway
+_job_slots = threading.BoundedSemaphore(max(1, settings.RERANK_MAX_PENDING))
+
+
+class RerankExpired(Exception):
+    """A queued rerank job reached its deadline before scoring started"""
+
+
+def get_reranker():
+    """Get or initialize the cross-encoder selected by RERANK_MODEL"""
+    global _reranker
+    with _reranker_lock:
+        if _reranker is None:
+            from sentence_transformers import CrossEncoder
+
+            logger.info(f"Loading rerank model: {settings.RERANK_MODEL}")
+            _reranker = CrossEncoder(
+                settings.RERANK_MODEL,
+                device=settings.EMBEDDING_DEVICE,
+                max_length=settings.RERANK_MAX_LENGTH,
+            )
+            logger.info("Rerank model loaded successfully")
+    return _reranker
+
+
+def preload_reranker() -> None:
+    """Load the cross-encoder up front so the first reranks aren't over budget"""
+    if settings.RERANK_ENABLED:
+        get_reranker()
+
+
+class RerankScoreCache:
+    """
+    Bounded LRU of cross-encoder scores keyed by (query, chunk id)
+
+    Chunk ids change whenever a document is re-ingested, so cached scores
+    never outlive the content they were computed for.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, int], float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, query: str, chunk_ids: List[int]) -> Dict[int, float]:
+        """Return the cached scores among chunk_ids"""
+        if self.max_size <= 0:
+            self.misses += len(chunk_ids)
+            return {}
+
+        found = {}
+        with self._lock:
+            for chunk_id in chunk_ids:
+                score = self._entries.get((query, chunk_id))
+                if score is not None:
+                    self._entries.move_to_end((query, chunk_id))
+                    found[chunk_id] = score
+            self.hits += len(found)
+            self.misses += len(chunk_ids) - len(found)
+        return found
+
+    def set_many(self, query: str, scores: Dict[int, float]) -> None:
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            for chunk_id, score in scores.items():
+                self._entries[(query, chunk_id)] = score
+                self._entries.move_to_end((query, chunk_id))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+rerank_score_cache = RerankScoreCache(max_size=settings.RERANK_CACHE_SIZE)
+
+
+def score_chunks(
+    query: str, chunks: List[Dict], deadline: Optional[float] = None
+) -> List[float]:
+    """
+    Score each chunk's relevance to the query (cached, batched inference)
+
+    Raises RerankExpired instead of running the model once time.monotonic()
+    is past deadline.
+    """
+    # Only whitespace is collapsed: the cross-encoder is case-sensitive
+    key = " ".join(query.split())
+    chunk_ids = [chunk["chunk_id"] for chunk in chunks]
+    scores = rerank_score_cache.get_many(key, chunk_ids)
+
+    missing = [chunk for chunk in chunks if chunk["chunk_id"] not in scores]
+    if missing:
+        if deadline is not None and time.monotonic() > deadline:
+            raise RerankExpired()
+        predicted = get_reranker().predict(
+            [(query, chunk["content"]) for chunk in missing],
+            batch_size=settings.RERANK_BATCH_SIZE,
+            show_progress_bar=False,
+        )
+        computed = {
+            chunk["chunk_id"]: float(score) for chunk, score in zip(missing, predicted)
+        }
+        rerank_score_cache.set_many(key, computed)
+        scores.update(computed)
+
+    return [scores[chunk_id] for chunk_id in chunk_ids]
+
+
+def _apply_scores(chunks: List[Dict], scores: List[float], top_n: int) -> List[Dict]:
+    order = sorted(range(len(chunks)), key=lambda i: scores[i], reverse=True)
+    return [{**chunks[i], "rerank_score": scores[i]} for i in order[:top_n]]
+
+
+def _budget_seconds(timeout_ms: Optional[float]) -> Optional[float]:
+    timeout_ms = settings.RERANK_TIMEOUT_MS if timeout_ms is None else timeout_ms
+    return timeout_ms / 1000 if timeout_ms > 0 else None
+
+
+def _submit(query: str, chunks: List[Dict], budget: Optional[float]) -> Optional[Future]:
+    """Queue a scoring job, or return None when RERANK_MAX_PENDING are pending"""
+    if not _job_slots.acquire(blocking=False):
+        return None
+    deadline = time.monotonic() + budget if budget is not None else None
+    try:
+        future = _executor.submit(score_chunks, query, chunks, deadline)
+    except BaseException:
+        _job_slots.release()
+        raise
+    # Released on completion, failure or cancellation before it ran
+    future.add_done_callback(lambda _: _job_slots.release())
+    return future
+
+
+def rerank(
+    query: str, chunks: List[Dict], top_n: int, timeout_ms: Optional[float] = None
+) -> List[Dict]:
+    """
+    Reorder chunks by cross-encoder relevance and keep the best top_n
+
+    If scoring does not finish within the time budget (RERANK_TIMEOUT_MS,
+    0 = unlimited), or RERANK_MAX_PENDING jobs are already pending, the
+    chunks keep their retrieval order. A timed-out job is cancelled if it
+    has not started, and skips the model if it starts past its deadline.
+    """
+    if len(chunks) <= 1:
+        return chunks[:top_n]
+
+    budget = _budget_seconds(timeout_ms)
+    future = _submit(query, chunks, budget)
+    if future is None:
+        logger.warning("Rerank queue full, using retrieval order")
+        return chunks[:top_n]
+    try:
+        scores = future.result(timeout=budget)
+    except FutureTimeoutError:
+        future.cancel()
+        logger.warning(f"Rerank of {len(chunks)} chunks over budget, using retrieval order")
+        return chunks[:top_n]
+    except Exception as e:
+        logger.error(f"Rerank failed, using retrieval order: {e}")
+        return chunks[:top_n]
+    return _apply_scores(chunks, scores, top_n)
+
+
+async def rerank_async(
+    query: str, chunks: List[Dict], top_n: int, timeout_ms: Optional[float] = None
+) -> List[Dict]:
+    """Rerank chunks without blocking the event loop (see rerank)"""
+    if len(chunks) <= 1:
+        return chunks[:top_n]
+
+    budget = _budget_seconds(timeout_ms)
+    future = _submit(query, chunks, budget)
+    if future is None:
+        logger.warning("Rerank queue full, using retrieval order")
+        return chunks[:top_n]
+    try:
+        # On timeout wait_for cancels the wrapper, which cancels a job that
+        # has not started yet
+        scores = await asyncio.wait_for(asyncio.wrap_future(future), budget)
+    except asyncio.TimeoutError:
+        logger.warning(f"Rerank of {len(chunks)} chunks over budget, using retrieval order")
+        return chunks[:top_n]
+    except Exception as e:
+        logger.error(f"Rerank failed, using retrieval order: {e}")
+        return chunks[:top_n]
+    return _apply_scores(chunks, scores, top_n)
+
+
+def rerank_candidates(top_k: int) -> int:
+    """Number of chunks to retrieve when reranking down to top_k"""
+    return max(top_k, settings.RERANK_CANDIDATES)
@@ -0,0 +1,125 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import update
+from typing import List, Optional
+from app.models.chat import ChatSession, ChatMessage
+from app.services.llm_service import LLMService
+from app.services.prompt_packer import TokenCounter, get_token_counter
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def needs_summary(unsummarized_messages: int) -> bool:
+    """Whether a session has enough unsummarized messages to fold"""
+    return (
+        settings.CHAT_SUMMARY_ENABLED
+        and unsummarized_messages >= settings.CHAT_SUMMARY_TRIGGER_MESSAGES
+    )
+
+
+def build_summary_prompt(
+    previous_summary: Optional[str],
+    messages: List[ChatMessage],
+    counter: TokenCounter,
+) -> str:
+    """Build the prompt that folds new messages into the running summary"""
+    lines = []
+    for msg in messages:
+        role = "User" if msg.role == "user" else "Assistant"
+        content = counter.truncate(
+            msg.content, settings.CHAT_SUMMARY_MESSAGE_MAX_TOKENS
+        )
+        lines.append(f"{role}: {content}")
+
+    return "\n".join(
+        [
+            "You maintain a running summary of a conversation between a user and "
+            "an AI assistant that answers from a knowledge base.",
+            "Update the summary with the new messages. Keep the user's goals, "
+            "facts and identifiers they gave, answers already given, decisions "
+            "and open questions. Drop greetings and repetition.",
+            f"Write plain prose, at most {settings.CHAT_SUMMARY_MAX_WORDS} words, "
+            "without any preamble.",
+            "",
+            "Current summary:",
+            previous_summary or "(none)",
+            "",
+            "New messages:",
+            *lines,
+            "",
+            "Updated summary:",
+        ]
+    )
+
+
+async def summarize_session(db: Session, session_id: int) -> bool:
+    """
+    Fold a session's older messages into its rolling summary
+
+    All unsummarized messages except the last CHAT_SUMMARY_KEEP_MESSAGES are
+    summarized together with the previous summary. No transaction is held
+    while the LLM runs; the summary is only written if no other run updated
+    it in the meantime.
+
+    Returns:
+        True if the summary was updated
+    """
+    session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
+    if not session:
+        return False
+
+    previous_message_id = session.summary_message_id
+    messages = (
+        db.query(ChatMessage)
+        .filter(
+            ChatMessage.session_id == session_id,
+            ChatMessage.id > (previous_message_id or 0),
+        )
+        .order_by(ChatMessage.id)
+        .all()
+    )
+    if not needs_summary(len(messages)):
+        db.rollback()
+        return False
+
+    keep = max(0, settings.CHAT_SUMMARY_KEEP_MESSAGES)
+    to_fold = messages[: len(messages) - keep]
+    if not to_fold:
+        db.rollback()
+        return False
+
+    model = session.model
+    counter = get_token_counter(model.llm_provider, model.llm_model_name)
+    prompt = build_summary_prompt(session.summary, to_fold, counter)
+    llm_service = LLMService(model)
+    last_message_id = to_fold[-1].id
+
+    # End the read transaction before the (slow) LLM call
+    db.commit()
+
+    summary = (await llm_service.generate_response(prompt)).strip()
+    if not summary:
+        logger.warning(f"Empty summary generated for chat session {session_id}")
+        return False
+
+    result = db.execute(
+        update(ChatSession)
+        .where(
+            ChatSession.id == session_id,
+            ChatSession.summary_message_id.is_not_distinct_from(previous_message_id),
+        )
+        .values(summary=summary, summary_message_id=last_message_id)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    if result.rowcount == 0:
+        logger.info(f"Chat session {session_id} summary was updated concurrently")
+        return False
+
+    logger.info(
+        f"Summarized {len(to_fold)} messages of chat session {session_id} "
+        f"({counter.count(summary)} tokens)"
+    )
+    return True
@@ -0,0 +1,305 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from typing import Optional, List, Dict
+from app.core.config import settings
+from app.core.database import engine, SessionLocal
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Index types supported by pgvector
+VECTOR_INDEX_HNSW = "hnsw"
+VECTOR_INDEX_IVFFLAT = "ivfflat"
+VECTOR_INDEX_NONE = "none"
+
+VECTOR_INDEX_TYPES = [VECTOR_INDEX_HNSW, VECTOR_INDEX_IVFFLAT, VECTOR_INDEX_NONE]
+
+CHUNKS_TABLE = "document_chunks"
+
+
+def get_index_type() -> str:
+    """Get the configured vector index type"""
+    index_type = settings.VECTOR_INDEX_TYPE.lower()
+    if index_type not in VECTOR_INDEX_TYPES:
+        raise ValueError(
+            f"Unsupported VECTOR_INDEX_TYPE '{settings.VECTOR_INDEX_TYPE}', "
+            f"expected one of {VECTOR_INDEX_TYPES}"
+        )
+    return index_type
+
+
+def partition_name(model_id: int) -> str:
+    """Name of the document_chunks partition holding a model's chunks"""
+    return f"{CHUNKS_TABLE}_m{int(model_id)}"
+
+
+def partition_index_name(model_id: int) -> str:
+    """Name of the vector index on a model's partition"""
+    return f"ix_{partition_name(model_id)}_embedding"
+
+
+def build_index_ddl(
+    index_name: str,
+    table: str,
+    concurrently: bool = False,
+    if_not_exists: bool = False,
+) -> Optional[str]:
+    """Build the CREATE INDEX statement for the configured index type"""
+    index_type = get_index_type()
+    if index_type == VECTOR_INDEX_NONE:
+        return None
+
+    if index_type == VECTOR_INDEX_HNSW:
+        params = (
+            f"m = {int(settings.HNSW_M)}, "
+            f"ef_construction = {int(settings.HNSW_EF_CONSTRUCTION)}"
+        )
+    else:
+        params = f"lists = {int(settings.IVFFLAT_LISTS)}"
+
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}"
+        f"{'IF NOT EXISTS ' if if_not_exists else ''}{index_name} "
+        f"ON {table} USING {index_type} (embedding vector_cosine_ops) "
+        f"WITH ({params})"
+    )
+
+
+def create_model_partition(db: Session, model_id: int) -> None:
+    """
+    Create the chunk partition and its vector index for a model
+
+    Runs inside the caller's transaction so the partition is only visible
+    once the model itself is committed.
+    """
+    table = partition_name(model_id)
+    db.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {table} PARTITION OF {CHUNKS_TABLE} "
+            f"FOR VALUES IN ({int(model_id)})"
+        )
+    )
+
+    ddl = build_index_ddl(partition_index_name(model_id), table, if_not_exists=True)
+    if ddl:
+        db.execute(text(ddl))
+
+    logger.info(f"Created chunk partition {table}")
+
+
+def detach_model_partition(model_id: int) -> None:
+    """
+    Detach a model's chunk partition without blocking document_chunks
+
+    DETACH PARTITION CONCURRENTLY (PostgreSQL 14+) takes only a SHARE UPDATE
+    EXCLUSIVE lock on the parent, so searches on other models go on. It
+    cannot run inside a transaction block, hence the autocommit connection.
+    A detach left pending by an interrupted run is finalized instead.
+    """
+    table = partition_name(model_id)
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        row = conn.execute(
+            text(
+                """
+                SELECT inhdetachpending
+                FROM pg_inherits
+                WHERE inhrelid = to_regclass(:table)
+                  AND inhparent = to_regclass(:parent)
+            """
+            ),
+            {"table": table, "parent": CHUNKS_TABLE},
+        ).first()
+        if row is None:
+            return
+
+        mode = "FINALIZE" if row.inhdetachpending else "CONCURRENTLY"
+        conn.execute(
+            text(f"ALTER TABLE {CHUNKS_TABLE} DETACH PARTITION {table} {mode}")
+        )
+    logger.info(f"Detached chunk partition {table}")
+
+
+def drop_model_partition(db: Session, model_id: int) -> None:
+    """
+    Drop a model's chunk partition (much cheaper than deleting its rows)
+
+    The partition is detached first: DROP TABLE on an attached partition
+    takes an ACCESS EXCLUSIVE lock on document_chunks, stalling every
+    search. The DROP itself runs in the caller's transaction.
+    """
+    detach_model_partition(model_id)
+    table = partition_name(model_id)
+    db.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    logger.info(f"Dropped chunk partition {table}")
+
+
+def ensure_model_partitions() -> None:
+    """Create partitions for models that do not have one yet"""
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            text(
+                """
+                SELECT m.id
+                FROM models m
+                WHERE to_regclass(:prefix || m.id::text) IS NULL
+            """
+            ),
+            {"prefix": f"{CHUNKS_TABLE}_m"},
+        )
+        model_ids = [row.id for row in rows]
+
+        for model_id in model_ids:
+            create_model_partition(db, model_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def search_params_sql(
+    top_k: int,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> Optional[str]:
+    """SET LOCAL statement tuning the ANN index for one query (None for exact scans)"""
+    index_type = get_index_type()
+
+    if index_type == VECTOR_INDEX_HNSW:
+        # HNSW returns at most ef_search candidates, so never go below top_k
+        value = max(int(ef_search or settings.HNSW_EF_SEARCH), top_k)
+        return f"SET LOCAL hnsw.ef_search = {value}"
+    if index_type == VECTOR_INDEX_IVFFLAT:
+        value = int(probes or settings.IVFFLAT_PROBES)
+        return f"SET LOCAL ivfflat.probes = {value}"
+    return None
+
+
+async def apply_search_params_async(
+    db: AsyncSession,
+    top_k: int,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> None:
+    """
+    Set ANN search parameters for the current transaction
+
+    SET LOCAL only lasts until the next commit/rollback, so the parameters
+    never leak into other requests sharing the pooled connection.
+    """
+    statement = search_params_sql(top_k, ef_search, probes)
+    if statement:
+        await db.execute(text(statement))
+
+
+def _list_partition_model_ids(conn) -> List[int]:
+    """Get the model ids that currently have a chunk partition"""
+    rows = conn.execute(
+        text(
+            """
+            SELECT m.id
+            FROM models m
+            WHERE to_regclass(:prefix || m.id::text) IS NOT NULL
+            ORDER BY m.id
+        """
+        ),
+        {"prefix": f"{CHUNKS_TABLE}_m"},
+    )
+    return [row.id for row in rows]
+
+
+def rebuild_vector_index(
+    model_id: Optional[int] = None, concurrently: bool = True
+) -> None:
+    """
+    Rebuild partition vector indexes with the current settings
+
+    Each new index is built under a temporary name and swapped in afterwards,
+    so searches keep using the old index until the new one is ready.
+    CONCURRENTLY cannot run inside a transaction, hence the autocommit
+    connection.
+
+    Args:
+        model_id: Only rebuild this model's partition (default: all partitions)
+        concurrently: Build without blocking writes to the partition
+    """
+    index_type = get_index_type()
+    cc = "CONCURRENTLY " if concurrently else ""
+
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        if settings.VECTOR_INDEX_MAINTENANCE_WORK_MEM:
+            conn.execute(
+                text("SELECT set_config('maintenance_work_mem', :value, false)"),
+                {"value": settings.VECTOR_INDEX_MAINTENANCE_WORK_MEM},
+            )
+
+        model_ids = (
+            [model_id] if model_id is not None else _list_partition_model_ids(conn)
+        )
+
+        for current_id in model_ids:
+            table = partition_name(current_id)
+            index_name = partition_index_name(current_id)
+            temp_name = f"{index_name}_new"
+
+            # Clean up a leftover (possibly invalid) index from an aborted rebuild
+            conn.execute(text(f"DROP INDEX {cc}IF EXISTS {temp_name}"))
+
+            if index_type == VECTOR_INDEX_NONE:
+                conn.execute(text(f"DROP INDEX {cc}IF EXISTS {index_name}"))
+                logger.info(f"Vector index dropped on {table} (VECTOR_INDEX_TYPE=none)")
+                continue
+
+            logger.info(f"Building {index_type} vector index on {table}")
+            conn.execute(text(build_index_ddl(temp_name, table, concurrently)))
+
+            conn.execute(text(f"DROP INDEX {cc}IF EXISTS {index_name}"))
+            conn.execute(text(f"ALTER INDEX {temp_name} RENAME TO {index_name}"))
+
+    logger.info(f"Vector indexes rebuilt for {len(model_ids)} partition(s)")
+
+
+def get_index_status(db: Session, model_id: Optional[int] = None) -> List[Dict]:
+    """Get definition and size of the vector index on each partition"""
+    rows = db.execute(
+        text(
+            """
+            SELECT
+                m.id AS model_id,
+                i.indexname,
+                i.indexdef,
+                pg_relation_size(c.oid) AS size_bytes,
+                x.indisvalid AS is_valid
+            FROM models m
+            LEFT JOIN pg_indexes i
+                ON i.tablename = :prefix || m.id::text
+                AND i.indexname = 'ix_' || :prefix || m.id::text || '_embedding'
+            LEFT JOIN pg_class c ON c.relname = i.indexname
+            LEFT JOIN pg_index x ON x.indexrelid = c.oid
+            WHERE (CAST(:model_id AS INTEGER) IS NULL OR m.id = :model_id)
+            ORDER BY m.id
+        """
+        ),
+        {"prefix": f"{CHUNKS_TABLE}_m", "model_id": model_id},
+    )
+
+    configured_type = get_index_type()
+    return [
+        {
+            "model_id": row.model_id,
+            "table_name": partition_name(row.model_id),
+            "index_name": partition_index_name(row.model_id),
+            "configured_type": configured_type,
+            "exists": row.indexname is not None,
+            "is_valid": bool(row.is_valid),
+            "definition": row.indexdef,
+            "size_bytes": int(row.size_bytes or 0),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,187 @@
+from typing import Optional
+import asyncio
+from fastapi import WebSocket
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SlowConsumerError(Exception):
+    """The client did not read frames fast enough"""
+
+
+class _Delta:
+    """Streamed answer text waiting to be coalesced into a stream_chunk frame"""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class WebSocketStreamer:
+    """
+    Per-connection WebSocket sender with delta coalescing and backpressure
+
+    Messages go through a bounded queue (WS_MESSAGE_QUEUE_SIZE) drained by
+    one writer task, so frames keep their order. Consecutive answer deltas
+    are merged into a single stream_chunk frame: the writer collects deltas
+    for up to WS_STREAM_FLUSH_MS (or WS_STREAM_MAX_FRAME_CHARS of text), and
+    a client that reads slowly gets fewer, larger frames. The first delta
+    after any other message is sent at once, so time-to-first-token is not
+    delayed.
+
+    Slow consumer policy: when the queue is full, the producer waits for
+    room, which in turn stops reading from the LLM provider. If the queue
+    stays full for WS_SLOW_CONSUMER_TIMEOUT_SECONDS, the send raises
+    SlowConsumerError; the endpoint then closes the connection with code
+    1013 (try again later) and drops the unfinished answer.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        queue_size: Optional[int] = None,
+        flush_ms: Optional[float] = None,
+        max_frame_chars: Optional[int] = None,
+        slow_consumer_timeout: Optional[float] = None,
+    ):
+        self.websocket = websocket
+        self.flush_interval = (
+            settings.WS_STREAM_FLUSH_MS if flush_ms is None else flush_ms
+        ) / 1000
+        self.max_frame_chars = max_frame_chars or settings.WS_STREAM_MAX_FRAME_CHARS
+        self.slow_consumer_timeout = (
+            settings.WS_SLOW_CONSUMER_TIMEOUT_SECONDS
+            if slow_consumer_timeout is None
+            else slow_consumer_timeout
+        )
+        self._queue: asyncio.Queue = asyncio.Queue(
+            maxsize=max(1, queue_size or settings.WS_MESSAGE_QUEUE_SIZE)
+        )
+        self._writer: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+        # Counters
+        self.deltas = 0
+        self.frames = 0
+
+    def start(self) -> None:
+        if self._writer is None:
+            self._writer = asyncio.get_running_loop().create_task(self._run())
+
+    async def send_json(self, message: dict) -> None:
+        """Queue a JSON message"""
+        await self._put(message)
+
+    async def send_delta(self, text: str) -> None:
+        """Queue answer text to be sent (coalesced) as stream_chunk frames"""
+        if text:
+            self.deltas += 1
+            await self._put(_Delta(text))
+
+    def _check_writer(self) -> None:
+        """Raise the writer's error if it has stopped"""
+        if self._error is not None:
+            raise self._error
+        if self._writer is not None and self._writer.done():
+            self._error = ConnectionError("WebSocket writer stopped")
+            raise self._error
+
+    async def _put(self, item) -> None:
+        self._check_writer()
+        self.start()
+        try:
+            self._queue.put_nowait(item)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        # Wait for room, but stop as soon as the writer fails: a dead writer
+        # never frees a slot and its error is the one to report
+        put = asyncio.ensure_future(self._queue.put(item))
+        try:
+            done, _ = await asyncio.wait(
+                {put, self._writer},
+                timeout=self.slow_consumer_timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            if not put.done():
+                put.cancel()
+        if put in done:
+            return
+        self._check_writer()
+        self._error = SlowConsumerError(
+            f"Send queue full for {self.slow_consumer_timeout}s"
+        )
+        raise self._error
+
+    async def _collect(self, first: _Delta):
+        """Merge deltas that follow first; return (text, next non-delta item)"""
+        parts = [first.text]
+        size = len(first.text)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+
+        while size < self.max_frame_chars:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            if not isinstance(item, _Delta):
+                return "".join(parts), item
+            parts.append(item.text)
+            size += len(item.text)
+
+        return "".join(parts), None
+
+    async def _send(self, message: dict) -> None:
+        await self.websocket.send_json(message)
+        self.frames += 1
+
+    async def _run(self) -> None:
+        streaming = False
+        try:
+            while True:
+                item = await self._queue.get()
+                while item is not None:
+                    if not isinstance(item, _Delta):
+                        await self._send(item)
+                        streaming = False
+                        item = None
+                    elif not streaming:
+                        # First delta of an answer goes out immediately
+                        await self._send({"type": "stream_chunk", "content": item.text})
+                        streaming = True
+                        item = None
+                    else:
+                        text, item = await self._collect(item)
+                        await self._send({"type": "stream_chunk", "content": text})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Client went away; surfaced to the producer on its next send
+            self._error = e
+
+    async def close(self) -> None:
+        """Stop the writer task, dropping unsent messages"""
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        if self.deltas:
+            logger.debug(
+                f"WebSocket stream sent {self.deltas} deltas in {self.frames} frames"
+            )
@@ -20,3 +20,14 @@ celery_app.conf.update(
     task_time_limit=3600,  # 1 hour max per task
     worker_prefetch_multiplier=1,
 )
+if settings.CELERY_WORKER_CONCURRENCY > 0:
+    celery_app.conf.worker_concurrency = settings.CELERY_WORKER_CONCURRENCY
+
+# Periodic tasks (run by the celery_beat service)
+if settings.CHUNK_EMBEDDING_CACHE_PRUNE_HOURS > 0:
+    celery_app.conf.beat_schedule = {
+        "prune-chunk-embedding-cache": {
+            "task": "tasks.prune_chunk_embedding_cache",
+            "schedule": settings.CHUNK_EMBEDDING_CACHE_PRUNE_HOURS * 3600,
+        },
+    }
@@ -1,7 +1,12 @@
 from celery import Task
 from app.workers.celery_app import celery_app
 from app.core.database import SessionLocal
+from app.core.config import settings
+from app.services.chunk_embedding_cache import prune_chunk_embedding_cache
 from app.services.document_service import DocumentProcessor
+from app.services.http_client import close_http_clients
+from app.services.summary_service import summarize_session
+from app.services.vector_index_service import rebuild_vector_index
 from app.models.document import DOCUMENT_STATUS_FAILED, Document
 import logging
 import asyncio
@@ -51,3 +56,60 @@ def process_document_task(self: Task, document_id: int):
 
     finally:
         db.close()
+
+
+@celery_app.task(name="tasks.rebuild_vector_index", time_limit=6 * 3600)
+def rebuild_vector_index_task(model_id: int | None = None, concurrently: bool = True):
+    """
+    Rebuild the ANN indexes on the document_chunks partitions
+
+    Args:
+        model_id: Only rebuild this model's partition (default: all)
+        concurrently: Build without blocking writes to the partitions
+    """
+    logger.info(f"Starting vector index rebuild (model_id={model_id})")
+    rebuild_vector_index(model_id=model_id, concurrently=concurrently)
+    return {"status": "success", "message": "Vector index rebuilt"}
+
+
+@celery_app.task(name="tasks.prune_chunk_embedding_cache")
+def prune_chunk_embedding_cache_task(retention_days: int | None = None):
+    """
+    Delete chunk embedding cache entries no document uses anymore
+
+    Args:
+        retention_days: Keep younger entries (default:
+            CHUNK_EMBEDDING_CACHE_RETENTION_DAYS)
+    """
+    if retention_days is None:
+        retention_days = settings.CHUNK_EMBEDDING_CACHE_RETENTION_DAYS
+    db = SessionLocal()
+    try:
+        pruned = prune_chunk_embedding_cache(db, retention_days)
+    finally:
+        db.close()
+    return {"status": "success", "pruned": pruned}
+
+
+@celery_app.task(name="tasks.summarize_session", ignore_result=True)
+def summarize_session_task(session_id: int):
+    """
+    Fold older messages of a chat session into its rolling summary
+
+    Args:
+        session_id: ID of the chat session
+    """
+    db = SessionLocal()
+    try:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(summarize_session(db, session_id))
+        finally:
+            # Pooled LLM connections belong to this loop
+            loop.run_until_complete(close_http_clients())
+            loop.close()
+    except Exception as e:
+        logger.error(f"Error summarizing chat session {session_id}: {e}")
+    finally:
+        db.close()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Compare chunk insert throughput (rows/sec) of the old per-row ORM path
+against the batched INSERT ... VALUES and binary COPY writers.
+
+Synthetic chunks with random embeddings are written for an existing
+document; every run is rolled back, so the database is left unchanged.
+
+Usage (from backend/):
+    python -m benchmarks.chunk_insert_benchmark --document-id 1 --rows 20000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.document import Document, DocumentChunk
+from app.services.chunk_writer import (
+    CHUNK_INSERT_COPY,
+    CHUNK_INSERT_VALUES,
+    write_chunks,
+)
+
+MODE_ORM = "orm"
+
+
+def make_rows(document_id: int, model_id: int, count: int, content_size: int):
+    rng = np.random.default_rng(42)
+    embeddings = rng.standard_normal((count, settings.EMBEDDING_DIMENSION)).astype(
+        np.float32
+    )
+    content = "lorem ipsum " * (content_size // 12)
+    return [
+        (
+            document_id,
+            model_id,
+            f"{i} {content}",
+            embeddings[i].tolist(),
+            json.dumps({"page": i // 4 + 1, "source": "pdf"}),
+            i,
+        )
+        for i in range(count)
+    ]
+
+
+def insert_orm(db, rows) -> None:
+    """Previous behaviour: one ORM object per chunk"""
+    for document_id, model_id, content, embedding, meta, chunk_index in rows:
+        db.add(
+            DocumentChunk(
+                document_id=document_id,
+                model_id=model_id,
+                content=content,
+                embedding=embedding,
+                meta=meta,
+                chunk_index=chunk_index,
+            )
+        )
+    db.flush()
+
+
+def run(db, mode: str, rows, batch_size: int) -> float:
+    """Insert all rows in one transaction, roll back, return elapsed seconds"""
+    start = time.perf_counter()
+    try:
+        if mode == MODE_ORM:
+            insert_orm(db, rows)
+        else:
+            write_chunks(db, rows, method=mode, batch_size=batch_size)
+        return time.perf_counter() - start
+    finally:
+        db.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--document-id", type=int, required=True)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--content-size", type=int, default=settings.CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=settings.CHUNK_INSERT_BATCH_SIZE)
+    parser.add_argument(
+        "--modes",
+        nargs="*",
+        default=[MODE_ORM, CHUNK_INSERT_VALUES, CHUNK_INSERT_COPY],
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        document = db.query(Document).filter(Document.id == args.document_id).first()
+        if not document:
+            raise SystemExit(f"Document {args.document_id} not found")
+        model_id = document.model_id
+        db.rollback()
+
+        rows = make_rows(args.document_id, model_id, args.rows, args.content_size)
+
+        report = []
+        for mode in args.modes:
+            elapsed = run(db, mode, rows, args.batch_size)
+            report.append(
+                {
+                    "mode": mode,
+                    "rows": len(rows),
+                    "seconds": round(elapsed, 3),
+                    "rows_per_sec": round(len(rows) / elapsed),
+                }
+            )
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    baseline = report[0]["rows_per_sec"]
+    print(f"{'mode':<10}{'rows':>8}{'seconds':>10}{'rows/sec':>12}{'speedup':>10}")
+    for row in report:
+        print(
+            f"{row['mode']:<10}{row['rows']:>8}{row['seconds']:>10}"
+            f"{row['rows_per_sec']:>12}{row['rows_per_sec'] / baseline:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
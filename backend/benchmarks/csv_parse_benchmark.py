@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Compare CSV ingestion throughput of DataFrame.iterrows against the chunked,
+vectorized reader, with and without grouping rows into chunks.
+
+Reports rows/sec, the number of items that would be embedded, and peak
+Python memory (tracemalloc) for each mode. A synthetic CSV is generated
+unless --file is given.
+
+Usage (from backend/):
+    python -m benchmarks.csv_parse_benchmark --rows 200000 --group-sizes 1 10
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.services.document_service import DocumentProcessor
+
+
+def make_csv(path: str, rows: int) -> None:
+    rng = np.random.default_rng(42)
+    pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "sku": [f"SKU-{i:07d}" for i in range(rows)],
+            "price": rng.uniform(1, 500, rows).round(2),
+            "quantity": rng.integers(0, 1000, rows),
+            "description": rng.choice(
+                ["red cotton shirt", "blue denim jacket", "wool scarf", ""], rows
+            ),
+        }
+    ).to_csv(path, index=False)
+
+
+def iterrows_items(file_path: str):
+    """Previous behaviour: whole file in memory, one row at a time"""
+    df = pd.read_csv(file_path)
+    for idx, (_, row) in enumerate(df.iterrows()):
+        text = " | ".join(f"{col}: {value}" for col, value in row.items())
+        yield {"content": text, "metadata": {"row": idx + 1, "source": "csv"}}
+
+
+def measure(items_fn, trace: bool):
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    count = sum(1 for _ in items_fn())
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--file", help="CSV file (default: generate one)")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--group-sizes", type=int, nargs="*", default=[1, 10])
+    parser.add_argument(
+        "--read-chunk-rows", type=int, default=settings.CSV_READ_CHUNK_ROWS
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    path = args.file
+    if not path:
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        make_csv(path, args.rows)
+
+    processor = DocumentProcessor(db=None)
+    settings.CSV_READ_CHUNK_ROWS = args.read_chunk_rows
+
+    modes = [("iterrows", 1, lambda: iterrows_items(path))]
+    for size in args.group_sizes:
+        modes.append(
+            (f"chunked rows/chunk={size}", size, lambda: processor.iter_csv_rows(path))
+        )
+
+    report = []
+    row_count = None
+    try:
+        for name, size, items_fn in modes:
+            settings.CSV_ROWS_PER_CHUNK = size
+            items, elapsed, _ = measure(items_fn, trace=False)
+            _, _, peak = measure(items_fn, trace=True)
+            # iterrows yields one item per row
+            row_count = row_count or items
+            report.append(
+                {
+                    "mode": name,
+                    "items": items,
+                    "seconds": round(elapsed, 3),
+                    "rows_per_sec": round(row_count / elapsed),
+                    "peak_mb": round(peak / 1024 / 1024, 1),
+                }
+            )
+    finally:
+        if not args.file:
+            os.remove(path)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'mode':<26}{'items':>9}{'seconds':>10}{'rows/sec':>12}{'peak MB':>10}")
+    for row in report:
+        print(
+            f"{row['mode']:<26}{row['items']:>9}{row['seconds']:>10}"
+            f"{row['rows_per_sec']:>12}{row['peak_mb']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Compare prompt context size and coverage with and without diversification
+(overlapping-neighbour merging plus MMR).
+
+Queries are the opening words of chunks sampled from the model. For each
+query the context is built from top-k results both ways and measured:
+
+    tokens      context tokens (model's tokenizer, or the estimate)
+    unique      share of distinct word 5-grams in the context (1 = no repeats)
+    source hit  share of queries whose source chunk text is in the context
+    coverage    share of the plain context's distinct 5-grams still present
+                with diversification
+
+Usage (from backend/):
+    python -m benchmarks.diversity_benchmark --model-id 1 --queries 100 --top-k 5
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+from typing import List, Set
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.services.embedding_service import encode_queries
+from app.services.model_cache import model_cache
+from app.services.prompt_packer import get_token_counter
+from app.services.rag_service import AsyncRAGService, RETRIEVAL_MODES
+
+SHINGLE_WORDS = 5
+
+
+def shingles(content: str) -> List[tuple]:
+    words = content.split()
+    return [
+        tuple(words[i : i + SHINGLE_WORDS])
+        for i in range(max(0, len(words) - SHINGLE_WORDS + 1))
+    ]
+
+
+async def sample_chunks(db, model_id: int, count: int):
+    result = await db.execute(
+        text(
+            """
+            SELECT id, content FROM document_chunks
+            WHERE model_id = :model_id
+            ORDER BY random()
+            LIMIT :count
+        """
+        ),
+        {"model_id": model_id, "count": count},
+    )
+    return [(row.id, row.content) for row in result]
+
+
+async def main_async(args) -> List[dict]:
+    async with AsyncSessionLocal() as db:
+        cached_model = await model_cache.get_async(db, args.model_id)
+        if not cached_model:
+            raise SystemExit(f"Model {args.model_id} not found")
+        model = cached_model.model
+        counter = get_token_counter(model.llm_provider, model.llm_model_name)
+
+        samples = await sample_chunks(db, args.model_id, args.queries)
+        if not samples:
+            raise SystemExit(f"No chunks found for model {args.model_id}")
+        queries = [" ".join(content.split()[: args.words]) for _, content in samples]
+        embeddings = encode_queries(queries)
+
+        rag_service = AsyncRAGService(db)
+        stats = {False: [], True: []}
+        baseline_shingles: List[Set[tuple]] = []
+        for i, ((_, source), query, embedding) in enumerate(
+            zip(samples, queries, embeddings)
+        ):
+            for diversify in (False, True):
+                chunks = await rag_service.search_similar_chunks(
+                    query=query,
+                    model_id=args.model_id,
+                    top_k=args.top_k,
+                    similarity_threshold=0.0,
+                    query_embedding=embedding,
+                    retrieval_mode=args.retrieval_mode,
+                    rerank_results=False,
+                    diversify=diversify,
+                )
+                await db.rollback()
+
+                context = rag_service.build_context(chunks)
+                grams = [g for chunk in chunks for g in shingles(chunk["content"])]
+                distinct = set(grams)
+                if not diversify:
+                    baseline_shingles.append(distinct)
+                baseline = baseline_shingles[i]
+                stats[diversify].append(
+                    {
+                        "tokens": counter.count(context),
+                        "unique": len(distinct) / len(grams) if grams else 1.0,
+                        "source_hit": any(source in c["content"] for c in chunks),
+                        "coverage": (
+                            len(distinct & baseline) / len(baseline) if baseline else 1.0
+                        ),
+                    }
+                )
+
+    await async_engine.dispose()
+
+    report = []
+    for diversify, rows in stats.items():
+        report.append(
+            {
+                "mode": "diversified" if diversify else "plain",
+                "tokens_mean": round(statistics.mean(r["tokens"] for r in rows), 1),
+                "unique": round(statistics.mean(r["unique"] for r in rows), 4),
+                "source_hit": round(statistics.mean(r["source_hit"] for r in rows), 4),
+                "coverage": round(statistics.mean(r["coverage"] for r in rows), 4),
+            }
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-id", type=int, required=True)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--words", type=int, default=12, help="Words per query")
+    parser.add_argument("--retrieval-mode", choices=RETRIEVAL_MODES, default=None)
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'mode':<14}{'tokens':>10}{'unique':>10}{'source hit':>12}{'coverage':>10}")
+    for row in report:
+        print(
+            f"{row['mode']:<14}{row['tokens_mean']:>10}{row['unique']:>10}"
+            f"{row['source_hit']:>12}{row['coverage']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Compare embedding backends (torch, onnx, onnx-int8): sentences/sec and peak RSS.
+
+Each backend runs in a fresh subprocess so import cost, load time and memory
+are measured in isolation. ONNX backends need export_embedding_model.py to
+have been run first.
+
+Usage (from backend/):
+    python -m benchmarks.embedding_backend_benchmark --sentences 2000 --batch-size 32
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from app.core.config import settings
+from app.services.embedding_backends import EMBEDDING_BACKENDS
+
+
+def make_sentences(count: int):
+    base = (
+        "Section {i}: the warranty covers manufacturing defects for {i} months "
+        "but excludes damage caused by misuse or unauthorized repairs."
+    )
+    return [base.format(i=i) for i in range(count)]
+
+
+def run_worker(backend: str, sentences: int, batch_size: int) -> dict:
+    """Measure one backend inside the current process"""
+    start = time.perf_counter()
+    from app.services.embedding_backends import load_embedding_backend
+
+    model = load_embedding_backend(
+        backend,
+        settings.EMBEDDING_MODEL,
+        device=settings.EMBEDDING_DEVICE,
+        onnx_dir=settings.EMBEDDING_ONNX_DIR,
+        num_threads=settings.EMBEDDING_ONNX_THREADS,
+    )
+    load_seconds = time.perf_counter() - start
+
+    texts = make_sentences(sentences)
+    model.encode(texts[:batch_size], batch_size=batch_size)  # Warm-up
+
+    start = time.perf_counter()
+    model.encode(texts, batch_size=batch_size)
+    encode_seconds = time.perf_counter() - start
+
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "backend": backend,
+        "load_seconds": round(load_seconds, 2),
+        "sentences_per_sec": round(sentences / encode_seconds, 1),
+        "peak_rss_mb": round(peak_rss_mb, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="*", default=EMBEDDING_BACKENDS)
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.sentences, args.batch_size)))
+        return
+
+    results = []
+    for backend in args.backends:
+        proc = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.embedding_backend_benchmark",
+                "--worker",
+                backend,
+                "--sentences",
+                str(args.sentences),
+                "--batch-size",
+                str(args.batch_size),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            results.append({"backend": backend, "error": proc.stderr.strip()[-500:]})
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
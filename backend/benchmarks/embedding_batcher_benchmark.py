@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Compare query embedding throughput with and without micro-batching.
+
+Simulates N concurrent chat requests that each need one query embedding:
+the "sequential" mode encodes them one at a time (the old behaviour), the
+"batched" mode sends them through EmbeddingBatcher.
+
+Usage (from backend/):
+    python -m benchmarks.embedding_batcher_benchmark --requests 256 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_service import encode_queries, get_embedding_model
+
+
+def make_queries(count: int):
+    return [f"what is the policy for request number {i}?" for i in range(count)]
+
+
+async def run_sequential(queries, concurrency: int) -> float:
+    """Each request encodes on its own, one at a time"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(query):
+        async with semaphore:
+            encode_queries([query])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(q) for q in queries))
+    return time.perf_counter() - start
+
+
+async def run_batched(queries, concurrency: int, max_batch: int, max_wait_ms: float):
+    """Requests share encodes through the micro-batcher"""
+    batcher = EmbeddingBatcher(encode_queries, max_batch, max_wait_ms)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(query):
+        async with semaphore:
+            await batcher.embed(query)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(q) for q in queries))
+    elapsed = time.perf_counter() - start
+    await batcher.close()
+    return elapsed, batcher.batches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    get_embedding_model()  # Load outside the timed section
+    queries = make_queries(args.requests)
+
+    sequential = asyncio.run(run_sequential(queries, args.concurrency))
+    batched, batches = asyncio.run(
+        run_batched(queries, args.concurrency, args.max_batch, args.max_wait_ms)
+    )
+
+    print(
+        json.dumps(
+            {
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "sequential_qps": round(args.requests / sequential, 1),
+                "batched_qps": round(args.requests / batched, 1),
+                "batches": batches,
+                "mean_batch_size": round(args.requests / max(batches, 1), 1),
+                "speedup": round(sequential / batched, 2),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Measure LLM time-to-first-token with a fresh HTTP client per request (the
+previous behaviour) against the shared pooled clients.
+
+Start the mock provider first:
+    python -m benchmarks.mock_llm_server --port 8001
+
+Usage (from backend/):
+    python -m benchmarks.llm_client_benchmark --base-url http://127.0.0.1:8001 --provider ollama --requests 200 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from app.models.model import (
+    Model,
+    LLM_PROVIDER_ANTHROPIC,
+    LLM_PROVIDER_OLLAMA,
+    LLM_PROVIDER_OPENAI,
+)
+from app.services import llm_service
+from app.services.http_client import close_http_clients
+from app.services.llm_service import LLMService
+
+PROVIDERS = [LLM_PROVIDER_OLLAMA, LLM_PROVIDER_OPENAI, LLM_PROVIDER_ANTHROPIC]
+
+
+@contextlib.asynccontextmanager
+async def fresh_clients():
+    """Give every request its own client, as before pooling"""
+    created: List[httpx.AsyncClient] = []
+    original = llm_service.get_http_client
+
+    def new_client(base_url: str) -> httpx.AsyncClient:
+        client = httpx.AsyncClient(timeout=120.0)
+        created.append(client)
+        return client
+
+    llm_service.get_http_client = new_client
+    try:
+        yield
+    finally:
+        llm_service.get_http_client = original
+        for client in created:
+            await client.aclose()
+
+
+def make_service(provider: str, base_url: str) -> LLMService:
+    if provider == LLM_PROVIDER_OPENAI:
+        base_url = f"{base_url.rstrip('/')}/v1"
+    model = Model(
+        llm_provider=provider,
+        llm_model_name="mock",
+        api_base_url=base_url,
+        api_key_encrypted=None,
+    )
+    service = LLMService(model)
+    service.api_key = "mock-key"
+    return service
+
+
+async def run(service: LLMService, requests: int, concurrency: int):
+    """Stream all requests; return (ttft ms list, total ms list)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    ttfts, totals = [], []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            first = None
+            async for _ in service.generate_stream("Hello"):
+                if first is None:
+                    first = time.perf_counter()
+            end = time.perf_counter()
+            ttfts.append(((first or end) - start) * 1000)
+            totals.append((end - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return ttfts, totals
+
+
+def summarize(name: str, ttfts: List[float], totals: List[float]) -> dict:
+    ttfts = sorted(ttfts)
+    return {
+        "mode": name,
+        "ttft_p50_ms": round(statistics.median(ttfts), 2),
+        "ttft_p95_ms": round(ttfts[int(len(ttfts) * 0.95) - 1], 2),
+        "ttft_mean_ms": round(statistics.mean(ttfts), 2),
+        "total_mean_ms": round(statistics.mean(totals), 2),
+    }
+
+
+async def main_async(args) -> List[dict]:
+    service = make_service(args.provider, args.base_url)
+
+    # Warm up the server (and the pooled client)
+    await run(service, args.concurrency, args.concurrency)
+
+    async with fresh_clients():
+        fresh = await run(service, args.requests, args.concurrency)
+    pooled = await run(service, args.requests, args.concurrency)
+    await close_http_clients()
+
+    return [summarize("fresh client", *fresh), summarize("pooled client", *pooled)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--provider", choices=PROVIDERS, default=LLM_PROVIDER_OLLAMA)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'mode':<16}{'p50 TTFT ms':>13}{'p95 TTFT ms':>13}{'mean TTFT ms':>14}{'mean total ms':>15}")
+    for row in report:
+        print(
+            f"{row['mode']:<16}{row['ttft_p50_ms']:>13}{row['ttft_p95_ms']:>13}"
+            f"{row['ttft_mean_ms']:>14}{row['total_mean_ms']:>15}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of the chat API against a synthetic corpus and the
+mock LLM provider.
+
+    seed     create N models ("loadtest-<i>") whose api_base_url points at the
+             mock provider, each with a synthetic document corpus
+    run      drive POST /api/chat/chat and /api/chat/ws at the given
+             concurrency and write throughput, latency percentiles and
+             time-to-first-token as JSON (optionally compared to an earlier
+             report)
+    cleanup  delete the seeded models
+
+Seeding and cleanup write to DATABASE_URL directly; run only talks to the
+API. Chunk embeddings are random unit vectors unless --real-embeddings is
+given, so seeding large corpora is fast.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest seed --models 4 --documents 5 --chunks 2000 --mock-url http://127.0.0.1:8001
+    python -m benchmarks.loadtest run --start-mock --concurrency 50 --requests 500 --sockets 100 --output after.json --compare before.json
+    python -m benchmarks.loadtest cleanup
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+import websockets
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.document import DOCUMENT_STATUS_COMPLETED, Document
+from app.models.model import (
+    LLM_PROVIDER_ANTHROPIC,
+    LLM_PROVIDER_OLLAMA,
+    LLM_PROVIDER_OPENAI,
+    Model,
+)
+from app.models.user import User
+from app.schemas.model import ModelCreate
+from app.services import model_service
+from app.services.chunk_writer import write_chunks
+from app.services.embedding_service import encode_chunks
+from benchmarks.ws_concurrency_benchmark import percentile
+
+MODEL_PREFIX = "loadtest-"
+PROVIDERS = [LLM_PROVIDER_OLLAMA, LLM_PROVIDER_OPENAI, LLM_PROVIDER_ANTHROPIC]
+
+WORDS = (
+    "pump valve pressure sensor manual error code reset filter motor "
+    "temperature warranty install replace cable voltage battery display "
+    "firmware update network router password account invoice refund order "
+    "shipping delivery return policy schedule maintenance inspection safety"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def provider_url(provider: str, mock_url: str) -> str:
+    mock_url = mock_url.rstrip("/")
+    return f"{mock_url}/v1" if provider == LLM_PROVIDER_OPENAI else mock_url
+
+
+# Seeding
+
+
+def seed(args) -> dict:
+    rng = random.Random(args.seed)
+    np_rng = np.random.default_rng(args.seed)
+    db = SessionLocal()
+    model_ids = []
+    try:
+        owner = db.query(User).filter(User.email == args.owner_email).first()
+        if not owner:
+            raise SystemExit(f"User {args.owner_email} not found")
+
+        for i in range(args.models):
+            name = f"{MODEL_PREFIX}{i}"
+            if db.query(Model).filter(Model.name == name).first():
+                raise SystemExit(f"Model {name} exists; run cleanup first")
+
+            model = model_service.create_model(
+                db,
+                ModelCreate(
+                    name=name,
+                    description="Synthetic load-test corpus",
+                    llm_provider=args.provider,
+                    llm_model_name="mock",
+                    api_base_url=provider_url(args.provider, args.mock_url),
+                    api_key="mock-key",
+                ),
+                owner.id,
+            )
+
+            start = time.perf_counter()
+            for j in range(args.documents):
+                texts = [
+                    " ".join(sentence(rng, 12) for _ in range(args.sentences))
+                    for _ in range(args.chunks)
+                ]
+                document = Document(
+                    model_id=model.id,
+                    filename=f"synthetic-{j}.txt",
+                    file_size=sum(len(t) for t in texts),
+                    file_type="txt",
+                    status=DOCUMENT_STATUS_COMPLETED,
+                    uploaded_by=owner.id,
+                    processed_at=datetime.now(timezone.utc),
+                )
+                db.add(document)
+                db.flush()
+
+                if args.real_embeddings:
+                    embeddings = encode_chunks(texts)
+                else:
+                    embeddings = np_rng.normal(
+                        size=(len(texts), settings.EMBEDDING_DIMENSION)
+                    ).astype(np.float32)
+                    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+                write_chunks(
+                    db,
+                    (
+                        (document.id, model.id, text, embedding, json.dumps({}), k)
+                        for k, (text, embedding) in enumerate(zip(texts, embeddings))
+                    ),
+                )
+                db.commit()
+
+            model_ids.append(model.id)
+            print(
+                f"Seeded {name} (id {model.id}): {args.documents * args.chunks} chunks "
+                f"in {time.perf_counter() - start:.1f}s",
+                file=sys.stderr,
+            )
+    finally:
+        db.close()
+
+    return {"model_ids": model_ids}
+
+
+def cleanup(args) -> dict:
+    db = SessionLocal()
+    try:
+        models = db.query(Model).filter(Model.name.like(f"{MODEL_PREFIX}%")).all()
+        model_ids = [model.id for model in models]
+        for model_id in model_ids:
+            model_service.delete_model(db, model_id)
+    finally:
+        db.close()
+    return {"deleted_model_ids": model_ids}
+
+
+# Load generation
+
+
+def login(api_url: str, email: str, password: str) -> str:
+    response = httpx.post(
+        f"{api_url}/api/auth/login", json={"email": email, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def seeded_model_ids(api_url: str, token: str) -> List[int]:
+    response = httpx.get(
+        f"{api_url}/api/models", headers={"Authorization": f"Bearer {token}"}
+    )
+    response.raise_for_status()
+    return [m["id"] for m in response.json() if m["name"].startswith(MODEL_PREFIX)]
+
+
+def latency_stats(prefix: str, values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    return {
+        f"{prefix}_p50_ms": round(statistics.median(values), 1),
+        f"{prefix}_p95_ms": round(percentile(values, 95), 1),
+        f"{prefix}_p99_ms": round(percentile(values, 99), 1),
+        f"{prefix}_mean_ms": round(statistics.mean(values), 1),
+    }
+
+
+async def run_chat(args, token: str, model_ids: List[int], rng: random.Random) -> dict:
+    """POST /api/chat/chat: args.requests requests, args.concurrency at a time"""
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, errors, cached = [], [], 0
+
+    async def one(client: httpx.AsyncClient, i: int):
+        nonlocal cached
+        payload = {
+            "message": sentence(rng, 8),
+            "model_id": model_ids[i % len(model_ids)],
+            "top_k": args.top_k,
+        }
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post("/api/chat/chat", json=payload)
+                response.raise_for_status()
+                cached += bool(response.json().get("cached"))
+                latencies.append((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                errors.append(repr(e))
+
+    async with httpx.AsyncClient(
+        base_url=args.api_url,
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=300,
+        limits=httpx.Limits(max_connections=args.concurrency),
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    report = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "completed": len(latencies),
+        "errors": len(errors),
+        "cached": cached,
+        "seconds": round(elapsed, 2),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        **latency_stats("latency", latencies),
+    }
+    if errors:
+        report["first_error"] = errors[0]
+    return report
+
+
+async def run_ws(args, token: str, model_ids: List[int], rng: random.Random) -> dict:
+    """/api/chat/ws: args.sockets sockets sending args.messages messages each"""
+    base = args.api_url.replace("http://", "ws://").replace("https://", "wss://")
+    ws_url = f"{base}/api/chat/ws?token={token}"
+    ttfts, turns, errors = [], [], []
+
+    async def one(i: int):
+        model_id = model_ids[i % len(model_ids)]
+        try:
+            async with websockets.connect(ws_url, max_size=None, open_timeout=60) as ws:
+                session_id = None
+                for _ in range(args.messages):
+                    payload = {
+                        "message": sentence(rng, 8),
+                        "model_id": model_id,
+                        "session_id": session_id,
+                        "top_k": args.top_k,
+                    }
+                    start = time.perf_counter()
+                    first = None
+                    await ws.send(json.dumps(payload))
+                    while True:
+                        event = json.loads(await ws.recv())
+                        kind = event.get("type")
+                        if kind == "user_message":
+                            session_id = event.get("session_id")
+                        elif kind == "stream_chunk" and first is None:
+                            first = time.perf_counter()
+                        elif kind == "message_saved":
+                            break
+                        elif kind == "error":
+                            raise RuntimeError(event.get("error"))
+                    end = time.perf_counter()
+                    ttfts.append(((first or end) - start) * 1000)
+                    turns.append((end - start) * 1000)
+        except Exception as e:
+            errors.append(repr(e))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.sockets)))
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "sockets": args.sockets,
+        "messages_per_socket": args.messages,
+        "completed_turns": len(turns),
+        "errors": len(errors),
+        "seconds": round(elapsed, 2),
+        "turns_per_sec": round(len(turns) / elapsed, 1),
+        **latency_stats("ttft", ttfts),
+        **latency_stats("turn", turns),
+    }
+    if errors:
+        report["first_error"] = errors[0]
+    return report
+
+
+def start_mock(args) -> subprocess.Popen:
+    """Start benchmarks.mock_llm_server and wait until it accepts connections"""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.mock_llm_server",
+            "--port",
+            str(args.mock_port),
+            "--tokens",
+            str(args.tokens),
+            "--first-token-delay-ms",
+            str(args.first_token_delay_ms),
+            "--token-delay-ms",
+            str(args.token_delay_ms),
+        ]
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", args.mock_port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("Mock LLM server did not start")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict) -> Dict[str, Dict[str, str]]:
+    """Relative change of every numeric result present in both reports"""
+    changes = {}
+    for scenario, results in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(scenario, {})
+        for key, value in results.items():
+            old = before.get(key)
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+                changes.setdefault(scenario, {})[key] = (
+                    f"{old} -> {value} ({(value - old) / old * 100:+.1f}%)"
+                )
+    return changes
+
+
+def run(args) -> dict:
+    mock = start_mock(args) if args.start_mock else None
+    try:
+        token = args.token or login(args.api_url, args.email, args.password)
+        model_ids = args.model_ids or seeded_model_ids(args.api_url, token)
+        if not model_ids:
+            raise SystemExit("No load-test models found; run seed first")
+
+        rng = random.Random(args.seed)
+        scenarios = {}
+        if args.requests:
+            scenarios["chat"] = asyncio.run(run_chat(args, token, model_ids, rng))
+        if args.sockets:
+            scenarios["ws"] = asyncio.run(run_ws(args, token, model_ids, rng))
+    finally:
+        if mock:
+            mock.terminate()
+            mock.wait()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "api_url": args.api_url,
+            "model_ids": model_ids,
+            "top_k": args.top_k,
+        },
+        "scenarios": scenarios,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            report["compared_to"] = compare(report, json.load(f))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--seed", type=int, default=42, help="Random seed")
+    common.add_argument("--output", help="Write the JSON report to this file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser(
+        "seed", parents=[common], help="Create models with a synthetic corpus"
+    )
+    seed_parser.add_argument("--models", type=int, default=4)
+    seed_parser.add_argument("--documents", type=int, default=5, help="Per model")
+    seed_parser.add_argument("--chunks", type=int, default=1000, help="Per document")
+    seed_parser.add_argument("--sentences", type=int, default=12, help="Per chunk")
+    seed_parser.add_argument("--provider", choices=PROVIDERS, default=LLM_PROVIDER_OLLAMA)
+    seed_parser.add_argument("--mock-url", default="http://127.0.0.1:8001")
+    seed_parser.add_argument("--owner-email", default=settings.SUPERADMIN_EMAIL)
+    seed_parser.add_argument(
+        "--real-embeddings", action="store_true", help="Embed chunk text (slow)"
+    )
+
+    commands.add_parser("cleanup", parents=[common], help="Delete the seeded models")
+
+    run_parser = commands.add_parser(
+        "run", parents=[common], help="Drive the chat endpoints"
+    )
+    run_parser.add_argument("--api-url", default="http://localhost:8000")
+    run_parser.add_argument("--token", help="Access token (or use --email/--password)")
+    run_parser.add_argument("--email", default=settings.SUPERADMIN_EMAIL)
+    run_parser.add_argument("--password", default=settings.SUPERADMIN_PASSWORD)
+    run_parser.add_argument("--model-ids", type=int, nargs="*", help="Default: seeded models")
+    run_parser.add_argument("--requests", type=int, default=200, help="POST /chat requests (0 skips)")
+    run_parser.add_argument("--concurrency", type=int, default=20, help="Concurrent /chat requests")
+    run_parser.add_argument("--sockets", type=int, default=50, help="WebSockets (0 skips)")
+    run_parser.add_argument("--messages", type=int, default=3, help="Messages per socket")
+    run_parser.add_argument("--top-k", type=int, default=5)
+    run_parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    run_parser.add_argument(
+        "--start-mock", action="store_true", help="Start the mock LLM provider"
+    )
+    run_parser.add_argument("--mock-port", type=int, default=8001)
+    run_parser.add_argument("--tokens", type=int, default=50)
+    run_parser.add_argument("--first-token-delay-ms", type=float, default=50.0)
+    run_parser.add_argument("--token-delay-ms", type=float, default=5.0)
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        report = seed(args)
+    elif args.command == "cleanup":
+        report = cleanup(args)
+    else:
+        report = run(args)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Local mock LLM provider speaking the Ollama, OpenAI and Anthropic formats.
+
+Streams a fixed number of tokens with configurable delays so client-side
+overheads (connection setup, time-to-first-token) can be measured without
+a real model. Point a model's api_base_url at it:
+
+    Ollama / custom:  http://127.0.0.1:8001
+    OpenAI:           http://127.0.0.1:8001/v1
+    Anthropic:        http://127.0.0.1:8001
+
+Usage (from backend/):
+    python -m benchmarks.mock_llm_server --port 8001 --tokens 50 --token-delay-ms 5
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+app = FastAPI(title="Mock LLM provider")
+
+config = {
+    "tokens": 50,
+    "first_token_delay_ms": 0.0,
+    "token_delay_ms": 0.0,
+}
+
+
+def _tokens():
+    return [f"token{i} " for i in range(config["tokens"])]
+
+
+async def _paced(tokens):
+    """Yield tokens with the configured delays"""
+    await asyncio.sleep(config["first_token_delay_ms"] / 1000)
+    for i, token in enumerate(tokens):
+        if i and config["token_delay_ms"]:
+            await asyncio.sleep(config["token_delay_ms"] / 1000)
+        yield token
+
+
+@app.post("/api/generate")
+async def ollama_generate(request: Request):
+    body = await request.json()
+    tokens = _tokens()
+    if not body.get("stream", True):
+        await asyncio.sleep(config["first_token_delay_ms"] / 1000)
+        return {"model": body.get("model"), "response": "".join(tokens), "done": True}
+
+    async def stream():
+        async for token in _paced(tokens):
+            yield json.dumps({"response": token, "done": False}) + "\n"
+        yield json.dumps({"response": "", "done": True}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/v1/chat/completions")
+async def openai_chat(request: Request):
+    body = await request.json()
+    tokens = _tokens()
+    if not body.get("stream"):
+        await asyncio.sleep(config["first_token_delay_ms"] / 1000)
+        return {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+
+    async def stream():
+        async for token in _paced(tokens):
+            chunk = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"content": token}}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+@app.post("/v1/messages")
+async def anthropic_messages(request: Request):
+    body = await request.json()
+    tokens = _tokens()
+    if not body.get("stream"):
+        await asyncio.sleep(config["first_token_delay_ms"] / 1000)
+        return {
+            "id": "msg_mock",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model"),
+            "content": [{"type": "text", "text": "".join(tokens)}],
+            "stop_reason": "end_turn",
+        }
+
+    async def stream():
+        yield f"event: message_start\ndata: {json.dumps({'type': 'message_start'})}\n\n"
+        async for token in _paced(tokens):
+            event = {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": token},
+            }
+            yield f"event: content_block_delta\ndata: {json.dumps(event)}\n\n"
+        yield f"event: message_stop\ndata: {json.dumps({'type': 'message_stop'})}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--tokens", type=int, default=config["tokens"])
+    parser.add_argument("--first-token-delay-ms", type=float, default=0.0)
+    parser.add_argument("--token-delay-ms", type=float, default=0.0)
+    parser.add_argument("--ssl-certfile", help="Serve HTTPS (needed to exercise TLS)")
+    parser.add_argument("--ssl-keyfile")
+    args = parser.parse_args()
+
+    config["tokens"] = args.tokens
+    config["first_token_delay_ms"] = args.first_token_delay_ms
+    config["token_delay_ms"] = args.token_delay_ms
+
+    uvicorn.run(
+        app,
+        host=args.host,
+        port=args.port,
+        ssl_certfile=args.ssl_certfile,
+        ssl_keyfile=args.ssl_keyfile,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
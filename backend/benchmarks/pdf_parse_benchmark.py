@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Measure PDF text extraction speedup from page-range sharding across processes.
+
+Extracts the first N pages of a PDF for each page count, serially and with
+each worker count, and reports pages/sec and speedup over serial.
+
+Usage (from backend/):
+    python -m benchmarks.pdf_parse_benchmark --file manual.pdf --page-counts 100 500 2000 --workers 2 4 8
+"""
+
+import argparse
+import json
+import time
+
+from app.core.config import settings
+from app.services.pdf_extraction import count_pages, iter_pdf_page_texts
+
+
+def run(file_path: str, pages: int, workers: int, pages_per_shard: int) -> float:
+    start = time.perf_counter()
+    for _ in iter_pdf_page_texts(
+        file_path, workers=workers, pages_per_shard=pages_per_shard, max_pages=pages
+    ):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--file", required=True, help="PDF to extract")
+    parser.add_argument("--page-counts", type=int, nargs="*", default=[50, 200, 1000])
+    parser.add_argument("--workers", type=int, nargs="*", default=[2, 4, 8])
+    parser.add_argument(
+        "--pages-per-shard", type=int, default=settings.PDF_PAGES_PER_SHARD
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    available = count_pages(args.file)
+    report = []
+    for pages in args.page_counts:
+        if pages > available:
+            print(f"Skipping {pages} pages: {args.file} has {available}")
+            continue
+
+        serial = run(args.file, pages, 1, args.pages_per_shard)
+        for workers in [1] + args.workers:
+            elapsed = (
+                serial
+                if workers == 1
+                else run(args.file, pages, workers, args.pages_per_shard)
+            )
+            report.append(
+                {
+                    "pages": pages,
+                    "workers": workers,
+                    "seconds": round(elapsed, 3),
+                    "pages_per_sec": round(pages / elapsed, 1),
+                    "speedup": round(serial / elapsed, 2),
+                }
+            )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'pages':>7}{'workers':>9}{'seconds':>10}{'pages/sec':>11}{'speedup':>9}")
+    for row in report:
+        print(
+            f"{row['pages']:>7}{row['workers']:>9}{row['seconds']:>10}"
+            f"{row['pages_per_sec']:>11}{row['speedup']:>8}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Measure cross-encoder rerank latency by candidate count, cold and cached.
+
+Passages are synthetic (no database needed); each run scores one query
+against N candidates. "cold" clears the score cache before every query,
+"cached" repeats the same queries so every pair is a cache hit.
+
+Usage (from backend/):
+    python -m benchmarks.rerank_benchmark --candidates 10 20 50 --queries 20
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import List
+
+from app.services.rerank_service import get_reranker, rerank, rerank_score_cache
+
+WORDS = (
+    "pump valve pressure sensor manual error code reset filter motor "
+    "temperature warranty install replace cable voltage battery display"
+).split()
+
+
+def make_passages(count: int, words: int, rng: random.Random) -> List[dict]:
+    return [
+        {
+            "chunk_id": i,
+            "content": " ".join(rng.choice(WORDS) for _ in range(words)),
+        }
+        for i in range(count)
+    ]
+
+
+def time_queries(queries: List[str], passages: List[dict], clear: bool) -> List[float]:
+    latencies = []
+    for query in queries:
+        if clear:
+            rerank_score_cache.clear()
+        start = time.perf_counter()
+        rerank(query, passages, top_n=5, timeout_ms=0)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(candidates: int, mode: str, latencies: List[float]) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "candidates": candidates,
+        "mode": mode,
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[max(0, int(len(latencies) * 0.95) - 1)], 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candidates", type=int, nargs="*", default=[10, 20, 50])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--words", type=int, default=150, help="Words per passage")
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    queries = [
+        " ".join(rng.choice(WORDS) for _ in range(6)) for _ in range(args.queries)
+    ]
+
+    # Load the model outside the timed runs
+    get_reranker()
+
+    report = []
+    for count in args.candidates:
+        passages = make_passages(count, args.words, rng)
+        report.append(summarize(count, "cold", time_queries(queries, passages, True)))
+        report.append(
+            summarize(count, "cached", time_queries(queries, passages, False))
+        )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'candidates':>10}  {'mode':<8}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for row in report:
+        print(
+            f"{row['candidates']:>10}  {row['mode']:<8}{row['p50_ms']:>10}"
+            f"{row['p95_ms']:>10}{row['mean_ms']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
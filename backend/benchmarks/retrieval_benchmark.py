@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Compare recall and latency of vector, lexical and hybrid retrieval.
+
+Two query sets are sampled from the model's own chunks:
+
+    exact-term  a rare token of the chunk (containing a digit, e.g. a part
+                number or error code) -- what embeddings tend to miss
+    semantic    the opening words of the chunk -- what full-text tends to miss
+
+A query counts as a hit when the chunk it was sampled from is in the top-k.
+
+Usage (from backend/):
+    python -m benchmarks.retrieval_benchmark --model-id 1 --queries 100 --top-k 5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.services.embedding_service import encode_queries
+from app.services.rag_service import AsyncRAGService, RETRIEVAL_MODES
+
+TOKEN_RE = re.compile(r"\b(?=\w*\d)(?=\w*[A-Za-z])\w{4,}\b")
+
+
+async def sample_chunks(model_id: int, count: int) -> List[Tuple[int, str]]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            text(
+                """
+                SELECT id, content FROM document_chunks
+                WHERE model_id = :model_id
+                ORDER BY random()
+                LIMIT :count
+            """
+            ),
+            {"model_id": model_id, "count": count},
+        )
+        return [(row.id, row.content) for row in result]
+
+
+def build_queries(chunks: List[Tuple[int, str]], words: int) -> Dict[str, List]:
+    """Build (chunk id, query) pairs per query type"""
+    rng = random.Random(42)
+    exact, semantic = [], []
+    for chunk_id, content in chunks:
+        tokens = TOKEN_RE.findall(content)
+        if tokens:
+            exact.append((chunk_id, rng.choice(tokens)))
+        semantic.append((chunk_id, " ".join(content.split()[:words])))
+    return {"exact-term": exact, "semantic": semantic}
+
+
+async def run_mode(
+    model_id: int, queries: List, embeddings: List, top_k: int, mode: str
+) -> Tuple[float, List[float]]:
+    """Return (recall@k, latencies in ms) for one retrieval mode"""
+    hits, latencies = 0, []
+    async with AsyncSessionLocal() as db:
+        rag_service = AsyncRAGService(db)
+        for (chunk_id, query), embedding in zip(queries, embeddings):
+            start = time.perf_counter()
+            chunks = await rag_service.search_similar_chunks(
+                query=query,
+                model_id=model_id,
+                top_k=top_k,
+                similarity_threshold=0.0,
+                query_embedding=embedding,
+                retrieval_mode=mode,
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += any(chunk["chunk_id"] == chunk_id for chunk in chunks)
+            await db.rollback()
+    return hits / max(len(queries), 1), latencies
+
+
+def summarize(query_type: str, mode: str, recall: float, latencies: List[float]) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "queries": query_type,
+        "mode": mode,
+        "recall": round(recall, 4),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[max(0, int(len(latencies) * 0.95) - 1)], 2),
+    }
+
+
+async def main_async(args) -> List[dict]:
+    chunks = await sample_chunks(args.model_id, args.queries)
+    if not chunks:
+        raise SystemExit(f"No chunks found for model {args.model_id}")
+
+    report = []
+    for query_type, queries in build_queries(chunks, args.words).items():
+        if not queries:
+            continue
+        # Encode up front so only retrieval is timed
+        embeddings = encode_queries([query for _, query in queries])
+        for mode in RETRIEVAL_MODES:
+            recall, latencies = await run_mode(
+                args.model_id, queries, embeddings, args.top_k, mode
+            )
+            report.append(summarize(query_type, mode, recall, latencies))
+
+    await async_engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-id", type=int, required=True)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--words", type=int, default=12, help="Words per semantic query")
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'queries':<12}{'mode':<10}{'recall':>8}{'p50 ms':>10}{'p95 ms':>10}")
+    for row in report:
+        print(
+            f"{row['queries']:<12}{row['mode']:<10}{row['recall']:>8}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Compare recall and latency of the ANN vector index against an exact scan.
+
+Query vectors are sampled from the model's own chunks (with a little noise
+added), the exact top-k is computed with index scans disabled, and each
+ef_search / probes value is then measured against that ground truth.
+
+Usage (from backend/):
+    python -m benchmarks.vector_index_benchmark --model-id 1 --queries 100 --top-k 10
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import List
+
+import numpy as np
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.services.vector_index_service import (
+    VECTOR_INDEX_HNSW,
+    VECTOR_INDEX_IVFFLAT,
+    get_index_type,
+)
+
+SEARCH_SQL = text(
+    """
+    SELECT dc.id
+    FROM document_chunks dc
+    WHERE dc.model_id = :model_id
+    ORDER BY dc.embedding <=> :query_embedding
+    LIMIT :top_k
+"""
+)
+
+
+def sample_queries(db, model_id: int, count: int, noise: float) -> List[str]:
+    """Sample stored embeddings and perturb them to use as queries"""
+    rows = db.execute(
+        text(
+            """
+            SELECT embedding FROM document_chunks
+            WHERE model_id = :model_id
+            ORDER BY random()
+            LIMIT :count
+        """
+        ),
+        {"model_id": model_id, "count": count},
+    ).all()
+
+    rng = np.random.default_rng(42)
+    queries = []
+    for row in rows:
+        vector = np.array(json.loads(str(row.embedding)), dtype=np.float32)
+        vector = vector + rng.normal(0, noise, vector.shape).astype(np.float32)
+        queries.append(str(vector.tolist()))
+    return queries
+
+
+def run_queries(db, model_id: int, queries: List[str], top_k: int, setup: List[str]):
+    """Run all queries in one transaction; return result ids and latencies (ms)"""
+    results, latencies = [], []
+    for statement in setup:
+        db.execute(text(statement))
+
+    for query in queries:
+        start = time.perf_counter()
+        rows = db.execute(
+            SEARCH_SQL,
+            {"model_id": model_id, "query_embedding": query, "top_k": top_k},
+        ).all()
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({row.id for row in rows})
+
+    db.rollback()
+    return results, latencies
+
+
+def summarize(name: str, latencies: List[float], recall: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "mode": name,
+        "recall": round(recall, 4),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-id", type=int, required=True)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--noise", type=float, default=0.01)
+    parser.add_argument("--ef-search", type=int, nargs="*", default=[10, 20, 40, 80, 160])
+    parser.add_argument("--probes", type=int, nargs="*", default=[1, 5, 10, 20, 50])
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        queries = sample_queries(db, args.model_id, args.queries, args.noise)
+        if not queries:
+            raise SystemExit(f"No chunks found for model {args.model_id}")
+
+        # Ground truth: force a sequential scan
+        exact, exact_latencies = run_queries(
+            db,
+            args.model_id,
+            queries,
+            args.top_k,
+            ["SET LOCAL enable_indexscan = off", "SET LOCAL enable_bitmapscan = off"],
+        )
+        report = [summarize("exact", exact_latencies, 1.0)]
+
+        index_type = get_index_type()
+        if index_type == VECTOR_INDEX_HNSW:
+            variants = [
+                (f"hnsw ef_search={v}", f"SET LOCAL hnsw.ef_search = {max(v, args.top_k)}")
+                for v in args.ef_search
+            ]
+        elif index_type == VECTOR_INDEX_IVFFLAT:
+            variants = [
+                (f"ivfflat probes={v}", f"SET LOCAL ivfflat.probes = {v}")
+                for v in args.probes
+            ]
+        else:
+            variants = []
+
+        for name, statement in variants:
+            results, latencies = run_queries(
+                db, args.model_id, queries, args.top_k, [statement]
+            )
+            recall = statistics.mean(
+                len(found & truth) / max(len(truth), 1)
+                for found, truth in zip(results, exact)
+            )
+            report.append(summarize(name, latencies, recall))
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'mode':<24}{'recall':>8}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for row in report:
+        print(
+            f"{row['mode']:<24}{row['recall']:>8}{row['p50_ms']:>10}"
+            f"{row['p95_ms']:>10}{row['mean_ms']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Measure chat latency with many simultaneous WebSocket connections.
+
+Opens N sockets to /api/chat/ws at once; each sends a number of messages
+one after another and records time-to-first-token (first stream_chunk)
+and full turn latency (until message_saved). Reports p50/p95/p99 across
+all turns. Run it against a model whose api_base_url points at
+benchmarks.mock_llm_server so the LLM itself is not the bottleneck.
+
+Usage (from backend/):
+    python -m benchmarks.ws_concurrency_benchmark --api-url http://localhost:8000 \\
+        --email admin@example.com --password changeme123 --model-id 1 --sockets 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List
+
+import httpx
+import websockets
+
+
+def percentile(values: List[float], pct: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+def login(api_url: str, email: str, password: str) -> str:
+    response = httpx.post(
+        f"{api_url}/api/auth/login", json={"email": email, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_socket(ws_url: str, args, ttfts, turns, errors) -> None:
+    """One client: send messages sequentially, record latencies"""
+    try:
+        async with websockets.connect(ws_url, max_size=None, open_timeout=60) as ws:
+            session_id = None
+            for i in range(args.messages):
+                payload = {
+                    "message": f"What does the manual say about topic {i}?",
+                    "model_id": args.model_id,
+                    "session_id": session_id,
+                    "top_k": args.top_k,
+                }
+                start = time.perf_counter()
+                first = None
+                await ws.send(json.dumps(payload))
+                while True:
+                    event = json.loads(await ws.recv())
+                    kind = event.get("type")
+                    if kind == "user_message":
+                        session_id = event.get("session_id")
+                    elif kind == "stream_chunk" and first is None:
+                        first = time.perf_counter()
+                    elif kind == "message_saved":
+                        break
+                    elif kind == "error":
+                        raise RuntimeError(event.get("error"))
+                end = time.perf_counter()
+                ttfts.append(((first or end) - start) * 1000)
+                turns.append((end - start) * 1000)
+    except Exception as e:
+        errors.append(str(e))
+
+
+async def main_async(args, token: str) -> dict:
+    base = args.api_url.replace("http://", "ws://").replace("https://", "wss://")
+    ws_url = f"{base}/api/chat/ws?token={token}"
+
+    ttfts, turns, errors = [], [], []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(run_socket(ws_url, args, ttfts, turns, errors) for _ in range(args.sockets))
+    )
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "sockets": args.sockets,
+        "messages_per_socket": args.messages,
+        "completed_turns": len(turns),
+        "errors": len(errors),
+        "seconds": round(elapsed, 2),
+        "turns_per_sec": round(len(turns) / elapsed, 1),
+    }
+    for name, values in (("ttft", ttfts), ("turn", turns)):
+        if values:
+            report[f"{name}_p50_ms"] = round(statistics.median(values), 1)
+            report[f"{name}_p95_ms"] = round(percentile(values, 95), 1)
+            report[f"{name}_p99_ms"] = round(percentile(values, 99), 1)
+    if errors:
+        report["first_error"] = errors[0]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--token", help="Access token (or use --email/--password)")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--model-id", type=int, required=True)
+    parser.add_argument("--sockets", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=3, help="Messages per socket")
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    token = args.token or login(args.api_url, args.email, args.password)
+    report = asyncio.run(main_async(args, token))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Export the configured EMBEDDING_MODEL to ONNX for the onnx / onnx-int8 backends.
+Writes model.onnx, an int8 dynamically quantized model_int8.onnx, the tokenizer
+and the pooling config to EMBEDDING_ONNX_DIR, then checks that both ONNX models
+agree with the PyTorch SentenceTransformer output.
+
+Usage:
+    python export_embedding_model.py [--output-dir DIR] [--skip-check]
+"""
+
+import argparse
+import inspect
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding_backends import (
+    ONNX_CONFIG_FILE,
+    ONNX_INT8_MODEL_FILE,
+    ONNX_MODEL_FILE,
+    OnnxEmbeddingBackend,
+)
+
+# Minimum cosine similarity between torch and ONNX embeddings
+MIN_COSINE_FP32 = 0.999
+MIN_COSINE_INT8 = 0.98
+
+PARITY_SENTENCES = [
+    "What is the refund policy?",
+    "How do I reset my password?",
+    "The quarterly report shows a 12% increase in revenue.",
+    "Error code E-4012 indicates a failed firmware update on model XR-200.",
+    "Bonjour, je voudrais annuler ma commande.",
+    "a",
+    "Section 4.2: The warranty does not cover damage caused by misuse, "
+    "accidents, unauthorized modifications or normal wear and tear. " * 8,
+]
+
+
+def _pooling_mode(module) -> str:
+    """Read the pooling mode across sentence-transformers versions"""
+    config = module.get_config_dict()
+    if isinstance(config.get("pooling_mode"), str):
+        return config["pooling_mode"]
+    if config.get("pooling_mode_cls_token"):
+        return "cls"
+    if config.get("pooling_mode_max_tokens"):
+        return "max"
+    if config.get("pooling_mode_mean_tokens"):
+        return "mean"
+    return "unknown"
+
+
+def export(output_dir: Path) -> None:
+    """Export transformer, tokenizer and pooling config"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(settings.EMBEDDING_MODEL, device="cpu")
+    transformer = model[0]
+    tokenizer = model.tokenizer
+
+    pooling = "mean"
+    normalize = False
+    for module in model:
+        if type(module).__name__ == "Pooling":
+            pooling = _pooling_mode(module)
+        if type(module).__name__ == "Normalize":
+            normalize = True
+    if pooling not in ("mean", "cls", "max"):
+        raise SystemExit(f"Unsupported pooling mode for ONNX export: {pooling}")
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [
+        name
+        for name in ("input_ids", "attention_mask", "token_type_ids")
+        if name in sample
+    ]
+
+    class _Wrapper(torch.nn.Module):
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, *inputs):
+            kwargs = dict(zip(input_names, inputs))
+            return self.auto_model(**kwargs).last_hidden_state
+
+    wrapper = _Wrapper(transformer.auto_model).eval()
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    export_kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs["dynamo"] = False  # TorchScript exporter handles dynamic_axes
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper,
+            tuple(sample[name] for name in input_names),
+            str(output_dir / ONNX_MODEL_FILE),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            **export_kwargs,
+        )
+    print(f"Exported {output_dir / ONNX_MODEL_FILE}")
+
+    tokenizer.save_pretrained(str(output_dir))
+
+    config = {
+        "model_name": settings.EMBEDDING_MODEL,
+        "pooling": pooling,
+        "normalize": normalize,
+        "max_seq_length": model.max_seq_length,
+        "dimension": model.get_sentence_embedding_dimension(),
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": tokenizer.pad_token_id,
+    }
+    with open(output_dir / ONNX_CONFIG_FILE, "w") as f:
+        json.dump(config, f, indent=2)
+
+
+def quantize(output_dir: Path) -> None:
+    """Quantize weights of the exported model to int8"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(
+        str(output_dir / ONNX_MODEL_FILE),
+        str(output_dir / ONNX_INT8_MODEL_FILE),
+        weight_type=QuantType.QInt8,
+    )
+    print(f"Quantized {output_dir / ONNX_INT8_MODEL_FILE}")
+
+
+def check_parity(output_dir: Path) -> bool:
+    """Compare ONNX embeddings with the PyTorch reference"""
+    from sentence_transformers import SentenceTransformer
+
+    reference = SentenceTransformer(settings.EMBEDDING_MODEL, device="cpu").encode(
+        PARITY_SENTENCES, convert_to_numpy=True
+    )
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+
+    ok = True
+    for quantized, threshold in ((False, MIN_COSINE_FP32), (True, MIN_COSINE_INT8)):
+        backend = OnnxEmbeddingBackend(str(output_dir), quantized=quantized)
+        embeddings = backend.encode(PARITY_SENTENCES)
+        embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        cosine = (embeddings * reference).sum(axis=1)
+
+        name = "onnx-int8" if quantized else "onnx"
+        passed = bool(cosine.min() >= threshold)
+        ok = ok and passed
+        print(
+            f"{name:<10} min cosine {cosine.min():.5f}  mean cosine {cosine.mean():.5f}  "
+            f"(threshold {threshold}) {'OK' if passed else 'FAILED'}"
+        )
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX")
+    parser.add_argument("--output-dir", default=settings.EMBEDDING_ONNX_DIR)
+    parser.add_argument("--skip-check", action="store_true", help="Skip parity check")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    export(output_dir)
+    quantize(output_dir)
+
+    if not args.skip_check and not check_parity(output_dir):
+        sys.exit(1)
+
+    print(f"Done. Set EMBEDDING_BACKEND=onnx or onnx-int8 and EMBEDDING_ONNX_DIR={output_dir}")